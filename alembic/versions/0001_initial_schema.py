@@ -0,0 +1,157 @@
+"""initial schema
+
+Tables as created by Base.metadata.create_all before migrations existed.
+Databases created that way can be adopted with `alembic stamp 0001`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 16:54:57.683221
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('header_columns',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name_tr', sa.String(length=255), nullable=False),
+    sa.Column('name_en', sa.String(length=255), nullable=False),
+    sa.Column('slug', sa.String(length=255), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('order', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('url', sa.String(length=500), nullable=True),
+    sa.Column('has_combobox', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('header_columns', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_header_columns_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_header_columns_slug'), ['slug'], unique=True)
+
+    op.create_table('leads',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=False),
+    sa.Column('phone_number', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('source_form', sa.String(length=100), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('leads', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_leads_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_leads_id'), ['id'], unique=False)
+
+    op.create_table('services',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('slug', sa.String(length=255), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('title_tr', sa.String(length=255), nullable=True),
+    sa.Column('title_en', sa.String(length=255), nullable=True),
+    sa.Column('description_tr', sa.Text(), nullable=True),
+    sa.Column('description_en', sa.Text(), nullable=True),
+    sa.Column('content_tr', sa.Text(), nullable=True),
+    sa.Column('content_en', sa.Text(), nullable=True),
+    sa.Column('price', sa.Float(), nullable=True),
+    sa.Column('duration', sa.String(length=100), nullable=True),
+    sa.Column('featured_image_url', sa.String(length=500), nullable=True),
+    sa.Column('gallery_urls', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_services_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_services_slug'), ['slug'], unique=True)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('is_admin', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+
+    op.create_table('blog_posts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('slug', sa.String(length=255), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('published_date', sa.DateTime(), nullable=True),
+    sa.Column('title_tr', sa.String(length=255), nullable=True),
+    sa.Column('title_en', sa.String(length=255), nullable=True),
+    sa.Column('title_fr', sa.String(length=255), nullable=True),
+    sa.Column('content_tr', sa.Text(), nullable=True),
+    sa.Column('content_en', sa.Text(), nullable=True),
+    sa.Column('content_fr', sa.Text(), nullable=True),
+    sa.Column('description_tr', sa.Text(), nullable=True),
+    sa.Column('description_en', sa.Text(), nullable=True),
+    sa.Column('description_fr', sa.Text(), nullable=True),
+    sa.Column('featured_image_url', sa.String(length=500), nullable=True),
+    sa.Column('gallery_urls', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_blog_posts_author_id'), ['author_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_blog_posts_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_blog_posts_slug'), ['slug'], unique=True)
+
+    op.create_table('combobox_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('header_column_id', sa.Integer(), nullable=False),
+    sa.Column('name_tr', sa.String(length=255), nullable=False),
+    sa.Column('name_en', sa.String(length=255), nullable=False),
+    sa.Column('slug', sa.String(length=255), nullable=False),
+    sa.Column('url', sa.String(length=500), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('order', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['header_column_id'], ['header_columns.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('combobox_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_combobox_items_header_column_id'), ['header_column_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_combobox_items_id'), ['id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('combobox_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_combobox_items_id'))
+        batch_op.drop_index(batch_op.f('ix_combobox_items_header_column_id'))
+
+    op.drop_table('combobox_items')
+    with op.batch_alter_table('blog_posts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_blog_posts_slug'))
+        batch_op.drop_index(batch_op.f('ix_blog_posts_id'))
+        batch_op.drop_index(batch_op.f('ix_blog_posts_author_id'))
+
+    op.drop_table('blog_posts')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_services_slug'))
+        batch_op.drop_index(batch_op.f('ix_services_id'))
+
+    op.drop_table('services')
+    with op.batch_alter_table('leads', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_leads_id'))
+        batch_op.drop_index(batch_op.f('ix_leads_created_at'))
+
+    op.drop_table('leads')
+    with op.batch_alter_table('header_columns', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_header_columns_slug'))
+        batch_op.drop_index(batch_op.f('ix_header_columns_id'))
+
+    op.drop_table('header_columns')
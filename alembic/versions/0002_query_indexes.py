@@ -0,0 +1,39 @@
+"""indexes for the public query shapes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 17:05:12.418730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PUBLISHED = sa.text('published_date IS NOT NULL')
+
+
+def upgrade() -> None:
+    # if_not_exists: create_all() on startup may already have built these
+    op.create_index('ix_blog_posts_published_date', 'blog_posts', ['published_date'], unique=False,
+                    sqlite_where=PUBLISHED, postgresql_where=PUBLISHED, if_not_exists=True)
+    op.create_index('ix_services_is_active_id', 'services', ['is_active', 'id'], unique=False,
+                    if_not_exists=True)
+    op.create_index('ix_header_columns_is_active_order', 'header_columns', ['is_active', 'order'], unique=False,
+                    if_not_exists=True)
+    op.create_index('ix_combobox_items_column_active_order', 'combobox_items',
+                    ['header_column_id', 'is_active', 'order'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_combobox_items_column_active_order', table_name='combobox_items')
+    op.drop_index('ix_header_columns_is_active_order', table_name='header_columns')
+    op.drop_index('ix_services_is_active_id', table_name='services')
+    op.drop_index('ix_blog_posts_published_date', table_name='blog_posts')
@@ -0,0 +1,47 @@
+"""full-text search index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 18:12:40.902314
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Same DDL as app.search.backends; the rows are filled by
+    # `python -m app.search.index --rebuild` or on first startup.
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "entity UNINDEXED, entity_id UNINDEXED, lang UNINDEXED, title, body, "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE TABLE IF NOT EXISTS search_documents ("
+            "entity VARCHAR(50) NOT NULL, entity_id INTEGER NOT NULL, lang VARCHAR(5) NOT NULL, "
+            "title TEXT NOT NULL, body TEXT NOT NULL, "
+            "tsv TSVECTOR GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')"
+            ") STORED, PRIMARY KEY (entity, entity_id, lang))"
+        )
+        op.execute("CREATE INDEX IF NOT EXISTS ix_search_documents_tsv ON search_documents USING GIN (tsv)")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS search_index")
+    elif dialect == 'postgresql':
+        op.execute("DROP TABLE IF EXISTS search_documents")
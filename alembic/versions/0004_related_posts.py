@@ -0,0 +1,40 @@
+"""related posts table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 19:02:17.530184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by `python -m app.search.related --rebuild` or on first startup
+    op.create_table('related_posts',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('lang', sa.String(length=5), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('related_post_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['blog_posts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['related_post_id'], ['blog_posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id', 'lang', 'rank'),
+    if_not_exists=True
+    )
+    op.create_index('ix_related_posts_related_lang', 'related_posts', ['related_post_id', 'lang'], unique=False,
+                    if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_related_posts_related_lang', table_name='related_posts')
+    op.drop_table('related_posts')
@@ -0,0 +1,32 @@
+"""cache versions for cross-worker invalidation
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 21:12:40.508331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('cache_versions',
+    sa.Column('entity', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('entity'),
+    if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('cache_versions')
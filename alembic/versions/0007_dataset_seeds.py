@@ -0,0 +1,33 @@
+"""dataset seed checksums
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 21:58:11.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('dataset_seeds',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('checksum', sa.String(length=64), nullable=False),
+    sa.Column('rows', sa.Integer(), nullable=False),
+    sa.Column('seeded_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name'),
+    if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('dataset_seeds')
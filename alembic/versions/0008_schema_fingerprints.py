@@ -0,0 +1,32 @@
+"""schema fingerprints for the startup check
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 23:41:37.215804
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('schema_fingerprints',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name'),
+    if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('schema_fingerprints')
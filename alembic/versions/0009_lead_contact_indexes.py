@@ -0,0 +1,29 @@
+"""indexes for the lead email and phone lookups
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 23:58:04.613207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # if_not_exists: create_all() on startup may already have built these
+    op.create_index(op.f('ix_leads_email'), 'leads', ['email'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_leads_phone_number'), 'leads', ['phone_number'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_leads_phone_number'), table_name='leads')
+    op.drop_index(op.f('ix_leads_email'), table_name='leads')
@@ -0,0 +1,67 @@
+from functools import lru_cache
+from typing import List, Type
+
+import anyio
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Select
+from starlette.datastructures import Headers
+
+from app.core.compression import CompressedBody, negotiate
+from app.core.config import settings
+from app.core.metrics import record_compression
+from app.db import session
+
+
+class CompressedResponse(Response):
+    """Response for a cached body: each encoding is computed once and reused
+
+    The negotiated variant is stored on the ``CompressedBody`` itself, so hot
+    cached responses are not recompressed per request. The response sets
+    Content-Encoding, which makes ``CompressionMiddleware`` pass it through.
+    """
+
+    def __init__(self, body: CompressedBody, status_code: int = 200, headers=None, media_type=None):
+        self.compressed_body = body
+        super().__init__(content=body.raw, status_code=status_code, headers=headers, media_type=media_type)
+        self.headers.add_vary_header("Accept-Encoding")
+
+    async def __call__(self, scope, receive, send):
+        raw = self.compressed_body.raw
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is not None and len(raw) >= settings.compression_min_size:
+            if len(raw) >= settings.compression_thread_min_size and not self.compressed_body.is_encoded(encoding):
+                # First request for a large variant: keep the event loop free
+                self.body = await anyio.to_thread.run_sync(self.compressed_body.encoded, encoding)
+            else:
+                self.body = self.compressed_body.encoded(encoding)
+            self.headers["content-encoding"] = encoding
+            self.headers["content-length"] = str(len(self.body))
+            record_compression(encoding, "cached", len(raw), len(self.body))
+        await super().__call__(scope, receive, send)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def stream_json_list(statement: Select, schema: Type[BaseModel], batch_size: int = 500) -> StreamingResponse:
+    """Send the rows of statement as a JSON array, holding one batch of rows at a time
+
+    Dependency sessions are closed before the response body is sent, so the
+    rows are read through a session of their own.
+    """
+    adapter = _list_adapter(schema)
+
+    def chunks():
+        with session.SessionLocal() as db:
+            yield b"["
+            separator = b""
+            rows = db.scalars(statement.execution_options(yield_per=batch_size))
+            for batch in rows.partitions():
+                yield separator + adapter.dump_json([schema.model_validate(row) for row in batch])[1:-1]
+                separator = b","
+            yield b"]"
+
+    return StreamingResponse(chunks(), media_type="application/json")
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.responses import stream_json_list
 from app.core.security import require_admin
 from fastapi import Security
 from app.db.session import get_db
@@ -97,9 +99,13 @@ def create_post(payload: BlogPostCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/blog/posts", response_model=list[BlogPostRead])
-def list_posts(db: Session = Depends(get_db)):
-    items = db.query(BlogPost).order_by(BlogPost.published_date.desc().nullslast(), BlogPost.id.desc()).all()
-    return items
+def list_posts():
+    # Streamed: the table is unbounded and the list is unpaginated; posts
+    # carry their full content in three languages, hence the small batches
+    return stream_json_list(
+        select(BlogPost).order_by(BlogPost.published_date.desc().nullslast(), BlogPost.id.desc()),
+        BlogPostRead, batch_size=100,
+    )
 
 
 @router.get("/blog/posts/{id}", response_model=BlogPostRead)
@@ -139,9 +145,8 @@ def delete_post(id: int, db: Session = Depends(get_db)):
 
 # Leads
 @router.get("/leads", response_model=list[LeadRead])
-def list_leads(db: Session = Depends(get_db)):
-    items = db.query(Lead).order_by(Lead.created_at.desc()).all()
-    return items
+def list_leads():
+    return stream_json_list(select(Lead).order_by(Lead.created_at.desc()), LeadRead)
 
 
 # Header Columns
@@ -209,12 +214,11 @@ def create_combobox_item(payload: ComboboxItemCreate, db: Session = Depends(get_
 
 
 @router.get("/header/combobox-items", response_model=list[ComboboxItemRead])
-def list_combobox_items(header_column_id: int = None, db: Session = Depends(get_db)):
-    query = db.query(ComboboxItem)
+def list_combobox_items(header_column_id: int = None):
+    query = select(ComboboxItem)
     if header_column_id:
-        query = query.filter(ComboboxItem.header_column_id == header_column_id)
-    items = query.order_by(ComboboxItem.order, ComboboxItem.id).all()
-    return items
+        query = query.where(ComboboxItem.header_column_id == header_column_id)
+    return stream_json_list(query.order_by(ComboboxItem.order, ComboboxItem.id), ComboboxItemRead)
 
 
 @router.put("/header/combobox-items/{id}", response_model=ComboboxItemRead)
@@ -0,0 +1,137 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Security, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.hot_paths import hot_path_sampler
+from app.core.loop_monitor import loop_monitor
+from app.core.memory import memory_diagnostics
+from app.core.profiling import collapsed_stacks, profile_store
+from app.core.security import require_admin
+from app.db.query_stats import query_stats
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    responses={401: {"description": "Unauthorized"}},
+    dependencies=[Security(require_admin)]
+)
+
+
+# Per-request profiles
+@router.get("/profiles")
+def list_profiles():
+    """Stored profiles, newest first, without their stacks and statements"""
+    return profile_store.summaries()
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, format: str = Query("collapsed", pattern="^(collapsed|json)$")):
+    """Collapsed stacks for flamegraph.pl or speedscope; format=json adds the SQL statements"""
+    profile = profile_store.load(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "json":
+        return profile
+    return PlainTextResponse(collapsed_stacks(profile["stacks"]))
+
+
+# Continuous sampling
+@router.get("/profiling/hot-paths")
+def hot_paths(
+    windows: int = Query(1, ge=1, description="most recent windows to merge, the current one included"),
+    route: Optional[str] = Query(None, description="route template, e.g. /api/v1/blog/posts/{slug}"),
+    top: int = Query(10, ge=1, le=100),
+    format: str = Query("json", pattern="^(json|collapsed)$"),
+):
+    """Where sampled CPU time went per route: category shares, hottest stacks and functions"""
+    if not settings.hot_paths_enabled:
+        raise HTTPException(status_code=404, detail="Hot path sampling is disabled (HOT_PATHS_ENABLED)")
+    if format == "collapsed":
+        return PlainTextResponse(hot_path_sampler.collapsed(windows, route))
+    return {
+        "window_seconds": settings.hot_paths_window_seconds,
+        "overhead_budget": settings.hot_paths_overhead_budget,
+        **hot_path_sampler.report(windows, route, top),
+    }
+
+
+# Memory
+GROUP_BY = Query("lineno", pattern="^(lineno|filename|traceback)$")
+
+
+@router.get("/memory")
+def memory_status():
+    """Traced and resident memory, stored snapshots and per-route request peaks"""
+    return memory_diagnostics.status()
+
+
+@router.post("/memory/tracing")
+def start_memory_tracing(frames: Optional[int] = Query(None, ge=1, le=100)):
+    """Start tracemalloc; allocations get slower and each live block keeps its traceback"""
+    memory_diagnostics.start(frames)
+    return memory_diagnostics.status()
+
+
+@router.delete("/memory/tracing")
+def stop_memory_tracing():
+    memory_diagnostics.stop()
+    return memory_diagnostics.status()
+
+
+@router.post("/memory/snapshots", status_code=status.HTTP_201_CREATED)
+def take_memory_snapshot(label: str = ""):
+    if not memory_diagnostics.tracing:
+        raise HTTPException(status_code=409, detail="Memory tracing is off; POST /admin/memory/tracing first")
+    return memory_diagnostics.take_snapshot(label)
+
+
+@router.get("/memory/snapshots/{snapshot_id}")
+def memory_snapshot_top(snapshot_id: int, group_by: str = GROUP_BY, limit: int = Query(20, ge=1, le=500)):
+    """Top allocation sites of a stored snapshot"""
+    snapshot = memory_diagnostics.snapshot(snapshot_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return memory_diagnostics.top(snapshot, group_by, limit)
+
+
+@router.get("/memory/diff")
+def memory_snapshot_diff(
+    base: int,
+    target: Optional[int] = Query(None, description="defaults to the newest snapshot"),
+    group_by: str = GROUP_BY,
+    limit: int = Query(20, ge=1, le=500),
+):
+    """Allocation sites that grew the most between two stored snapshots"""
+    base_snapshot, target_snapshot = memory_diagnostics.snapshot(base), memory_diagnostics.snapshot(target)
+    if base_snapshot is None or target_snapshot is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return memory_diagnostics.diff(base_snapshot, target_snapshot, group_by, limit)
+
+
+# Event loop
+@router.get("/event-loop")
+def event_loop_status():
+    """Recent loop lag and, with LOOP_BLOCK_DEBUG, the stacks of callbacks that held the loop"""
+    return loop_monitor.summary()
+
+
+# Database statements
+@router.get("/db/slow-queries")
+def slow_queries(
+    sort: str = Query("total", pattern="^(total|mean|max|calls|slow)$"),
+    limit: int = Query(20, ge=1, le=500),
+    fingerprint: Optional[str] = Query(None, description="only this statement fingerprint"),
+):
+    """Statement stats per fingerprint and the slowest recent statements, with their plans and routes"""
+    if not settings.query_stats_enabled:
+        raise HTTPException(status_code=404, detail="Statement stats are disabled (QUERY_STATS_ENABLED)")
+    return query_stats.report(sort, limit, fingerprint)
+
+
+@router.delete("/db/slow-queries")
+def reset_slow_queries():
+    """Start the stats and the slow query log over, e.g. before a load test"""
+    query_stats.reset()
+    return query_stats.report()
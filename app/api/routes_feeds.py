@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from sqlalchemy.orm import Session
+
+from app.api.responses import CompressedResponse
+from app.api.routing import EarlyReleaseRoute
+from app.db.session import get_db
+from app.services.feed_service import FeedService
+
+router = APIRouter(tags=["feeds"], route_class=EarlyReleaseRoute)
+
+FEED_MEDIA_TYPES = {"rss": "application/rss+xml", "atom": "application/atom+xml"}
+
+
+def get_feed_service(db: Session = Depends(get_db)) -> FeedService:
+    """Get FeedService instance
+
+    Uses the primary, like the bootstrap service: every query fills a shared
+    cache that must not be rebuilt from a lagging replica.
+    """
+    return FeedService(db)
+
+
+@router.get("/sitemap.xml", response_class=CompressedResponse)
+def sitemap(feed_service: FeedService = Depends(get_feed_service)):
+    """Sitemap of blog posts and services, or a sitemap index once there are several shards"""
+    return CompressedResponse(feed_service.get_sitemap(), media_type="application/xml")
+
+
+@router.get("/sitemaps/{name}.xml", response_class=CompressedResponse)
+def sitemap_shard(name: str, feed_service: FeedService = Depends(get_feed_service)):
+    """One shard of the sitemap index"""
+    body = feed_service.get_sitemap_shard(name)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Sitemap not found")
+    return CompressedResponse(body, media_type="application/xml")
+
+
+@router.get("/api/v1/blog/feed.{feed_format}", response_class=CompressedResponse)
+def blog_feed(
+    feed_format: str = Path(..., pattern="^(rss|atom)$"),
+    lang: str = Query("en", pattern="^(tr|en|fr)$", description="Language code (tr, en, fr)"),
+    feed_service: FeedService = Depends(get_feed_service),
+):
+    """Latest blog posts as an RSS 2.0 or Atom feed"""
+    return CompressedResponse(feed_service.get_feed(feed_format, lang), media_type=FEED_MEDIA_TYPES[feed_format])
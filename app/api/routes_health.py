@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.warmup import warmup_state
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/ready", include_in_schema=False)
+async def ready():
+    """Readiness probe: 200 once this worker has warmed up, 503 until then"""
+    return JSONResponse(warmup_state.as_dict(), status_code=200 if warmup_state.ready else 503)
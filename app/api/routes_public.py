@@ -1,31 +1,53 @@
-from fastapi import APIRouter, Depends, Query, status, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from fastapi.responses import FileResponse, Response
 from sqlalchemy.orm import Session
+import heapq
 import os
 import uuid
 from pathlib import Path
+from typing import Optional
 
-from app.db.session import get_db
+import anyio
+
+from app.api.responses import CompressedResponse
+from app.api.routing import EarlyReleaseRoute
+from app.db.session import get_read_db
+from app.core.metrics import upload_bytes_total, upload_files_total
+from app.core.singleflight import header_flights
 from app.services.blog_service import BlogService
 from app.services.user_service import ServiceService, LeadService
-from app.dependencies.services import get_blog_service, get_service_service, get_lead_service
-from app.models.header import HeaderColumn, ComboboxItem
+from app.services.search_service import SearchService
+from app.services.bootstrap_service import BootstrapService
+from app.dependencies.services import (
+    get_blog_service,
+    get_lead_service,
+    get_read_blog_service,
+    get_read_service_service,
+    get_search_service,
+    get_bootstrap_service,
+)
+from app.repositories.header_repository import HeaderColumnRepository, ComboboxItemRepository
+from app.repositories.change_log_repository import ChangeLogRepository
 from app.schemas.service import ServiceListItem, ServiceRead
-from app.schemas.blog import PaginatedBlogPosts, BlogPostRead, BlogPostCreate
+from app.schemas.blog import PaginatedBlogPosts, BlogPostRead, BlogPostCreate, BlogPostDetail
 from app.schemas.lead import LeadCreate, LeadRead
 from app.schemas.header import HeaderColumnListItem, ComboboxItemRead
+from app.schemas.bootstrap import BootstrapResponse
+from app.schemas.change_log import ChangeFeed, ChangeRead
+from app.schemas.search import AutocompleteResponse, AutocompleteSuggestion, SearchResponse
+from app.search.autocomplete import autocomplete_index
 
-router = APIRouter(prefix="/api/v1", tags=["public"]) 
+router = APIRouter(prefix="/api/v1", tags=["public"], route_class=EarlyReleaseRoute)
 
 
 @router.get("/services", response_model=list[ServiceListItem])
-def list_services(service_service: ServiceService = Depends(get_service_service)):
+def list_services(service_service: ServiceService = Depends(get_read_service_service)):
     """Get all active services"""
     return service_service.get_active_services()
 
 
 @router.get("/services/{slug}", response_model=ServiceRead)
-def get_service(slug: str, service_service: ServiceService = Depends(get_service_service)):
+def get_service(slug: str, service_service: ServiceService = Depends(get_read_service_service)):
     """Get service by slug"""
     return service_service.get_service_by_slug(slug)
 
@@ -35,7 +57,7 @@ def list_blog_posts(
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
     lang: str = Query("en", description="Language code (tr, en, fr)"),
-    blog_service: BlogService = Depends(get_blog_service),
+    blog_service: BlogService = Depends(get_read_blog_service),
 ):
     """Get paginated blog posts with language support"""
     result = blog_service.get_published_posts(page=page, size=size)
@@ -47,14 +69,14 @@ def list_blog_posts(
     )
 
 
-@router.get("/blog/posts/{slug}", response_model=BlogPostRead)
+@router.get("/blog/posts/{slug}", response_model=BlogPostDetail)
 def get_blog_post(
     slug: str, 
     lang: str = Query("en", description="Language code (tr, en, fr)"),
-    blog_service: BlogService = Depends(get_blog_service)
+    blog_service: BlogService = Depends(get_read_blog_service)
 ):
-    """Get single blog post by slug with language support"""
-    return blog_service.get_post_by_slug(slug)
+    """Get single blog post by slug with language support and related posts"""
+    return blog_service.get_post_detail(slug, lang)
 
 
 @router.post("/blog/posts", response_model=BlogPostRead, status_code=status.HTTP_201_CREATED)
@@ -75,32 +97,81 @@ def create_lead(
     return lead_service.create_lead(payload)
 
 
+@router.get("/bootstrap", response_model=BootstrapResponse)
+def bootstrap(
+    lang: str = Query("en", pattern="^(tr|en|fr)$", description="Language code (tr, en, fr)"),
+    posts: int = Query(6, ge=0, le=20, description="Number of latest blog posts"),
+    bootstrap_service: BootstrapService = Depends(get_bootstrap_service),
+):
+    """Get navigation, active services and the latest blog posts for the first page load"""
+    return CompressedResponse(bootstrap_service.get_bootstrap_body(lang, posts), media_type="application/json")
+
+
+@router.get("/changes", response_model=ChangeFeed)
+def list_changes(
+    since: int = Query(0, ge=0, description="Last sequence number already synced"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+):
+    """Get content changes after a sequence number, including delete tombstones"""
+    entries = ChangeLogRepository(db).get_since(since, limit + 1)
+    has_more = len(entries) > limit
+    changes = [
+        ChangeRead.model_validate(entry).model_copy(update={"deleted": entry.op == "delete"})
+        for entry in entries[:limit]
+    ]
+    return ChangeFeed(changes=changes, next_since=changes[-1].seq if changes else since, has_more=has_more)
+
+
+@router.get("/search", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    lang: str = Query("en", pattern="^(tr|en|fr)$", description="Language code (tr, en, fr)"),
+    limit: int = Query(20, ge=1, le=50),
+    search_service: SearchService = Depends(get_search_service),
+):
+    """Search blog posts and services, ranked with highlighted snippets"""
+    return SearchResponse(query=q, lang=lang, results=search_service.search(q, lang=lang, limit=limit))
+
+
+@router.get("/autocomplete", response_model=AutocompleteResponse)
+def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100, description="Typed prefix"),
+    lang: str = Query("en", pattern="^(tr|en|fr)$", description="Language code (tr, en, fr)"),
+    limit: int = Query(8, ge=1, le=20),
+):
+    """Suggest service, blog and navigation titles starting with the typed prefix"""
+    suggestions = autocomplete_index.suggest(q, lang=lang, limit=limit)
+    return AutocompleteResponse(
+        query=q,
+        lang=lang,
+        suggestions=[AutocompleteSuggestion.model_validate(s) for s in suggestions],
+    )
+
+
 # Header Columns (Public - No Authentication Required)
 @router.get("/header/columns", response_model=list[HeaderColumnListItem])
-def get_header_columns(lang: str = Query("en", description="Language code (tr, en)"), db: Session = Depends(get_db)):
+def get_header_columns(lang: str = Query("en", description="Language code (tr, en)"), db: Session = Depends(get_read_db)):
     """Get all active header columns for frontend navigation with language support"""
-    columns = db.query(HeaderColumn).filter(HeaderColumn.is_active == True).order_by(HeaderColumn.order, HeaderColumn.id).all()
-    return columns
+    return header_flights.do(
+        ("columns", db.get_bind(), lang), lambda: HeaderColumnRepository(db).get_active_columns()
+    )
 
 
 @router.get("/header/columns/{slug}/combobox-items", response_model=list[ComboboxItemRead])
-def get_combobox_items(slug: str, lang: str = Query("en", description="Language code (tr, en)"), db: Session = Depends(get_db)):
+def get_combobox_items(slug: str, lang: str = Query("en", description="Language code (tr, en)"), db: Session = Depends(get_read_db)):
     """Get combobox items for a specific header column with language support"""
-    header_column = db.query(HeaderColumn).filter(HeaderColumn.slug == slug, HeaderColumn.is_active == True).first()
-    if not header_column:
-        raise HTTPException(status_code=404, detail="Header column not found")
-    
-    items = db.query(ComboboxItem).filter(
-        ComboboxItem.header_column_id == header_column.id,
-        ComboboxItem.is_active == True
-    ).order_by(ComboboxItem.order, ComboboxItem.id).all()
-    
-    return items
+    def load_items():
+        header_column = HeaderColumnRepository(db).get_active_by_slug(slug)
+        if not header_column:
+            raise HTTPException(status_code=404, detail="Header column not found")
+        return ComboboxItemRepository(db).get_active_items(header_column.id)
+
+    return header_flights.do(("combobox_items", db.get_bind(), slug, lang), load_items)
 
 
 # Image Upload Endpoints
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+UPLOAD_DIR = Path("uploads")  # created by the first upload
 
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
@@ -122,6 +193,48 @@ def validate_image_file(file: UploadFile):
     return file_ext
 
 
+# File system calls block; the async routes below run them in worker threads
+def _save_image(file_path: Path, content: bytes) -> None:
+    UPLOAD_DIR.mkdir(exist_ok=True)
+    with open(file_path, "wb") as f:
+        f.write(content)
+
+
+def _delete_image(file_path: Path) -> bool:
+    """Remove an uploaded file; False if there was none"""
+    if not file_path.exists():
+        return False
+    os.remove(file_path)
+    return True
+
+
+def _scan_images(limit: Optional[int], offset: int) -> dict:
+    """One page of the uploads, newest first, without listing every file (all of them without a limit)"""
+    if not UPLOAD_DIR.exists():
+        return {"images": [], "total": 0}
+    total = 0
+
+    def files():
+        nonlocal total
+        with os.scandir(UPLOAD_DIR) as entries:
+            for entry in entries:
+                if entry.is_file() and Path(entry.name).suffix.lower() in ALLOWED_EXTENSIONS:
+                    total += 1
+                    stat = entry.stat()
+                    yield stat.st_ctime, entry.name, stat.st_size
+
+    if limit is None:
+        newest = sorted(files(), reverse=True)[offset:]
+    else:
+        # Keeps only offset + limit entries while the directory is scanned
+        newest = heapq.nlargest(offset + limit, files())[offset:]
+    images = [
+        {"filename": name, "url": f"/api/v1/images/{name}", "size": size, "created_at": created_at}
+        for created_at, name, size in newest
+    ]
+    return {"images": images, "total": total}
+
+
 @router.post("/images/upload")
 async def upload_image(file: UploadFile = File(...)):
     """Upload a single image file"""
@@ -138,8 +251,9 @@ async def upload_image(file: UploadFile = File(...)):
     file_path = UPLOAD_DIR / unique_filename
     
     # Save file
-    with open(file_path, "wb") as f:
-        f.write(content)
+    await anyio.to_thread.run_sync(_save_image, file_path, content)
+    upload_files_total.inc()
+    upload_bytes_total.inc(amount=len(content))
     
     # Return file info
     return {
@@ -172,8 +286,9 @@ async def upload_multiple_images(files: list[UploadFile] = File(...)):
         file_path = UPLOAD_DIR / unique_filename
         
         # Save file
-        with open(file_path, "wb") as f:
-            f.write(content)
+        await anyio.to_thread.run_sync(_save_image, file_path, content)
+        upload_files_total.inc()
+        upload_bytes_total.inc(amount=len(content))
         
         uploaded_files.append({
             "filename": unique_filename,
@@ -193,7 +308,7 @@ async def get_image(filename: str):
     """Serve uploaded image files"""
     file_path = UPLOAD_DIR / filename
     
-    if not file_path.exists():
+    if not await anyio.to_thread.run_sync(file_path.exists):
         raise HTTPException(status_code=404, detail="Image not found")
     
     return FileResponse(file_path)
@@ -204,34 +319,20 @@ async def delete_image(filename: str):
     """Delete an uploaded image file"""
     file_path = UPLOAD_DIR / filename
     
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Image not found")
-    
     try:
-        os.remove(file_path)
-        return {"message": f"Image {filename} deleted successfully"}
+        deleted = await anyio.to_thread.run_sync(_delete_image, file_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting file: {str(e)}")
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Image not found")
+    return {"message": f"Image {filename} deleted successfully"}
 
 
 @router.get("/images")
-async def list_images():
-    """List all uploaded images"""
-    if not UPLOAD_DIR.exists():
-        return {"images": []}
-    
-    images = []
-    for file_path in UPLOAD_DIR.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in ALLOWED_EXTENSIONS:
-            stat = file_path.stat()
-            images.append({
-                "filename": file_path.name,
-                "url": f"/api/v1/images/{file_path.name}",
-                "size": stat.st_size,
-                "created_at": stat.st_ctime
-            })
-    
-    # Sort by creation time (newest first)
-    images.sort(key=lambda x: x["created_at"], reverse=True)
-    
-    return {"images": images}
+async def list_images(limit: Optional[int] = Query(None, ge=1, le=1000), offset: Optional[int] = Query(None, ge=0)):
+    """List uploaded images, newest first; one page with the total count when limit or offset is given"""
+    if limit is None and offset is None:
+        # Unpaged callers keep the original response: every image, no total
+        page = await anyio.to_thread.run_sync(_scan_images, None, 0)
+        return {"images": page["images"]}
+    return await anyio.to_thread.run_sync(_scan_images, limit or 100, offset or 0)
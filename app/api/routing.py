@@ -0,0 +1,65 @@
+import asyncio
+import functools
+
+import anyio
+from fastapi.routing import APIRoute
+
+from app.core.cache_sync import cache_watcher
+from app.db.session import release_request_sessions, request_sessions
+
+
+def _release_sessions_after(endpoint):
+    """Wrap an endpoint so request sessions are released when it returns"""
+    if getattr(endpoint, "_releases_sessions", False):
+        # include_router() re-creates routes from already wrapped endpoints
+        return endpoint
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                release_request_sessions()
+
+        async_wrapper._releases_sessions = True
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            release_request_sessions()
+
+    sync_wrapper._releases_sessions = True
+    return sync_wrapper
+
+
+class EarlyReleaseRoute(APIRoute):
+    """Route that returns DB connections to the pool before serialization
+
+    Endpoints on these routes must return fully loaded data: once the
+    endpoint returns, its ORM objects are detached and lazy loads fail.
+
+    Before the endpoint runs, in-process caches are synced with writes made
+    by other workers (app.core.cache_sync).
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, _release_sessions_after(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request):
+            if cache_watcher.due():
+                # Drop entries made stale by other workers before serving from them
+                await anyio.to_thread.run_sync(cache_watcher.poll)
+            token = request_sessions.set([])
+            try:
+                return await handler(request)
+            finally:
+                request_sessions.reset(token)
+
+        return route_handler
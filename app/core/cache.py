@@ -0,0 +1,72 @@
+# In-process caches invalidated by content changes
+#
+# Entries are tagged with the entity names they were built from ("service",
+# "blog_post", ...; see app.db.events.TRACKED_TABLES). A committed write drops
+# every entry carrying the tag of a changed entity, in every registered cache.
+import threading
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Tuple, TypeVar
+
+from app.core.metrics import record_cache_lookup
+from app.db.events import ContentChange, on_content_change, on_remote_content_change
+
+T = TypeVar("T")
+
+
+class TaggedCache(Generic[T]):
+    """Key/value cache whose entries are dropped by tag"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._entries: Dict[Hashable, Tuple[T, Tuple[str, ...]]] = {}
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0  # bumped by clear()
+        self._lock = threading.Lock()
+        _caches.append(self)
+
+    def get(self, key: Hashable):
+        entry = self._entries.get(key)
+        record_cache_lookup(self.name, entry is not None)
+        return None if entry is None else entry[0]
+
+    def get_or_build(self, key: Hashable, tags: Iterable[str], build: Callable[[], T]) -> T:
+        """Return the cached value or build, store and return it"""
+        entry = self._entries.get(key)
+        record_cache_lookup(self.name, entry is not None)
+        if entry is not None:
+            return entry[0]
+        tags = tuple(tags)
+        generations = self._tag_generations(tags)
+        value = build()
+        with self._lock:
+            # Do not store a value built from data that changed while building
+            if self._tag_generations(tags) == generations:
+                self._entries[key] = (value, tags)
+        return value
+
+    def _tag_generations(self, tags: Tuple[str, ...]) -> Tuple[int, ...]:
+        return (self._epoch,) + tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def invalidate(self, *tags: str) -> None:
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            self._entries = {
+                key: entry for key, entry in self._entries.items() if not set(entry[1]).intersection(tags)
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries = {}
+
+
+_caches: List[TaggedCache] = []
+
+
+@on_remote_content_change
+@on_content_change
+def invalidate_caches(changes: List[ContentChange]) -> None:
+    """Drop cached entries built from the changed entity types"""
+    entities = {change.entity for change in changes}
+    for cache in list(_caches):
+        cache.invalidate(*entities)
@@ -0,0 +1,115 @@
+# Cross-worker cache invalidation through the cache_versions table
+#
+# Every write bumps the version of each changed entity type in the writing
+# transaction (app.db.events). Each worker compares those versions with the
+# ones it last saw, at most once per CACHE_SYNC_INTERVAL_SECONDS and only
+# when a request comes in, so a stale entry survives at most one interval
+# after the next request. When a version moved, the new change_log rows are
+# replayed to the on_remote_content_change listeners, which drop exactly the
+# cache entries and index rows the write touched. No broker is involved; any
+# process sharing the database (uvicorn workers, CLI scripts) takes part.
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.events import ContentChange, dispatch_remote_changes, on_content_change
+from app.db import session
+from app.models.cache_version import CacheVersion
+from app.models.change_log import ChangeLogEntry
+
+logger = logging.getLogger(__name__)
+
+# On PostgreSQL sequence numbers are taken before commit, so a transaction can
+# commit after a later-numbered one. Re-reading this many numbers behind the
+# newest one seen catches such late commits; seen numbers are skipped.
+REPLAY_WINDOW = 1000
+
+
+class CacheVersionWatcher:
+    """Polls cache_versions and replays other processes' changes to this one"""
+
+    def __init__(self, interval: Optional[float] = None):
+        self._interval = interval
+        self.versions: Optional[Dict[str, int]] = None
+        self.last_seq = 0
+        self._seen: Set[int] = set()  # sequence numbers above the replay window already applied
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def interval(self) -> float:
+        """Seconds between polls; CACHE_SYNC_INTERVAL_SECONDS unless given"""
+        if self._interval is None:
+            return settings.cache_sync_interval_seconds
+        return self._interval
+
+    def due(self) -> bool:
+        return self.interval >= 0 and time.monotonic() >= self._next_check
+
+    def mark_seen(self, seqs) -> None:
+        """Skip changes this process already applied when it wrote them"""
+        with self._lock:
+            self._seen.update(seq for seq in seqs if seq is not None and seq > self.last_seq - REPLAY_WINDOW)
+
+    def poll(self) -> int:
+        """Apply changes committed elsewhere since the last poll; returns how many were replayed"""
+        # One thread polls at a time; the others carry on with what they have
+        if not self._lock.acquire(blocking=False):
+            return 0
+        try:
+            self._next_check = time.monotonic() + self.interval
+            with session.engine.connect() as connection:
+                versions = dict(connection.execute(select(CacheVersion.entity, CacheVersion.version)).all())
+                if self.versions is None:
+                    # First poll: everything cached so far was built from the current data
+                    self.versions = versions
+                    self.last_seq = connection.execute(
+                        select(ChangeLogEntry.seq).order_by(ChangeLogEntry.seq.desc()).limit(1)
+                    ).scalar() or 0
+                    self._seen.update(connection.execute(
+                        select(ChangeLogEntry.seq).where(ChangeLogEntry.seq > self.last_seq - REPLAY_WINDOW)
+                    ).scalars())
+                    return 0
+                if versions == self.versions:
+                    return 0
+                rows = connection.execute(
+                    select(ChangeLogEntry.__table__).where(
+                        ChangeLogEntry.seq > max(self.last_seq - REPLAY_WINDOW, 0)
+                    ).order_by(
+                        ChangeLogEntry.seq
+                    )
+                ).all()
+            changes = [
+                ContentChange(entity=row.entity, entity_id=row.entity_id, op=row.op, slug=row.slug, seq=row.seq)
+                for row in rows
+                if row.seq not in self._seen
+            ]
+            self.versions = versions
+            if rows:
+                self.last_seq = max(self.last_seq, rows[-1].seq)
+            floor = self.last_seq - REPLAY_WINDOW
+            self._seen = {seq for seq in self._seen if seq > floor}
+            self._seen.update(change.seq for change in changes)
+        except Exception:
+            logger.exception("Cache version poll failed")
+            return 0
+        finally:
+            self._lock.release()
+
+        if changes:
+            logger.info("Replaying %d content changes from other processes", len(changes))
+            dispatch_remote_changes(changes)
+        return len(changes)
+
+
+cache_watcher = CacheVersionWatcher()
+
+
+@on_content_change
+def remember_local_changes(changes: List[ContentChange]) -> None:
+    """This process applied its own writes already; do not replay them"""
+    cache_watcher.mark_seen(change.seq for change in changes)
@@ -0,0 +1,122 @@
+# Content encodings shared by the snapshot exporter and the HTTP layer
+#
+# gzip is always available; brotli and zstd are used when the optional
+# "brotli" and "zstandard" packages are installed.
+import gzip
+import zlib
+from typing import Callable, Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # static snapshots use the slower maximum, see compress_static
+ZSTD_LEVEL = 3
+
+Encoder = Callable[[bytes], bytes]
+
+
+def _gzip(body: bytes) -> bytes:
+    # mtime=0 keeps the output byte-identical for identical input
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+ENCODERS: Dict[str, Encoder] = {"gzip": _gzip}
+if brotli is not None:
+    ENCODERS["br"] = lambda body: brotli.compress(body, quality=BROTLI_QUALITY)
+if zstandard is not None:
+    ENCODERS["zstd"] = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress
+
+# Server preference when the client accepts several encodings equally
+PREFERENCE = ("br", "zstd", "gzip")
+
+# File name suffix of each encoding
+SUFFIXES = {"gzip": ".gz", "br": ".br", "zstd": ".zst"}
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best available encoding for an Accept-Encoding header, None for identity"""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in PREFERENCE:
+        if encoding not in ENCODERS:
+            continue
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class StreamCompressor:
+    """Incremental encoder for streamed response bodies"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        else:
+            raise ValueError(f"unsupported encoding {encoding}")
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data)
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class CompressedBody:
+    """Response body kept alongside its encoded variants, each computed once"""
+
+    __slots__ = ("raw", "_encoded")
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._encoded: Dict[str, bytes] = {}
+
+    def is_encoded(self, encoding: str) -> bool:
+        return encoding in self._encoded
+
+    def encoded(self, encoding: str) -> bytes:
+        data = self._encoded.get(encoding)
+        if data is None:
+            # Two threads may race here; both compute the same bytes
+            data = self._encoded[encoding] = ENCODERS[encoding](self.raw)
+        return data
+
+
+def compress_static(body: bytes) -> Dict[str, bytes]:
+    """Every available encoding of a body at maximum compression (for files written once)"""
+    encoded = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=11)
+    if zstandard is not None:
+        encoded["zstd"] = zstandard.ZstdCompressor(level=19).compress(body)
+    return encoded
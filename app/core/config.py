@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 
@@ -5,10 +8,93 @@ from pydantic import field_validator
 class Settings(BaseSettings):
     app_name: str = "IstanbulCareAPI"
     database_url: str
+    read_database_url: Optional[str] = None  # optional replica for public reads
+    read_your_writes_seconds: int = 5  # stay on the primary this long after a write
     secret_key: str
     access_token_expire_minutes: int = 60
     env: str = "dev"
 
+    # Connection pool (ignored for in-memory SQLite)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_recycle: int = -1  # seconds, -1 disables recycling
+    db_pool_timeout: float = 30.0
+    db_pool_pre_ping: str = "always"  # "always", "idle" or "never"
+    db_pre_ping_idle_seconds: int = 300  # used by the "idle" strategy
+
+    # SQLite performance profile
+    sqlite_profile: str = "default"  # "default" or "tuned"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024
+    sqlite_busy_timeout_ms: int = 5000
+
+    # Search index: "auto" picks FTS5 on SQLite, tsvector on PostgreSQL
+    search_backend: str = "auto"  # "auto", "sqlite", "postgres" or "memory"
+
+    # Public site links used in the sitemap and feeds
+    site_url: str = "https://www.istanbulcare.com"
+    site_blog_path: str = "/{lang}/blog/{slug}"
+    site_service_path: str = "/{lang}/services/{slug}"
+
+    # Static JSON snapshots of the public reads; disabled when unset
+    snapshot_dir: Optional[str] = None
+    snapshot_max_blog_pages: int = 50  # deeper list pages are left to the API
+
+    # How often a worker checks cache_versions for writes made by other
+    # processes (seconds, checked on request; negative disables)
+    cache_sync_interval_seconds: float = 1.0
+
+    # Synthetic rows added to the sample data by create_sample_data.py and
+    # render_setup.py (see app.db.seed; 0 loads the curated fixtures only)
+    seed_scale: float = 0.0
+    seed_random_seed: int = 42
+
+    # Startup schema check: "fingerprint" compares a hash of the models with
+    # the one stored by the last create_all and only runs it on a mismatch;
+    # "create_all" always runs it; "none" leaves the schema to Alembic
+    schema_check: str = "fingerprint"
+
+    # Warm-up after startup; /ready answers 503 until it finished
+    warmup_enabled: bool = True
+    warmup_languages: str = "tr,en,fr"  # lang values requested per public route
+    warmup_timeout_seconds: float = 60.0  # ready regardless after this long
+
+    # Per-request profiles (admin requests with "X-Profile: 1" or "?_profile=1")
+    profile_dir: str = "profiles"
+    profile_max_files: int = 50  # oldest profiles are deleted past this many
+    profile_sample_interval_ms: float = 1.0
+
+    # Continuous sampling of every request, per route (/admin/profiling/hot-paths)
+    hot_paths_enabled: bool = False
+    hot_paths_interval_ms: float = 10.0  # sampling period while within the overhead budget
+    hot_paths_overhead_budget: float = 0.01  # share of one core the sampler may use
+    hot_paths_window_seconds: float = 60.0
+    hot_paths_windows: int = 10  # windows kept, the current one included
+
+    # tracemalloc diagnostics (/admin/memory); tracing can also be started there
+    memory_tracing: bool = False  # trace from startup
+    memory_trace_frames: int = 10  # traceback depth kept per allocation
+    memory_sample_every: int = 10  # one request in this many has its peak recorded
+    memory_max_snapshots: int = 10
+
+    # Event loop lag monitor (event_loop_lag_seconds); a negative interval disables it
+    loop_lag_interval_ms: float = 100.0
+    # Debug mode: report callbacks holding the loop past the threshold, with their stack
+    loop_block_debug: bool = False
+    loop_block_threshold_ms: float = 100.0
+    loop_block_reports: int = 20  # reports kept for /admin/event-loop
+
+    # Per-statement stats and the slow query log (/admin/db/slow-queries)
+    query_stats_enabled: bool = True
+    query_stats_max_fingerprints: int = 1000  # later statement shapes are only counted
+    slow_query_threshold_ms: float = 100.0
+    slow_query_explain: bool = True  # attach the database's plan to slow statements
+    slow_query_log_size: int = 100  # slow statements kept
+
+    # Response compression (gzip, plus brotli/zstd when installed)
+    compression_min_size: int = 1024  # smaller bodies are sent as-is
+    compression_thread_min_size: int = 256 * 1024  # larger bodies are compressed off the event loop
+
     @field_validator("database_url")
     @classmethod
     def validate_db_url(cls, v: str) -> str:
@@ -16,10 +102,62 @@ class Settings(BaseSettings):
             raise ValueError("DATABASE_URL must be a PostgreSQL or SQLite URL")
         return v
 
+    @field_validator("read_database_url")
+    @classmethod
+    def validate_read_db_url(cls, v: Optional[str]) -> Optional[str]:
+        if v and not (v.startswith("postgresql") or v.startswith("sqlite")):
+            raise ValueError("READ_DATABASE_URL must be a PostgreSQL or SQLite URL")
+        return v or None
+
+    @field_validator("db_pool_pre_ping")
+    @classmethod
+    def validate_pre_ping(cls, v: str) -> str:
+        if v not in ("always", "idle", "never"):
+            raise ValueError("DB_POOL_PRE_PING must be one of: always, idle, never")
+        return v
+
+    @field_validator("sqlite_profile")
+    @classmethod
+    def validate_sqlite_profile(cls, v: str) -> str:
+        if v not in ("default", "tuned"):
+            raise ValueError("SQLITE_PROFILE must be one of: default, tuned")
+        return v
+
+    @field_validator("search_backend")
+    @classmethod
+    def validate_search_backend(cls, v: str) -> str:
+        if v not in ("auto", "sqlite", "postgres", "memory"):
+            raise ValueError("SEARCH_BACKEND must be one of: auto, sqlite, postgres, memory")
+        return v
+
+    @field_validator("schema_check")
+    @classmethod
+    def validate_schema_check(cls, v: str) -> str:
+        if v not in ("fingerprint", "create_all", "none"):
+            raise ValueError("SCHEMA_CHECK must be one of: fingerprint, create_all, none")
+        return v
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
 
 
-settings = Settings()  # load at import time to fail fast if misconfigured
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Load the settings once, on first use"""
+    return Settings()
+
+
+class _LazySettings:
+    """Module-level settings proxy that defers reading the environment
+
+    Importing modules stays cheap; the app factory touches the settings
+    first, so a misconfigured deploy still fails at startup.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+
+settings = _LazySettings()
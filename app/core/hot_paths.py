@@ -0,0 +1,300 @@
+# Continuous CPU sampling per route
+#
+# With HOT_PATHS_ENABLED a daemon thread samples the stack of every thread
+# each HOT_PATHS_INTERVAL_MS, weighted by the CPU time the thread used since
+# the previous sample, and charges it to the route of the request that thread
+# is working for: the event loop thread through the running task, threadpool
+# workers through the context anyio copied into them (app.middleware.hot_paths
+# maps both to the request's scope). Threads doing something else count as
+# "(background)"; waiting ones are skipped.
+#
+# Samples are aggregated per route into CPU time per stack, in rotating
+# windows of HOT_PATHS_WINDOW_SECONDS of which the last HOT_PATHS_WINDOWS are
+# kept.
+# Each stack is also classified (serialization, compression, password
+# hashing, ORM hydration, SQL, handler code, framework) by its innermost
+# recognised frame.
+#
+# A thread can only be sampled where it last let go of the GIL, so handoffs
+# (a sync handler's call_soon_threadsafe back to the loop) collect some of the
+# CPU of the work before them and show up as framework time.
+#
+# The sampler times itself and stretches its period whenever sampling would
+# take more than HOT_PATHS_OVERHEAD_BUDGET of one core; with the GIL that is
+# also the most it takes away from request threads.
+# benchmarks/bench_hot_paths.py measures the overhead on the public endpoints.
+import asyncio
+import concurrent.futures.thread
+import queue
+import selectors
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from types import CodeType
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.profiling import frame_label, worker_context
+
+# The ASGI scope of the request being handled; workers see it through their copied context
+request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+BACKGROUND = "(background)"
+Stack = Tuple[CodeType, ...]
+
+# Innermost matching frame decides; checked in order against "function (path:line)"
+CATEGORIES = (
+    ("password hashing", ("passlib/", "hashlib")),
+    ("orm hydration", (
+        "sqlalchemy/orm/loading.py", "sqlalchemy/engine/result.py", "sqlalchemy/orm/strategies.py",
+        "sqlalchemy/orm/state.py", "sqlalchemy/orm/instrumentation.py", "sqlalchemy/orm/identity.py",
+    )),
+    ("sql", ("sqlalchemy/", "sqlite3/")),
+    ("compression", ("app/core/compression.py", "app/middleware/compression.py", "gzip.py")),
+    ("serialization", (
+        "pydantic/", "pydantic_core/", "fastapi/encoders.py", "fastapi/_compat.py", "serialize_response (",
+        "json/", "starlette/responses.py", "app/api/responses.py",
+    )),
+    ("handler", ("app/",)),
+)
+OTHER = "framework"
+
+
+def _idle_codes() -> set:
+    """Frames a thread sits in when it has nothing to do"""
+    codes = {
+        threading.Condition.wait.__code__,
+        threading.Thread._wait_for_tstate_lock.__code__,
+        queue.Queue.get.__code__,
+        concurrent.futures.thread._worker.__code__,
+    }
+    for selector in vars(selectors).values():
+        if isinstance(selector, type) and "select" in vars(selector):
+            codes.add(selector.select.__code__)
+    return codes
+
+
+_IDLE = _idle_codes()
+
+
+def _thread_cpu(thread_id: int) -> Optional[float]:
+    """CPU seconds a thread has used, where the platform exposes per-thread clocks"""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+    except (AttributeError, OSError):
+        return None
+
+
+def classify(stack: Stack) -> str:
+    for code in reversed(stack):
+        label = frame_label(code)
+        for category, markers in CATEGORIES:
+            if any(marker in label for marker in markers):
+                return category
+    return OTHER
+
+
+class Window:
+    """Samples of one time window, per route"""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.ended: Optional[float] = None
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.routes: Dict[str, Counter] = {}  # route -> stack -> CPU microseconds
+
+    def add(self, route: str, stack: Stack, cpu_us: int) -> None:
+        counts = self.routes.get(route)
+        if counts is None:
+            counts = self.routes[route] = Counter()
+        counts[stack] += cpu_us
+        self.samples += 1
+
+
+class HotPathSampler:
+    """Daemon thread sampling every thread's stack into per-route windows"""
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread: Optional[int] = None
+        self.tasks: Dict[asyncio.Task, dict] = {}  # request task on the loop -> its scope
+        self.windows: Deque[Window] = deque()
+        self.delay: Optional[float] = None  # current sampling period, stretched to stay in budget
+        self._cost: Optional[float] = None
+        self._cpu: Dict[int, float] = {}  # thread id -> CPU seconds at the previous sample
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, loop: asyncio.AbstractEventLoop, loop_thread: int) -> None:
+        if self._thread is not None:
+            return
+        self.loop, self.loop_thread = loop, loop_thread
+        self.delay = settings.hot_paths_interval_ms / 1000
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="hot-path-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        interval = settings.hot_paths_interval_ms / 1000
+        budget = settings.hot_paths_overhead_budget
+        while not self._stop.wait(self.delay):
+            started = time.perf_counter()
+            self._sample(own_id)
+            cost = time.perf_counter() - started
+            with self._lock:
+                self.windows[-1].sampling_seconds += cost
+            self._cost = cost if self._cost is None else 0.9 * self._cost + 0.1 * cost
+            # Sampling for cost seconds every delay seconds uses cost / delay of a core
+            self.delay = max(interval, self._cost / budget)
+
+    def _sample(self, own_id: int) -> None:
+        frames = sys._current_frames()
+        task = asyncio.current_task(self.loop)
+        samples: List[Tuple[str, Stack, int]] = []
+        cpu_seen: Dict[int, float] = {}
+        for thread_id, frame in frames.items():
+            if thread_id == own_id or frame.f_code in _IDLE:
+                continue  # waiting threads use no CPU; an idle worker still holds its last context
+            # Weight the stack by the CPU the thread used since the previous
+            # sample, so threads blocked in I/O or on the GIL count for nothing
+            cpu = _thread_cpu(thread_id)
+            if cpu is None:
+                weight = int(self.delay * 1e6)
+            else:
+                cpu_seen[thread_id] = cpu
+                weight = int((cpu - self._cpu.get(thread_id, cpu)) * 1e6)
+                if weight <= 0:
+                    continue
+            if thread_id == self.loop_thread:
+                scope = self.tasks.get(task) if task is not None else None
+            else:
+                context = worker_context(frame)
+                scope = context.get(request_scope) if context is not None else None
+            if scope is None:
+                route = BACKGROUND
+            else:
+                matched = scope.get("route")
+                route = getattr(matched, "path", None) or "unmatched"
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            codes.reverse()
+            samples.append((route, tuple(codes), weight))
+        self._cpu = cpu_seen
+        with self._lock:
+            window = self._window(time.time())
+            for route, stack, weight in samples:
+                window.add(route, stack, weight)
+
+    def _window(self, now: float) -> Window:
+        # Caller holds the lock
+        if not self.windows or now - self.windows[-1].started >= settings.hot_paths_window_seconds:
+            if self.windows:
+                self.windows[-1].ended = now
+            self.windows.append(Window(now))
+            while len(self.windows) > settings.hot_paths_windows:
+                self.windows.popleft()
+        return self.windows[-1]
+
+    def _merged(self, windows: int, route: Optional[str]) -> Tuple[List[Window], Dict[str, Counter]]:
+        with self._lock:
+            self._window(time.time())  # rotate if the current window is over
+            selected = list(self.windows)[-windows:]
+            merged: Dict[str, Counter] = {}
+            for window in selected:
+                for name, counts in window.routes.items():
+                    if route is None or name == route:
+                        merged.setdefault(name, Counter()).update(counts)
+        return selected, merged
+
+    def report(self, windows: int = 1, route: Optional[str] = None, top: int = 10) -> dict:
+        """Per-route CPU time, category shares, hottest stacks and functions of the last windows"""
+        selected, merged = self._merged(windows, route)
+        now = time.time()
+        wall = sum((window.ended or now) - window.started for window in selected)
+        total = sum(sum(counts.values()) for counts in merged.values())
+        routes = []
+        for name, counts in merged.items():
+            cpu_us = sum(counts.values())
+            categories: Counter = Counter()
+            functions: Counter = Counter()
+            for stack, weight in counts.items():
+                categories[classify(stack)] += weight
+                functions[frame_label(stack[-1])] += weight
+            routes.append({
+                "route": name,
+                "cpu_ms": round(cpu_us / 1000, 1),
+                "share": round(cpu_us / total, 4) if total else 0.0,
+                "categories": {category: round(weight / cpu_us, 4) for category, weight in categories.most_common()},
+                "top_functions": [
+                    {"function": function, "cpu_ms": round(weight / 1000, 1)}
+                    for function, weight in functions.most_common(top)
+                ],
+                "top_stacks": [
+                    {"stack": ";".join(frame_label(code) for code in stack), "cpu_ms": round(weight / 1000, 1)}
+                    for stack, weight in counts.most_common(top)
+                ],
+            })
+        routes.sort(key=lambda entry: -entry["cpu_ms"])
+        return {
+            "running": self.running,
+            "interval_ms": round((self.delay or 0) * 1000, 3),
+            "overhead": round(sum(window.sampling_seconds for window in selected) / wall, 5) if wall else 0.0,
+            "windows": [
+                {
+                    "started_at": datetime.utcfromtimestamp(window.started).isoformat(timespec="seconds") + "Z",
+                    "seconds": round((window.ended or now) - window.started, 1),
+                    "samples": window.samples,
+                }
+                for window in selected
+            ],
+            "cpu_ms": round(total / 1000, 1),
+            "routes": routes,
+        }
+
+    def collapsed(self, windows: int = 1, route: Optional[str] = None) -> str:
+        """Folded stacks with the route as the root frame and CPU microseconds as the count"""
+        _, merged = self._merged(windows, route)
+        lines = []
+        for name, counts in merged.items():
+            for stack, count in counts.most_common():
+                lines.append(f"{name};{';'.join(frame_label(code) for code in stack)} {count}\n")
+        return "".join(lines)
+
+
+hot_path_sampler = HotPathSampler()
+
+registry.gauge(
+    "hot_paths_sampler_overhead_ratio", "Share of one core the hot path sampler used in its current window",
+    lambda: {} if not hot_path_sampler.windows else {
+        (): hot_path_sampler.windows[-1].sampling_seconds / max(time.time() - hot_path_sampler.windows[-1].started, 1e-9)
+    },
+)
+
+
+def start_hot_path_sampler() -> None:
+    """Start sampling when HOT_PATHS_ENABLED (run at startup, on the event loop)"""
+    if settings.hot_paths_enabled:
+        hot_path_sampler.start(asyncio.get_running_loop(), threading.get_ident())
+
+
+def stop_hot_path_sampler() -> None:
+    hot_path_sampler.stop()
@@ -0,0 +1,170 @@
+# Event loop monitoring
+#
+# A task on the event loop sleeps LOOP_LAG_INTERVAL_MS at a time and records
+# how late it wakes up in the event_loop_lag_seconds histogram. The lag is
+# how long every callback that became ready at the same time had to wait:
+# time something else held the loop, such as blocking I/O in an async route.
+#
+# LOOP_BLOCK_DEBUG adds a watchdog thread. When the task is late by more than
+# LOOP_BLOCK_THRESHOLD_MS, the watchdog captures the loop thread's stack while
+# it is still blocked, which points at the code holding the loop. The report
+# (stack, task, route of the request the stack serves, and the total time
+# blocked once the loop is back) is logged and the last
+# LOOP_BLOCK_REPORTS are served at /admin/event-loop.
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Deque, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.profiling import short_path
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+RECENT_LAGS = 600  # a minute of samples at the default interval
+
+event_loop_lag_seconds = registry.histogram(
+    "event_loop_lag_seconds", "How late the event loop ran the lag monitor's timer", (), LAG_BUCKETS
+)
+event_loop_blocked_total = registry.counter(
+    "event_loop_blocked_total", "Times a callback held the event loop past LOOP_BLOCK_THRESHOLD_MS"
+)
+
+
+def _format_stack(frame) -> List[str]:
+    return [
+        f"{short_path(entry.filename)}:{entry.lineno} in {entry.name}" + (f": {entry.line}" if entry.line else "")
+        for entry in traceback.extract_stack(frame)
+    ]
+
+
+def _route(frame) -> Optional[str]:
+    """Route template from the ASGI scope of the nearest caller that has one"""
+    while frame is not None:
+        scope = frame.f_locals.get("scope")
+        if isinstance(scope, dict) and "route" in scope:
+            return getattr(scope["route"], "path", None)
+        frame = frame.f_back
+    return None
+
+
+class LoopMonitor:
+    """Lag task on the event loop, plus the blocked-loop watchdog in debug mode"""
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+        self.recent: Deque[float] = deque(maxlen=RECENT_LAGS)
+        self.reports: Deque[dict] = deque()
+        self.deadline: Optional[float] = None  # when the lag task is due back, on the monotonic clock
+        self._reported: Optional[float] = None  # deadline the current report belongs to
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    @property
+    def interval(self) -> float:
+        interval = settings.loop_lag_interval_ms / 1000
+        if settings.loop_block_debug:
+            # Wake often enough for the watchdog to tell a stall from a sleep
+            interval = min(interval, settings.loop_block_threshold_ms / 2000)
+        return interval
+
+    def start(self) -> None:
+        if settings.loop_lag_interval_ms < 0 or self.task is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.task = self.loop.create_task(self._watch_lag(), name="loop-lag-monitor")
+        if settings.loop_block_debug:
+            self._stop.clear()
+            self._watchdog = threading.Thread(target=self._watch_blocking, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        if self._watchdog is not None:
+            self._stop.set()
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _watch_lag(self) -> None:
+        interval = self.interval
+        while True:
+            self.deadline = self.loop.time() + interval
+            await asyncio.sleep(interval)
+            lag = max(self.loop.time() - self.deadline, 0.0)
+            event_loop_lag_seconds.observe(lag)
+            self.recent.append(lag)
+            if self._reported == self.deadline:
+                self.reports[-1]["blocked_ms"] = round(lag * 1000, 1)
+
+    def _watch_blocking(self) -> None:
+        threshold = settings.loop_block_threshold_ms / 1000
+        while not self._stop.wait(threshold / 4):
+            deadline = self.deadline
+            if deadline is None or deadline == self._reported or time.monotonic() - deadline < threshold:
+                continue
+            frame = sys._current_frames().get(self.loop_thread)
+            if frame is None:
+                continue
+            self._report(deadline, frame)
+
+    def _report(self, deadline: float, frame) -> None:
+        task = asyncio.current_task(self.loop)
+        route = _route(frame)
+        report = {
+            "at": datetime.utcnow().isoformat(timespec="milliseconds") + "Z",
+            "blocked_ms": None,  # filled in when the loop is back
+            "task": task.get_name() if task is not None else None,
+            "route": route,
+            "stack": _format_stack(frame),
+        }
+        self.reports.append(report)
+        while len(self.reports) > settings.loop_block_reports:
+            self.reports.popleft()
+        self._reported = deadline
+        event_loop_blocked_total.inc()
+        logger.warning(
+            "Event loop blocked for over %.0f ms (task %s, route %s):\n  %s",
+            settings.loop_block_threshold_ms, report["task"], route, "\n  ".join(report["stack"]),
+        )
+
+    def summary(self) -> dict:
+        lags = sorted(self.recent)
+
+        def quantile(q: float) -> Optional[float]:
+            return round(lags[min(int(q * len(lags)), len(lags) - 1)] * 1000, 3) if lags else None
+
+        return {
+            "running": self.task is not None,
+            "interval_ms": round(self.interval * 1000, 3),
+            "block_debug": self._watchdog is not None,
+            "block_threshold_ms": settings.loop_block_threshold_ms,
+            "recent_lag_ms": {
+                "samples": len(lags), "p50": quantile(0.5), "p99": quantile(0.99),
+                "max": round(lags[-1] * 1000, 3) if lags else None,
+            },
+            "blocked": list(reversed(self.reports)),
+        }
+
+
+loop_monitor = LoopMonitor()
+
+
+def start_loop_monitor() -> None:
+    """Start the lag monitor (and the watchdog in debug mode) on the running loop (run at startup)"""
+    loop_monitor.start()
+
+
+def stop_loop_monitor() -> None:
+    loop_monitor.stop()
@@ -0,0 +1,231 @@
+# Memory diagnostics
+#
+# Built on tracemalloc, which is off by default: it slows allocations down
+# and keeps a traceback per live block. It is started from /admin/memory/tracing
+# (or at startup with MEMORY_TRACING=true) and stopped the same way.
+#
+# While tracing:
+# - snapshots can be taken, listed by top allocation sites and diffed against
+#   each other; the last MEMORY_MAX_SNAPSHOTS are kept;
+# - one request in MEMORY_SAMPLE_EVERY has its peak allocation recorded per
+#   route (app.middleware.memory). The peak is the process-wide traced peak
+#   above the traced size at the start of the request, and only one request
+#   is sampled at a time, so concurrent requests can only inflate it.
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.profiling import short_path
+
+PEAK_BUCKETS = tuple(float(1 << shift) for shift in range(14, 31, 2))  # 16 KiB .. 1 GiB
+
+request_peak_bytes = registry.histogram(
+    "http_request_peak_alloc_bytes",
+    "Peak traced allocation of sampled requests while memory tracing is on",
+    ("method", "path"), PEAK_BUCKETS,
+)
+
+# Frames of the tracer itself and of imports are noise in every report
+_NOISE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _traceback(traceback: tracemalloc.Traceback) -> List[str]:
+    return [f"{short_path(frame.filename)}:{frame.lineno}" for frame in traceback]
+
+
+def _site(traceback: tracemalloc.Traceback, group_by: str) -> dict:
+    if group_by == "traceback":
+        return {"traceback": _traceback(traceback)}
+    if group_by == "filename":
+        return {"site": short_path(traceback[0].filename)}
+    return {"site": _traceback(traceback)[0]}
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process, where /proc provides it"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class RouteMemory:
+    """Peak allocation of the sampled requests of one route"""
+
+    def __init__(self):
+        self.samples = 0
+        self.total = 0
+        self.max = 0
+        self.last = 0
+
+    def add(self, peak: int) -> None:
+        self.samples += 1
+        self.total += peak
+        self.max = max(self.max, peak)
+        self.last = peak
+
+    def as_dict(self) -> dict:
+        return {
+            "samples": self.samples,
+            "mean_kib": round(self.total / self.samples / 1024, 1) if self.samples else 0.0,
+            "max_kib": round(self.max / 1024, 1),
+            "last_kib": round(self.last / 1024, 1),
+        }
+
+
+class MemoryDiagnostics:
+    """tracemalloc control, stored snapshots and per-route request peaks"""
+
+    def __init__(self):
+        self.tracing = False  # started by us; other tracemalloc users are left alone
+        self.snapshots: Deque[Tuple[int, float, str, tracemalloc.Snapshot]] = deque()
+        self.routes: Dict[Tuple[str, str], RouteMemory] = {}
+        self._next_id = 1
+        self._requests = 0
+        self._sampling = False
+        self._lock = threading.Lock()
+
+    # Tracing
+    def start(self, frames: Optional[int] = None) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames or settings.memory_trace_frames)
+        self.tracing = True
+
+    def stop(self) -> None:
+        if self.tracing:
+            self.tracing = False
+            tracemalloc.stop()
+
+    def status(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        rss = rss_bytes()
+        return {
+            "tracing": self.tracing,
+            "frames": tracemalloc.get_traceback_limit() if self.tracing else None,
+            "traced_kib": round(current / 1024, 1),
+            "traced_peak_kib": round(peak / 1024, 1),
+            "tracemalloc_overhead_kib": round(tracemalloc.get_tracemalloc_memory() / 1024, 1),
+            "rss_kib": None if rss is None else round(rss / 1024, 1),
+            "sample_every": settings.memory_sample_every,
+            "snapshots": self.list_snapshots(),
+            "routes": self.route_peaks(),
+        }
+
+    # Snapshots
+    def take_snapshot(self, label: str = "") -> dict:
+        snapshot = tracemalloc.take_snapshot().filter_traces(_NOISE)
+        taken = time.time()
+        with self._lock:
+            snapshot_id, self._next_id = self._next_id, self._next_id + 1
+            self.snapshots.append((snapshot_id, taken, label, snapshot))
+            while len(self.snapshots) > settings.memory_max_snapshots:
+                self.snapshots.popleft()
+        return self._summary(snapshot_id, taken, label, snapshot)
+
+    @staticmethod
+    def _summary(snapshot_id: int, taken: float, label: str, snapshot: tracemalloc.Snapshot) -> dict:
+        return {
+            "id": snapshot_id,
+            "label": label,
+            "taken_at": datetime.utcfromtimestamp(taken).isoformat(timespec="seconds") + "Z",
+            "blocks": len(snapshot.traces),
+            "size_kib": round(sum(trace.size for trace in snapshot.traces) / 1024, 1),
+        }
+
+    def list_snapshots(self) -> List[dict]:
+        with self._lock:
+            stored = list(self.snapshots)
+        return [self._summary(*entry) for entry in stored]
+
+    def snapshot(self, snapshot_id: Optional[int] = None) -> Optional[tracemalloc.Snapshot]:
+        """A stored snapshot by id, or the newest one"""
+        with self._lock:
+            for stored_id, _, _, snapshot in reversed(self.snapshots):
+                if snapshot_id is None or stored_id == snapshot_id:
+                    return snapshot
+        return None
+
+    @staticmethod
+    def top(snapshot: tracemalloc.Snapshot, group_by: str = "lineno", limit: int = 20) -> List[dict]:
+        """The allocation sites holding the most memory"""
+        return [
+            {
+                **_site(stat.traceback, group_by),
+                "size_kib": round(stat.size / 1024, 1),
+                "blocks": stat.count,
+            }
+            for stat in snapshot.statistics(group_by)[:limit]
+        ]
+
+    @staticmethod
+    def diff(base: tracemalloc.Snapshot, target: tracemalloc.Snapshot, group_by: str = "lineno", limit: int = 20) -> List[dict]:
+        """The sites whose memory grew (or shrank) the most from base to target"""
+        return [
+            {
+                **_site(stat.traceback, group_by),
+                "size_diff_kib": round(stat.size_diff / 1024, 1),
+                "size_kib": round(stat.size / 1024, 1),
+                "blocks_diff": stat.count_diff,
+            }
+            for stat in target.compare_to(base, group_by)[:limit]
+        ]
+
+    # Per-request peaks
+    def begin_sample(self) -> Optional[int]:
+        """Start sampling the current request, if it is its turn; returns the traced size to measure from"""
+        if not self.tracing:
+            return None
+        with self._lock:
+            self._requests += 1
+            if self._sampling or self._requests % settings.memory_sample_every:
+                return None
+            self._sampling = True
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+
+    def end_sample(self, method: str, route: str, baseline: int) -> None:
+        try:
+            if tracemalloc.is_tracing():
+                peak = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+                with self._lock:
+                    self.routes.setdefault((method, route), RouteMemory()).add(peak)
+                request_peak_bytes.observe(peak, (method, route))
+        finally:
+            self._sampling = False
+
+    def route_peaks(self) -> List[dict]:
+        with self._lock:
+            routes = list(self.routes.items())
+        return sorted(
+            ({"method": method, "route": route, **memory.as_dict()} for (method, route), memory in routes),
+            key=lambda entry: -entry["max_kib"],
+        )
+
+
+memory_diagnostics = MemoryDiagnostics()
+
+
+def _rss_sample() -> Dict[tuple, float]:
+    rss = rss_bytes()
+    return {} if rss is None else {(): float(rss)}
+
+
+registry.gauge("process_resident_memory_bytes", "Resident set size of the worker process", _rss_sample)
+
+
+def start_memory_tracing() -> None:
+    """Start tracing at startup when MEMORY_TRACING is set"""
+    if settings.memory_tracing:
+        memory_diagnostics.start()
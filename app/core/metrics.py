@@ -0,0 +1,417 @@
+# Prometheus-compatible metrics collectors
+#
+# Collectors are sharded per thread: every writer thread owns its own dict of
+# samples, so the hot path is a thread-local lookup plus a dict update and no
+# shared lock is taken after a thread's first observation. Shards are summed on
+# scrape. A histogram observation updates a bucket and the sum, so it holds its
+# shard's own lock (uncontended but for scrapes) to keep a scrape from copying
+# the series between the two.
+import abc
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _ShardedMetric(abc.ABC):
+    """Base class holding one sample shard per writer thread"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._local = threading.local()
+        self._shards: List[Tuple[dict, threading.Lock]] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> Tuple[dict, threading.Lock]:
+        """This thread's samples and the lock guarding multi-step updates of them"""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = ({}, threading.Lock())
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    @staticmethod
+    def _copy_sample(value):
+        return value
+
+    def _snapshots(self) -> List[dict]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        snapshots = []
+        for samples, lock in shards:
+            with lock:
+                snapshots.append({labels: self._copy_sample(value) for labels, value in samples.items()})
+        return snapshots
+
+    @abc.abstractmethod
+    def collect(self) -> List[str]:
+        """Exposition lines of every series"""
+
+
+class Counter(_ShardedMetric):
+    """Monotonically increasing counter"""
+
+    type_name = "counter"
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        # A single assignment, so no lock: a scrape sees the old or the new value
+        samples = self._shard()[0]
+        samples[labels] = samples.get(labels, 0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        totals: Dict[LabelValues, float] = {}
+        for snapshot in self._snapshots():
+            for labels, value in snapshot.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def collect(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.values().items())
+        ]
+
+
+class Histogram(_ShardedMetric):
+    """Cumulative histogram with fixed bucket bounds"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        samples, lock = self._shard()
+        bucket = bisect_left(self.buckets, value)
+        with lock:
+            series = samples.get(labels)
+            if series is None:
+                # bucket counts, then +Inf bucket, then sum
+                series = samples[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bucket] += 1
+            series[-1] += value
+
+    @staticmethod
+    def _copy_sample(value):
+        return list(value)
+
+    def values(self) -> Dict[LabelValues, List[float]]:
+        totals: Dict[LabelValues, List[float]] = {}
+        for snapshot in self._snapshots():
+            for labels, series in snapshot.items():
+                current = totals.get(labels)
+                if current is None:
+                    totals[labels] = series
+                else:
+                    for i, value in enumerate(series):
+                        current[i] += value
+        return totals
+
+    def collect(self) -> List[str]:
+        lines = []
+        for labels, series in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose samples are computed by a callback at scrape time"""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        labelnames: Tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.callback = callback
+
+    def collect(self) -> List[str]:
+        try:
+            samples = self.callback()
+        except Exception:
+            return []
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(samples.items())
+        ]
+
+
+class MetricsRegistry:
+    """Holds every collector exposed on /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        labelnames: Tuple[str, ...] = (),
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, callback, labelnames))
+
+    def render(self) -> str:
+        """Render all collectors in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP
+http_requests_total = registry.counter(
+    "http_requests_total", "Total HTTP requests", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds", ("method", "route")
+)
+
+# Caches
+cache_requests_total = registry.counter(
+    "cache_requests_total", "Cache lookups by result", ("cache", "result")
+)
+
+# Request coalescing
+singleflight_requests_total = registry.counter(
+    "singleflight_requests_total", "Coalesced reads by role (leader ran it, shared joined it)", ("group", "role")
+)
+
+# Response compression
+http_compressed_responses_total = registry.counter(
+    "http_compressed_responses_total", "Responses sent compressed", ("encoding", "source")
+)
+http_compression_saved_bytes_total = registry.counter(
+    "http_compression_saved_bytes_total", "Response bytes saved by compression", ("encoding",)
+)
+
+# Uploads
+upload_bytes_total = registry.counter("upload_bytes_total", "Bytes accepted by image uploads")
+upload_files_total = registry.counter("upload_files_total", "Files accepted by image uploads")
+
+# Database pool
+db_pool_checkout_wait_seconds = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ("engine",)
+)
+db_connection_hold_seconds = registry.histogram(
+    "db_connection_hold_seconds", "Time a connection stays checked out of the pool", ("engine",)
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a cache lookup for the hit ratio metrics"""
+    cache_requests_total.inc((cache, "hit" if hit else "miss"))
+
+
+def record_compression(encoding: str, source: str, raw_size: int, sent_size: int) -> None:
+    """Count a compressed response and the bytes it saved (source: live or cached)"""
+    http_compressed_responses_total.inc((encoding, source))
+    http_compression_saved_bytes_total.inc((encoding,), raw_size - sent_size)
+
+
+def _cache_hit_ratio() -> Dict[LabelValues, float]:
+    hits: Dict[str, float] = {}
+    totals: Dict[str, float] = {}
+    for (cache, result), value in cache_requests_total.values().items():
+        totals[cache] = totals.get(cache, 0) + value
+        if result == "hit":
+            hits[cache] = hits.get(cache, 0) + value
+    return {(cache,): hits.get(cache, 0) / total for cache, total in totals.items() if total}
+
+
+registry.gauge("cache_hit_ratio", "Cache hit ratio since process start", _cache_hit_ratio, ("cache",))
+
+
+def _threadpool_stats() -> Dict[LabelValues, float]:
+    # Only callable from inside the event loop, which is where /metrics runs
+    from anyio.to_thread import current_default_thread_limiter
+
+    limiter = current_default_thread_limiter()
+    return {
+        ("borrowed",): limiter.borrowed_tokens,
+        ("total",): limiter.total_tokens,
+    }
+
+
+registry.gauge(
+    "threadpool_tokens", "Worker threadpool capacity used by sync endpoints", _threadpool_stats, ("state",)
+)
+
+
+def _threadpool_utilization() -> Dict[LabelValues, float]:
+    stats = _threadpool_stats()
+    total = stats[("total",)]
+    return {(): stats[("borrowed",)] / total if total else 0.0}
+
+
+registry.gauge("threadpool_utilization", "Fraction of worker threads in use", _threadpool_utilization)
+
+
+_instrumented_engines: Dict[str, object] = {}
+
+
+def _pool_stats() -> Dict[LabelValues, float]:
+    samples: Dict[LabelValues, float] = {}
+    for name, engine in list(_instrumented_engines.items()):
+        pool = engine.pool
+        for stat in ("size", "checkedout", "overflow", "checkedin"):
+            method = getattr(pool, stat, None)
+            if method is not None:
+                samples[(name, stat)] = method()
+    return samples
+
+
+registry.gauge("db_pool_connections", "SQLAlchemy pool connection counts", _pool_stats, ("engine", "state"))
+
+
+# Engine name -> (pool.connect wrapper, [(event name, listener)]) of each instrumented engine
+_engine_hooks: Dict[str, Tuple[Callable, List[Tuple[str, Callable]]]] = {}
+
+
+def instrument_engine(engine, name: str = "primary") -> None:
+    """Expose pool gauges for an engine and time waits for its connections"""
+    if name in _instrumented_engines:
+        return
+    _instrumented_engines[name] = engine
+    connect = engine.pool.connect
+    labels = (name,)
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            db_pool_checkout_wait_seconds.observe(time.perf_counter() - started, labels)
+
+    def _mark_checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    def _observe_hold(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            db_connection_hold_seconds.observe(time.perf_counter() - checked_out_at, labels)
+
+    _engine_hooks[name] = (timed_connect, [("checkout", _mark_checkout), ("checkin", _observe_hold)])
+    _attach_engine_hooks(name)
+
+
+def _attach_engine_hooks(name: str) -> None:
+    from sqlalchemy import event
+
+    engine = _instrumented_engines[name]
+    timed_connect, listeners = _engine_hooks[name]
+    engine.pool.connect = timed_connect
+    for identifier, listener in listeners:
+        event.listen(engine, identifier, listener)
+
+
+def _detach_engine_hooks(name: str) -> None:
+    from sqlalchemy import event
+
+    engine = _instrumented_engines[name]
+    _, listeners = _engine_hooks[name]
+    del engine.pool.connect  # back to the pool class's own method
+    for identifier, listener in listeners:
+        event.remove(engine, identifier, listener)
+
+
+def set_engine_instrumentation(enabled: bool) -> None:
+    """Attach or detach the pool timing hooks of every instrumented engine
+
+    Used by benchmarks/bench_metrics.py to measure what the hooks cost; the
+    app itself keeps them attached.
+    """
+    from sqlalchemy import event
+
+    for name, engine in _instrumented_engines.items():
+        attached = event.contains(engine, "checkout", _engine_hooks[name][1][0][1])
+        if enabled and not attached:
+            _attach_engine_hooks(name)
+        elif not enabled and attached:
+            _detach_engine_hooks(name)
+
+
+def render_metrics() -> str:
+    """Render the process metrics for a scrape"""
+    return registry.render()
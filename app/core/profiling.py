@@ -0,0 +1,299 @@
+# Per-request profiling
+#
+# An admin request carrying "X-Profile: 1" or "?_profile=1" runs under a
+# sampling profiler (see app.middleware.profiling). A sampler thread reads the
+# stacks of the threads working for that request: the event loop thread while
+# the request's task is the one running, and threadpool workers whose copied
+# context carries the profile. Each SQL statement the request executes is
+# recorded with its timing, and samples taken while one runs get it as their
+# leaf frame. Finished profiles are kept as JSON files in a bounded on-disk
+# ring buffer (PROFILE_DIR, PROFILE_MAX_FILES) and served as collapsed
+# stacks, the input format of flamegraph.pl, speedscope and inferno.
+#
+# Requests without the flag pay for the flag check only: the sampler thread
+# runs while a profile is active and the SQL hooks are installed by the first
+# profiled request.
+import asyncio
+import json
+import os
+import re
+import secrets
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from contextvars import Context, ContextVar
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from types import CodeType
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STDLIB = sysconfig.get_paths()["stdlib"]
+
+# The profile of the request being handled; threadpool workers see it
+# through the context anyio copies into them
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+# anyio's worker thread class is private: without it, any run() frame holding
+# a copied context in its "context" local is taken for a worker
+try:
+    from anyio._backends._asyncio import WorkerThread
+
+    _WORKER_CODE: Optional[CodeType] = WorkerThread.run.__code__
+except (ImportError, AttributeError):
+    _WORKER_CODE = None
+_WHITESPACE = re.compile(r"\s+")
+
+
+def new_profile_id() -> str:
+    """Time-ordered id: milliseconds since the epoch and a random suffix"""
+    return f"{int(time.time() * 1000):013d}-{secrets.token_hex(4)}"
+
+
+def short_path(filename: str) -> str:
+    """A source path relative to site-packages, the app or the stdlib"""
+    if "site-packages" + os.sep in filename:
+        return filename.rsplit("site-packages" + os.sep, 1)[1]
+    for prefix in (ROOT, STDLIB):
+        if filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return os.path.basename(filename)
+
+
+@lru_cache(maxsize=8192)
+def frame_label(code: CodeType) -> str:
+    """"function (path:line)" of a code object"""
+    # ";" separates frames in the collapsed format
+    return f"{code.co_qualname} ({short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+def worker_context(frame):
+    """The context a threadpool worker runs its current call in, or None for other threads"""
+    # The worker's run() frame holds it in a local
+    while frame is not None:
+        if _WORKER_CODE is not None:
+            if frame.f_code is _WORKER_CODE:
+                return frame.f_locals.get("context")
+        elif frame.f_code.co_name == "run" and isinstance(frame.f_locals.get("context"), Context):
+            return frame.f_locals["context"]
+        frame = frame.f_back
+    return None
+
+
+def _sql_label(statement: str) -> str:
+    return "sql: " + _WHITESPACE.sub(" ", statement).strip()[:120].replace(";", ",")
+
+
+class RequestProfile:
+    """Samples and SQL statements collected for one request"""
+
+    def __init__(self, method: str, path: str, query: str):
+        self.id = new_profile_id()
+        self.method = method
+        self.path = path
+        self.query = query
+        self.route: Optional[str] = None
+        self.status: Optional[int] = None
+        self.started_at = datetime.utcnow()
+        self.started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.task = asyncio.current_task()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.sql: List[dict] = []
+        self.executing: Dict[int, str] = {}  # thread id -> statement running there
+
+    def record(self, frame, thread_id: int) -> None:
+        labels = []
+        while frame is not None:
+            labels.append(frame_label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        statement = self.executing.get(thread_id)
+        if statement is not None:
+            labels.append(_sql_label(statement))
+        self.stacks[";".join(labels)] += 1
+        self.samples += 1
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self.started
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "route": self.route,
+            "status": self.status,
+            "started_at": self.started_at.isoformat() + "Z",
+            "duration_ms": None if self.duration is None else round(self.duration * 1000, 3),
+            "sample_interval_ms": settings.profile_sample_interval_ms,
+            "samples": self.samples,
+            "sql_ms": round(sum(query["ms"] for query in self.sql), 3),
+            "sql": self.sql,
+            "stacks": dict(self.stacks.most_common()),
+        }
+
+
+class Sampler:
+    """Background thread sampling the stacks of the active profiles"""
+
+    def __init__(self):
+        self._active: Set[RequestProfile] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._switch_interval: Optional[float] = None
+
+    @property
+    def interval(self) -> float:
+        return settings.profile_sample_interval_ms / 1000
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active.add(profile)
+            if self._thread is None:
+                # The default 5 ms switch interval would hold the sampler
+                # back while request code keeps the GIL
+                self._switch_interval = sys.getswitchinterval()
+                sys.setswitchinterval(min(self._switch_interval, self.interval))
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def remove(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active.discard(profile)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            with self._lock:
+                profiles = list(self._active)
+                if not profiles:
+                    sys.setswitchinterval(self._switch_interval)
+                    self._thread = None
+                    return
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                profile = self._owner(thread_id, frame, profiles)
+                if profile is not None:
+                    profile.record(frame, thread_id)
+            time.sleep(self.interval)
+
+    @staticmethod
+    def _owner(thread_id: int, frame, profiles: List[RequestProfile]) -> Optional[RequestProfile]:
+        for profile in profiles:
+            if profile.loop_thread == thread_id:
+                return profile if asyncio.current_task(profile.loop) is profile.task else None
+        context = worker_context(frame)
+        owner = context.get(current_profile) if context is not None else None
+        return owner if owner in profiles else None
+
+
+sampler = Sampler()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    if profile is not None:
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+        profile.executing[threading.get_ident()] = statement
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    starts = conn.info.get("profile_query_start")
+    if profile is None or not starts:
+        return
+    started = starts.pop()
+    profile.executing.pop(threading.get_ident(), None)
+    profile.sql.append({
+        "statement": statement,
+        "ms": round((time.perf_counter() - started) * 1000, 3),
+        "offset_ms": round((started - profile.started) * 1000, 3),
+        "executemany": executemany,
+    })
+
+
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+
+def install_sql_hooks() -> None:
+    """Listen to statement execution on every engine (once, on the first profile)"""
+    global _hooks_installed
+    with _hooks_lock:
+        if not _hooks_installed:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            _hooks_installed = True
+
+
+class ProfileStore:
+    """Bounded ring buffer of profiles on disk, one JSON file per profile"""
+
+    ID_PATTERN = re.compile(r"^\d{13}-[0-9a-f]{8}$")
+
+    def __init__(self, directory: Optional[str] = None, max_files: Optional[int] = None):
+        self._directory = directory
+        self._max_files = max_files
+
+    @property
+    def directory(self) -> Path:
+        return Path(self._directory or settings.profile_dir)
+
+    @property
+    def max_files(self) -> int:
+        return self._max_files if self._max_files is not None else settings.profile_max_files
+
+    def save(self, profile: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{profile['id']}.json"
+        partial = path.with_suffix(".tmp")
+        partial.write_text(json.dumps(profile), encoding="utf-8")
+        os.replace(partial, path)
+        for old in self.ids()[self.max_files:]:
+            (self.directory / f"{old}.json").unlink(missing_ok=True)
+
+    def ids(self) -> List[str]:
+        """Stored profile ids, newest first"""
+        if not self.directory.is_dir():
+            return []
+        return sorted((path.stem for path in self.directory.glob("*.json") if self.ID_PATTERN.match(path.stem)), reverse=True)
+
+    def load(self, profile_id: str) -> Optional[dict]:
+        if not self.ID_PATTERN.match(profile_id):
+            return None
+        try:
+            return json.loads((self.directory / f"{profile_id}.json").read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None  # never stored, or pushed out of the ring buffer
+
+    def summaries(self) -> List[dict]:
+        summaries = []
+        for profile_id in self.ids():
+            profile = self.load(profile_id)
+            if profile is not None:
+                profile["statements"] = len(profile.pop("sql"))
+                profile["stacks"] = len(profile["stacks"])
+                summaries.append(profile)
+        return summaries
+
+
+profile_store = ProfileStore()
+
+
+def collapsed_stacks(stacks: Dict[str, int]) -> str:
+    """One "frame;frame;... count" line per stack (Brendan Gregg's folded format)"""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.items())
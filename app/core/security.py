@@ -31,16 +31,13 @@ def create_access_token(subject: str, is_admin: bool, expires_minutes: Optional[
     return jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Security(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
+def user_from_token(token_value: str, db: Session) -> User:
+    """The user a bearer token belongs to; raises 401 for invalid tokens or unknown users"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    token_value = credentials.credentials
 
     try:
         payload = jwt.decode(token_value, settings.secret_key, algorithms=["HS256"]) 
@@ -58,6 +55,15 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Security(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> User:
+    return user_from_token(credentials.credentials, db)
+
+
+
+
 def require_admin(user: User = Security(get_current_user)) -> User:
     if not user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
@@ -0,0 +1,138 @@
+# Request coalescing for concurrent identical reads
+#
+# While a computation for a key is in flight, further callers with the same
+# key wait for it and share its result (or exception) instead of running the
+# same query and serialization again. Nothing is kept once the call returns;
+# caching stays the job of app.core.cache.
+#
+# Groups are tagged with entity names like TaggedCache entries. A committed
+# write to a tagged entity detaches the in-flight calls of the group, so
+# requests arriving after the commit never join a computation that started
+# before it.
+import asyncio
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, TypeVar
+
+from app.core.metrics import singleflight_requests_total
+from app.db.events import ContentChange, on_content_change, on_remote_content_change
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Share one in-flight computation between concurrent callers of the same key
+
+    ``do`` is for threadpool code, ``do_async`` for coroutines on the event
+    loop. Shared results must be fully loaded (no lazy loads), since they are
+    used outside the session of the request that computed them.
+    """
+
+    def __init__(self, name: str, tags: Iterable[str] = ()):
+        self.name = name
+        self.tags = frozenset(tags)
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        _groups.append(self)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run fn, or wait for the identical call already running in another thread"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        singleflight_requests_total.inc((self.name, "leader" if leader else "shared"))
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn(), or the identical coroutine already running on the event loop"""
+        task = self._tasks.get(key)
+        leader = task is None
+        if leader:
+            # Run as its own task so a cancelled caller does not cancel the others
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(functools.partial(self._task_done, key))
+        singleflight_requests_total.inc((self.name, "leader" if leader else "shared"))
+        return await asyncio.shield(task)
+
+    def _task_done(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every caller went away
+
+    def forget(self) -> None:
+        """Detach the in-flight calls; running ones finish for their current callers only"""
+        with self._lock:
+            self._calls = {}
+        self._tasks = {}
+
+
+def coalesced(group: SingleFlight, key: Callable[..., Hashable]):
+    """Decorator coalescing concurrent calls of a function whose key(*args, **kwargs) match
+
+    Works on sync functions (run by the threadpool) and on coroutine functions.
+    """
+
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                return await group.do_async(
+                    (fn.__qualname__, key(*args, **kwargs)), lambda: fn(*args, **kwargs)
+                )
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return group.do((fn.__qualname__, key(*args, **kwargs)), lambda: fn(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+_groups: List[SingleFlight] = []
+
+# Shared groups for the public reads
+blog_flights = SingleFlight("blog_post", ("blog_post",))
+service_flights = SingleFlight("service", ("service",))
+header_flights = SingleFlight("header", ("header_column", "combobox_item"))
+
+
+@on_remote_content_change
+@on_content_change
+def forget_stale_flights(changes: List[ContentChange]) -> None:
+    """Stop new callers from joining computations started before the write"""
+    entities = {change.entity for change in changes}
+    for group in list(_groups):
+        if group.tags & entities:
+            group.forget()
@@ -0,0 +1,131 @@
+"""
+Startup profile
+
+phase() times the steps of the app factory and of the startup hook. Run as a
+script, this starts the app in a fresh interpreter under ``python -X
+importtime`` and reports where the cold start goes: import time by module
+and by package, then the time of every init phase.
+
+Usage: python main.py --startup-profile [--top 20] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+# (name, seconds) of every phase run in this process, in order
+phases: List[Tuple[str, float]] = []
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Runs in the profiled interpreter; exits without waiting for background jobs
+_PROFILED_START = """
+import asyncio, json, os, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+application = app.main.create_app()
+asyncio.run(application.router.startup())
+from app.core.startup import phases
+print(json.dumps({"import": imported - started, "phases": phases, "total": time.perf_counter() - started}))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@contextmanager
+def phase(name: str):
+    """Record how long the block takes under name"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases.append((name, time.perf_counter() - started))
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, self us, cumulative us, depth) of every -X importtime line"""
+    imports = []
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            imports.append((match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2))
+    return imports
+
+
+def _group(module: str) -> str:
+    # The app's own modules are listed one by one, libraries by package
+    parts = module.split(".")
+    return ".".join(parts[:3]) if parts[0] == "app" else parts[0]
+
+
+def profile_startup() -> dict:
+    """Start the app in a child interpreter and collect its import and phase timings"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROFILED_START],
+        cwd=ROOT, capture_output=True, text=True, env=os.environ.copy(),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"App startup failed:\n{result.stderr[-4000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    imports = _parse_importtime(result.stderr)
+
+    by_group: Dict[str, int] = defaultdict(int)
+    for module, self_us, _, _ in imports:
+        by_group[_group(module)] += self_us
+    return {
+        "total_s": round(timings["total"], 4),
+        "import_app_main_s": round(timings["import"], 4),
+        "import_total_s": round(sum(self_us for _, self_us, _, _ in imports) / 1e6, 4),
+        "phases": [{"name": name, "seconds": round(seconds, 4)} for name, seconds in timings["phases"]],
+        "groups": sorted(
+            ({"name": name, "self_ms": round(us / 1000, 2)} for name, us in by_group.items()),
+            key=lambda group: -group["self_ms"],
+        ),
+        "modules": sorted(
+            (
+                {"name": module, "self_ms": round(self_us / 1000, 2), "cumulative_ms": round(cumulative / 1000, 2)}
+                for module, self_us, cumulative, _ in imports
+            ),
+            key=lambda module: -module["self_ms"],
+        ),
+    }
+
+
+def print_report(report: dict, top: int) -> None:
+    print(f"Cold start {report['total_s'] * 1000:.0f} ms, of which imports {report['import_total_s'] * 1000:.0f} ms")
+    print(f"\n{'init phase':<34} {'ms':>9}")
+    for entry in report["phases"]:
+        print(f"{entry['name']:<34} {entry['seconds'] * 1000:>9.1f}")
+    print(f"\n{'package / app module':<34} {'self ms':>9}")
+    for entry in report["groups"][:top]:
+        print(f"{entry['name']:<34} {entry['self_ms']:>9.1f}")
+    print(f"\n{'slowest modules':<50} {'self ms':>9} {'cumul ms':>9}")
+    for entry in report["modules"][:top]:
+        print(f"{entry['name'][:50]:<50} {entry['self_ms']:>9.1f} {entry['cumulative_ms']:>9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Break the app's cold start down by module and init phase")
+    parser.add_argument("--startup-profile", action="store_true", help="accepted for python main.py")
+    parser.add_argument("--top", type=int, default=20, help="rows per table")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+    report = profile_startup()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.top)
+
+
+if __name__ == "__main__":
+    main()
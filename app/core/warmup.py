@@ -0,0 +1,239 @@
+# Worker warm-up and readiness
+#
+# A fresh worker pays for SQLAlchemy statement compilation, Pydantic
+# serializer setup and empty response caches on its first requests. After
+# startup the warm-up runs in the background: it executes every repository
+# query once (filling each engine's compiled statement cache), then calls the
+# ASGI app once per public GET route and language. That builds each route's
+# Pydantic serializers and fills the bootstrap, sitemap and feed response
+# caches; the other routes have no response cache. Warm-up requests carry
+# "warmup" in their scope so they stay out of the request metrics.
+# /ready answers 503 until it has finished (or failed, or timed out), so load
+# balancers only route traffic to warm workers.
+import asyncio
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import anyio
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Routers whose GET routes are warmed
+WARMUP_TAGS = {"public", "feeds"}
+SITEMAP_SHARD = re.compile(r"/sitemaps/([^/<]+)\.xml")
+
+
+class WarmupState:
+    """Progress of this worker's warm-up, reported by /ready"""
+
+    def __init__(self):
+        self.status = "pending"  # pending, running, done, failed, timeout or disabled
+        self.started_at: Optional[float] = None
+        self.seconds: Optional[float] = None
+        self.steps: List[Dict[str, object]] = []
+        self.finished = threading.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.finished.is_set()
+
+    def finish(self, status: str) -> None:
+        self.status = status
+        if self.started_at is not None:
+            self.seconds = time.perf_counter() - self.started_at
+        self.finished.set()
+
+    def as_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "status": self.status,
+            "seconds": None if self.seconds is None else round(self.seconds, 3),
+            "steps": self.steps,
+        }
+
+
+warmup_state = WarmupState()
+
+registry.gauge("app_ready", "1 once the worker finished warming up", lambda: {(): float(warmup_state.ready)})
+registry.gauge(
+    "app_warmup_seconds", "Time the worker spent warming up",
+    lambda: {} if warmup_state.seconds is None else {(): warmup_state.seconds},
+)
+
+
+def _languages() -> List[str]:
+    return [lang.strip() for lang in settings.warmup_languages.split(",") if lang.strip()]
+
+
+def precompile_statements() -> int:
+    """Run each repository query once per engine so its compiled form is cached"""
+    from app.db import session
+    from app.db.query_plans import QUERY_CASES
+
+    factories = [session.SessionLocal]
+    if session.read_engine is not session.engine:
+        factories.append(session.ReadSessionLocal)
+    executed = 0
+    for factory in factories:
+        with factory() as db:
+            for case in QUERY_CASES:
+                if case.full_scan_ok:
+                    continue  # reads a whole table; not worth it at startup
+                case.run(db)
+                executed += 1
+            db.rollback()
+    return executed
+
+
+def _path_samples() -> Dict[str, List[Dict[str, str]]]:
+    """Path parameter values for the public routes that take some"""
+    from app.db import session
+    from app.repositories.blog_repository import BlogRepository
+    from app.repositories.header_repository import HeaderColumnRepository
+    from app.repositories.service_repository import ServiceRepository
+
+    with session.ReadSessionLocal() as db:
+        services = ServiceRepository(db).get_active_services()[:1]
+        posts = BlogRepository(db).get_published_posts(0, 1)
+        columns = HeaderColumnRepository(db).get_active_columns()[:1]
+        return {
+            "/api/v1/services/{slug}": [{"slug": service.slug} for service in services],
+            "/api/v1/blog/posts/{slug}": [{"slug": post.slug} for post in posts],
+            "/api/v1/header/columns/{slug}/combobox-items": [{"slug": column.slug} for column in columns],
+            "/api/v1/blog/feed.{feed_format}": [{"feed_format": "rss"}, {"feed_format": "atom"}],
+            "/sitemaps/{name}.xml": [],  # requested once the sitemap index is known
+        }
+
+
+def _warmup_requests(app, samples: Dict[str, List[Dict[str, str]]]) -> List[Tuple[str, str, dict]]:
+    """(route, url, query params) of every request to send, routes in registration order"""
+    from fastapi.routing import APIRoute
+
+    requests = []
+    languages = _languages()
+    query_term = next(iter(samples["/api/v1/services/{slug}"]), {"slug": "a"})["slug"].split("-")[0]
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods or not WARMUP_TAGS & set(route.tags):
+            continue
+        if route.dependant.path_params:
+            path_values = samples.get(route.path)
+            if path_values is None:
+                continue  # no sample value (uploaded file names)
+        else:
+            path_values = [{}]
+        query_names = {param.name for param in route.dependant.query_params}
+        params: Dict[str, str] = {"q": query_term} if "q" in query_names else {}
+        variants = [{**params, "lang": lang} for lang in languages] if "lang" in query_names else [params]
+        for values in path_values:
+            url = route.path.format(**values)
+            requests.extend((route.path, url, query) for query in variants)
+    return requests
+
+
+async def _get(app, path: str, params: Dict[str, str]) -> Tuple[int, bytes]:
+    """Call the ASGI app directly with one GET request; (status, body)"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": urlencode(params).encode(), "root_path": "",
+        "headers": [(b"host", b"warmup")], "client": ("127.0.0.1", 0), "server": ("warmup", 80),
+        "warmup": True,
+    }
+    status = 0
+    body = bytearray()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # never disconnects
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, bytes(body)
+
+
+async def _send_requests(app) -> List[Dict[str, object]]:
+    samples = await anyio.to_thread.run_sync(_path_samples)
+    results = []
+    requests = _warmup_requests(app, samples)
+    index = 0
+    while index < len(requests):
+        route, url, params = requests[index]
+        index += 1
+        status, body = await _get(app, url, params)
+        results.append({"url": url, "params": params, "status": status})
+        if route == "/sitemap.xml" and status == 200:
+            requests.extend(
+                ("/sitemaps/{name}.xml", f"/sitemaps/{name}.xml", {})
+                for name in SITEMAP_SHARD.findall(body.decode(errors="replace"))[:1]
+            )
+    return results
+
+
+async def _warm(app) -> None:
+    started = time.perf_counter()
+    executed = await anyio.to_thread.run_sync(precompile_statements)
+    warmup_state.steps.append({
+        "step": "precompile statements", "queries": executed,
+        "ms": round((time.perf_counter() - started) * 1000, 2),
+    })
+    started = time.perf_counter()
+    responses = await _send_requests(app)
+    warmup_state.steps.append({
+        "step": "public routes", "requests": len(responses),
+        "ms": round((time.perf_counter() - started) * 1000, 2),
+        "errors": [response for response in responses if response["status"] >= 500],
+    })
+
+
+async def run_warmup(app) -> None:
+    """Warm this worker up and mark it ready, whatever the outcome"""
+    warmup_state.status = "running"
+    warmup_state.started_at = time.perf_counter()
+    try:
+        await asyncio.wait_for(_warm(app), timeout=settings.warmup_timeout_seconds)
+    except asyncio.TimeoutError:
+        logger.warning("Warm-up did not finish within %ss", settings.warmup_timeout_seconds)
+        warmup_state.finish("timeout")
+    except Exception:
+        logger.exception("Warm-up failed")
+        warmup_state.finish("failed")
+    else:
+        warmup_state.finish("done")
+        logger.info("Warm-up finished in %.2fs", warmup_state.seconds)
+
+
+def start_warmup(app) -> None:
+    """Schedule the warm-up on the running event loop, or mark ready if disabled (run at startup)"""
+    if not settings.warmup_enabled:
+        warmup_state.finish("disabled")
+        return
+    warmup_state.task = asyncio.get_running_loop().create_task(run_warmup(app))
+
+
+def stop_warmup() -> None:
+    """Cancel a warm-up still running at shutdown"""
+    if warmup_state.task is not None and not warmup_state.task.done():
+        warmup_state.task.cancel()
+
+
+def wait_for_warmup(timeout: Optional[float] = None) -> bool:
+    """Block until the warm-up has finished; True unless the timeout passed first"""
+    return warmup_state.finished.wait(timeout)
@@ -0,0 +1,185 @@
+# Content change notifications
+#
+# Inserts, updates and deletes of public content are collected on every
+# session flush and handed to registered listeners once the transaction
+# commits. This covers both the inline admin routes and the BaseRepository
+# write paths, and rolled back changes are never announced.
+#
+# The same flush also appends the changes to the change_log table and bumps
+# the changed entities in cache_versions, inside the writing transaction, so
+# neither the /changes feed nor other workers ever see a rolled back write.
+# PostgreSQL hands out sequence numbers before commit, so writers take a
+# transaction-level advisory lock before their first change_log row: seqs then
+# commit in order and a reader that has seen seq N never misses a later commit
+# below N. SQLite already serializes write transactions.
+# Other processes replay those rows to the listeners registered with
+# on_remote_content_change (see app.core.cache_sync).
+import dataclasses
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.cache_version import CacheVersion
+from app.models.change_log import ChangeLogEntry
+
+logger = logging.getLogger(__name__)
+
+# table name -> entity name used by caches, indexes and feeds
+TRACKED_TABLES = {
+    "blog_posts": "blog_post",
+    "services": "service",
+    "header_columns": "header_column",
+    "combobox_items": "combobox_item",
+}
+
+# pg_advisory_xact_lock key serializing change_log appends ("chlg")
+CHANGE_LOG_LOCK_KEY = 0x63686C67
+
+_PENDING_KEY = "content_changes"
+_COMMITTED_KEY = "committed_content_changes"
+
+
+@dataclass(frozen=True)
+class ContentChange:
+    entity: str
+    entity_id: int
+    op: str  # "insert", "update" or "delete"
+    slug: Optional[str] = None
+    seq: Optional[int] = None  # change_log sequence number, once written
+
+
+ChangeListener = Callable[[List[ContentChange]], None]
+_listeners: List[ChangeListener] = []
+_remote_listeners: List[ChangeListener] = []
+
+
+def on_content_change(listener: ChangeListener) -> ChangeListener:
+    """Register a listener called with the changes of each committed transaction"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+    return listener
+
+
+def on_remote_content_change(listener: ChangeListener) -> ChangeListener:
+    """Register a listener called with the changes committed by other processes
+
+    Use it, together with on_content_change, for per-process state such as
+    in-memory caches; shared side effects must stay with the writing process.
+    """
+    if listener not in _remote_listeners:
+        _remote_listeners.append(listener)
+    return listener
+
+
+def remove_content_listener(listener: ChangeListener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+    if listener in _remote_listeners:
+        _remote_listeners.remove(listener)
+
+
+def _change_for(obj, op: str) -> Optional[ContentChange]:
+    entity = TRACKED_TABLES.get(getattr(obj, "__tablename__", None))
+    if entity is None:
+        return None
+    return ContentChange(entity=entity, entity_id=obj.id, op=op, slug=getattr(obj, "slug", None))
+
+
+def collect_flush_changes(session: Session) -> List[ContentChange]:
+    """Changes made by the flush in progress (call from after_flush only)"""
+    changes = []
+    for objects, op in ((session.new, "insert"), (session.dirty, "update"), (session.deleted, "delete")):
+        for obj in objects:
+            if op == "update" and not session.is_modified(obj, include_collections=False):
+                continue
+            change = _change_for(obj, op)
+            if change is not None:
+                changes.append(change)
+    return changes
+
+
+def _append_change_log(session: Session, changes: List[ContentChange]) -> List[ContentChange]:
+    """Write the changes to change_log and return them with their sequence numbers"""
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        # Held until commit; taken before cache_versions is bumped so every
+        # writer acquires the locks in the same order
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOG_LOCK_KEY})
+    now = datetime.utcnow()
+    rows = [
+        {"entity": c.entity, "entity_id": c.entity_id, "op": c.op, "slug": c.slug, "changed_at": now}
+        for c in changes
+    ]
+    table = ChangeLogEntry.__table__
+    if not connection.dialect.insert_executemany_returning_sort_by_parameter_order:
+        connection.execute(table.insert(), rows)
+        return changes
+    seqs = connection.execute(table.insert().returning(table.c.seq, sort_by_parameter_order=True), rows).scalars()
+    return [dataclasses.replace(change, seq=seq) for change, seq in zip(changes, seqs)]
+
+
+def _bump_cache_versions(session: Session, entities: Iterable[str]) -> None:
+    connection = session.connection()
+    insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    table = CacheVersion.__table__
+    now = datetime.utcnow()
+    # Sorted so concurrent writers lock the rows in the same order
+    statement = insert(table).values(
+        [{"entity": entity, "version": 1, "updated_at": now} for entity in sorted(entities)]
+    )
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.entity],
+        set_={"version": table.c.version + 1, "updated_at": statement.excluded.updated_at},
+    ))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    changes = collect_flush_changes(session)
+    if changes:
+        changes = _append_change_log(session, changes)
+        _bump_cache_versions(session, {change.entity for change in changes})
+        session.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed(session):
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes:
+        session.info.setdefault(_COMMITTED_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _dispatch_changes(session, transaction):
+    # Dispatch only once the root transaction has returned its connection to
+    # the pool, so listeners can write through the single-connection writer.
+    if transaction.parent is not None:
+        return
+    changes = session.info.pop(_COMMITTED_KEY, None)
+    if not changes:
+        return
+    for listener in list(_listeners):
+        try:
+            listener(changes)
+        except Exception:
+            # The write already committed; a failing listener must not turn it into an error
+            logger.exception("Content change listener %r failed", listener)
+
+
+def dispatch_remote_changes(changes: List[ContentChange]) -> None:
+    """Hand changes committed by another process to the remote listeners"""
+    for listener in list(_remote_listeners):
+        try:
+            listener(changes)
+        except Exception:
+            logger.exception("Remote content change listener %r failed", listener)
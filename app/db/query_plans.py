@@ -0,0 +1,141 @@
+"""
+Query plan check for repository queries
+
+Runs every repository method's query against an empty SQLite schema built
+from the models, captures the SQL it emits and fails if EXPLAIN QUERY PLAN
+shows a full table scan or a temporary B-tree for ORDER BY. The generic
+BaseRepository helpers that filter on caller-chosen columns (exists, count,
+filter_by, get_many_by_field) are covered through the methods built on them.
+
+Usage: python -m app.db.query_plans   (exit code 1 on failure)
+"""
+
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.db.session import Base
+import app.models  # noqa: F401 ensure models are registered on Base.metadata
+from app.repositories.blog_repository import BlogRepository
+from app.repositories.change_log_repository import ChangeLogRepository
+from app.repositories.header_repository import ComboboxItemRepository, HeaderColumnRepository
+from app.repositories.lead_repository import LeadRepository
+from app.repositories.service_repository import ServiceRepository
+from app.repositories.user_repository import UserRepository
+
+
+@dataclass
+class QueryCase:
+    name: str
+    run: Callable[[Session], object]
+    full_scan_ok: bool = False  # the query reads the whole table by design
+
+
+QUERY_CASES: List[QueryCase] = [
+    QueryCase("BlogRepository.get_by_id", lambda db: BlogRepository(db).get_by_id(1)),
+    QueryCase("BlogRepository.get_by_ids", lambda db: BlogRepository(db).get_by_ids([1, 2, 3])),
+    QueryCase("BlogRepository.get_by_slug", lambda db: BlogRepository(db).get_by_slug("slug")),
+    QueryCase("BlogRepository.get_published_posts", lambda db: BlogRepository(db).get_published_posts(20, 10)),
+    QueryCase("BlogRepository.count_published", lambda db: BlogRepository(db).count_published()),
+    QueryCase("BlogRepository.get_related_posts", lambda db: BlogRepository(db).get_related_posts(1, "en")),
+    QueryCase("BlogRepository.get_published_before (first)", lambda db: BlogRepository(db).get_published_before(None, 50)),
+    QueryCase(
+        "BlogRepository.get_published_before",
+        lambda db: BlogRepository(db).get_published_before((datetime(2024, 1, 1), 10), 50),
+    ),
+    QueryCase("BlogRepository.get_published_in_id_range", lambda db: BlogRepository(db).get_published_in_id_range(1, 100, 5)),
+    QueryCase("BlogRepository.max_id", lambda db: BlogRepository(db).max_id()),
+    QueryCase(
+        "BlogRepository.count_published_titles",
+        lambda db: BlogRepository(db).count_published_titles(("tr", "en", "fr")),
+    ),
+    QueryCase("BlogRepository.get_posts_by_author", lambda db: BlogRepository(db).get_posts_by_author(1)),
+    QueryCase("BlogRepository.slug_exists", lambda db: BlogRepository(db).slug_exists("slug", exclude_id=1)),
+    QueryCase("BlogRepository.get_all", lambda db: BlogRepository(db).get_all(), full_scan_ok=True),
+    QueryCase("ChangeLogRepository.get_since", lambda db: ChangeLogRepository(db).get_since(100, 50)),
+    QueryCase("ChangeLogRepository.latest_seq", lambda db: ChangeLogRepository(db).latest_seq()),
+    QueryCase("ServiceRepository.get_by_slug", lambda db: ServiceRepository(db).get_by_slug("slug")),
+    QueryCase("ServiceRepository.get_by_ids", lambda db: ServiceRepository(db).get_by_ids([1, 2, 3])),
+    QueryCase("ServiceRepository.get_active_services", lambda db: ServiceRepository(db).get_active_services()),
+    QueryCase("ServiceRepository.get_active_in_id_range", lambda db: ServiceRepository(db).get_active_in_id_range(1, 100, 5)),
+    QueryCase("ServiceRepository.max_id", lambda db: ServiceRepository(db).max_id()),
+    QueryCase(
+        "ServiceRepository.count_active_titles",
+        lambda db: ServiceRepository(db).count_active_titles(("tr", "en")),
+    ),
+    QueryCase("ServiceRepository.slug_exists", lambda db: ServiceRepository(db).slug_exists("slug", exclude_id=1)),
+    QueryCase("LeadRepository.get_by_id", lambda db: LeadRepository(db).get_by_id(1)),
+    QueryCase("LeadRepository.get_by_email", lambda db: LeadRepository(db).get_by_email("a@b.c")),
+    QueryCase("LeadRepository.get_by_phone", lambda db: LeadRepository(db).get_by_phone("+900000000000")),
+    QueryCase("LeadRepository.get_recent_leads", lambda db: LeadRepository(db).get_recent_leads(50)),
+    QueryCase("UserRepository.get_by_email", lambda db: UserRepository(db).get_by_email("a@b.c")),
+    QueryCase("UserRepository.email_exists", lambda db: UserRepository(db).email_exists("a@b.c", exclude_id=1)),
+    # Only admins have accounts, so the filter keeps nearly every row anyway
+    QueryCase("UserRepository.get_admins", lambda db: UserRepository(db).get_admins(), full_scan_ok=True),
+    QueryCase("HeaderColumnRepository.get_active_columns", lambda db: HeaderColumnRepository(db).get_active_columns()),
+    QueryCase("HeaderColumnRepository.get_active_by_slug", lambda db: HeaderColumnRepository(db).get_active_by_slug("slug")),
+    QueryCase("HeaderColumnRepository.get_by_id", lambda db: HeaderColumnRepository(db).get_by_id(1)),
+    QueryCase("ComboboxItemRepository.get_by_id", lambda db: ComboboxItemRepository(db).get_by_id(1)),
+    QueryCase("ComboboxItemRepository.get_active_items", lambda db: ComboboxItemRepository(db).get_active_items(1)),
+    QueryCase(
+        "ComboboxItemRepository.get_active_items_for_columns",
+        lambda db: ComboboxItemRepository(db).get_active_items_for_columns([1, 2]),
+    ),
+]
+
+
+def _plan_problems(plan_rows: List[Tuple], full_scan_ok: bool) -> List[str]:
+    problems = []
+    for row in plan_rows:
+        detail = row[-1]
+        if detail.startswith("SCAN ") and " USING " not in detail and not full_scan_ok:
+            problems.append(f"full scan: {detail}")
+        if "USE TEMP B-TREE" in detail:
+            problems.append(f"sort without index: {detail}")
+    return problems
+
+
+def check_query_plans(cases: List[QueryCase] = QUERY_CASES) -> List[str]:
+    """Return a description of every query plan that falls back to a scan"""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+
+    captured: List[Tuple[str, object]] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith("EXPLAIN"):
+            captured.append((statement, parameters))
+
+    failures = []
+    with Session(engine) as db:
+        for case in cases:
+            captured.clear()
+            case.run(db)
+            statements = list(captured)
+            for statement, parameters in statements:
+                plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                for problem in _plan_problems(plan, case.full_scan_ok):
+                    failures.append(f"{case.name}: {problem}\n    {' '.join(statement.split())}")
+    engine.dispose()
+    return failures
+
+
+def main() -> int:
+    failures = check_query_plans()
+    for failure in failures:
+        print(failure)
+    if failures:
+        print(f"{len(failures)} query plan problem(s)")
+        return 1
+    print(f"{len(QUERY_CASES)} repository queries use indexes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
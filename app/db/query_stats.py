@@ -0,0 +1,327 @@
+# Statement statistics and slow query log
+#
+# Cursor execute hooks on every engine time each statement and group it by
+# fingerprint: the statement with literals and bound parameters replaced by
+# "?", IN lists and multi-row VALUES collapsed and whitespace normalized, so
+# every call of one query shape shares an entry whatever its parameters.
+# Each fingerprint keeps its call count, total/mean/max execution time and the
+# routes that issued it. The time is the cursor execute only; fetching rows
+# (and hydrating them) comes after.
+#
+# A statement slower than SLOW_QUERY_THRESHOLD_MS goes into the slow query
+# log with the route and the app frames that issued it. A background thread
+# then asks the database for its plan (EXPLAIN QUERY PLAN on SQLite, EXPLAIN
+# elsewhere; neither runs the statement) and logs the entry with the plan. On
+# SQLite that runs on its own read-only connection, never the single pooled
+# writer connection of the tuned profile; elsewhere on a raw pooled connection. Parameters are only used for that EXPLAIN and are
+# never logged or kept. The last SLOW_QUERY_LOG_SIZE entries and the
+# fingerprint table are served at /admin/db/slow-queries.
+import hashlib
+import logging
+import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.profiling import ROOT, short_path
+
+logger = logging.getLogger(__name__)
+
+# ASGI scope of the request being handled (app.middleware.query_stats);
+# threadpool workers see it through the context anyio copies into them
+current_request: ContextVar[Optional[dict]] = ContextVar("current_request", default=None)
+
+db_slow_queries_total = registry.counter(
+    "db_slow_queries_total", "Statements that took longer than SLOW_QUERY_THRESHOLD_MS to execute"
+)
+
+EXPLAIN_QUEUE = 100  # slow statements waiting for their plan; more are logged without one
+EXPLAIN_TIMEOUT = 1.0  # seconds a SQLite EXPLAIN waits for a lock before giving up
+CALLER_FRAMES = 5
+ROUTES_SHOWN = 5
+EXPLAINABLE = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b")
+_PARAMETER = re.compile(r"%\(\w+\)s|%s|(?<![:\w]):[A-Za-z_]\w*|\$\d+")
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN \((?:\?, )*\?\)", re.I)
+_ROW = r"\((?:\?, )*\?\)"
+_VALUES = re.compile(rf"({_ROW})(?:, {_ROW})+")
+
+_APP = os.path.join(ROOT, "app") + os.sep
+# Frames of the hooks, sessions and middleware say nothing about the caller
+_PLUMBING = (os.path.join(_APP, "db") + os.sep, os.path.join(_APP, "middleware") + os.sep)
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> Tuple[str, str]:
+    """(id, normalized text) of a statement"""
+    normalized = _COMMENT.sub(" ", statement)
+    normalized = _STRING.sub("?", normalized)
+    normalized = _PARAMETER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    normalized = _VALUES.sub(r"\1, ...", normalized)
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12], normalized
+
+
+def _callers(frame) -> List[str]:
+    """The innermost app frames outside the database plumbing, innermost first"""
+    callers = []
+    while frame is not None and len(callers) < CALLER_FRAMES:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP) and not filename.startswith(_PLUMBING):
+            callers.append(f"{short_path(filename)}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return callers
+
+
+def _request() -> Tuple[Optional[str], Optional[str]]:
+    """(method, route template) of the request issuing the statement"""
+    scope = current_request.get()
+    if scope is None:
+        return None, None
+    return scope.get("method"), getattr(scope.get("route"), "path", None)
+
+
+def _format_plan(dialect: str, rows: List[tuple]) -> List[str]:
+    if dialect != "sqlite":
+        return [str(row[0]) for row in rows]
+    # (id, parent, notused, detail): indent each step under its parent
+    depths: Dict[int, int] = {}
+    lines = []
+    for row in rows:
+        depths[row[0]] = depths.get(row[1], -1) + 1
+        lines.append("  " * depths[row[0]] + str(row[-1]))
+    return lines
+
+
+class FingerprintStats:
+    """Execution times of the statements sharing one fingerprint"""
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow = 0
+        self.last_seen = 0.0
+        self.routes: Counter = Counter()
+
+    def add(self, elapsed: float, route: Optional[str], slow: bool) -> None:
+        self.calls += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.slow += slow
+        self.last_seen = time.time()
+        self.routes[route] += 1
+
+    def as_dict(self, fingerprint_id: str) -> dict:
+        return {
+            "fingerprint": fingerprint_id,
+            "statement": self.statement,
+            "calls": self.calls,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.calls * 1000, 3) if self.calls else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+            "slow": self.slow,
+            "last_seen": datetime.utcfromtimestamp(self.last_seen).isoformat(timespec="seconds") + "Z",
+            "routes": [{"route": route, "calls": calls} for route, calls in self.routes.most_common(ROUTES_SHOWN)],
+        }
+
+
+class QueryStats:
+    """Per-fingerprint statement stats and the slow query log"""
+
+    SORT_KEYS = {
+        "total": lambda stats: stats.total,
+        "mean": lambda stats: stats.total / stats.calls,
+        "max": lambda stats: stats.max,
+        "calls": lambda stats: stats.calls,
+        "slow": lambda stats: stats.slow,
+    }
+
+    def __init__(self):
+        self.fingerprints: Dict[str, FingerprintStats] = {}
+        self.slow: Deque[dict] = deque()
+        self.untracked = 0  # calls of fingerprints past QUERY_STATS_MAX_FINGERPRINTS
+        # Read from the settings once by install_query_stats; the hooks run for every statement
+        self.threshold = float("inf")
+        self.max_fingerprints = 0
+        self._lock = threading.Lock()
+        self._explain_queue: "queue.Queue[Tuple[Engine, str, object, dict]]" = queue.Queue(EXPLAIN_QUEUE)
+        self._explainer: Optional[threading.Thread] = None
+
+    def record(self, engine: Engine, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+        fingerprint_id, normalized = fingerprint(statement)
+        method, route = _request()
+        slow = elapsed >= self.threshold
+        with self._lock:
+            stats = self.fingerprints.get(fingerprint_id)
+            if stats is None and len(self.fingerprints) < self.max_fingerprints:
+                stats = self.fingerprints[fingerprint_id] = FingerprintStats(normalized)
+            if stats is not None:
+                stats.add(elapsed, route, slow)
+            else:
+                self.untracked += 1
+        if slow:
+            self._log_slow(engine, statement, parameters, executemany, elapsed, fingerprint_id, method, route)
+
+    def _log_slow(self, engine, statement, parameters, executemany, elapsed, fingerprint_id, method, route) -> None:
+        db_slow_queries_total.inc()
+        entry = {
+            "at": datetime.utcnow().isoformat(timespec="milliseconds") + "Z",
+            "ms": round(elapsed * 1000, 3),
+            "fingerprint": fingerprint_id,
+            "statement": _WHITESPACE.sub(" ", statement).strip(),
+            "method": method,
+            "route": route,
+            "callers": _callers(sys._getframe(1)),
+            "plan": None,
+        }
+        with self._lock:
+            self.slow.append(entry)
+            while len(self.slow) > settings.slow_query_log_size:
+                self.slow.popleft()
+        if settings.slow_query_explain and statement.lstrip().split(None, 1)[0].upper() in EXPLAINABLE:
+            if executemany:
+                parameters = parameters[0] if parameters else ()
+            try:
+                self._explain_queue.put_nowait((engine, statement, parameters, entry))
+                self._start_explainer()
+                return
+            except queue.Full:
+                pass
+        self._log(entry)
+
+    def _start_explainer(self) -> None:
+        if self._explainer is None:
+            with self._lock:
+                if self._explainer is None:
+                    self._explainer = threading.Thread(target=self._explain_forever, name="slow-query-explain", daemon=True)
+                    self._explainer.start()
+
+    def _explain_forever(self) -> None:
+        while True:
+            engine, statement, parameters, entry = self._explain_queue.get()
+            try:
+                entry["plan"] = self.explain(engine, statement, parameters)
+            except Exception as exc:
+                entry["plan_error"] = f"{type(exc).__name__}: {exc}"
+            self._log(entry)
+
+    @staticmethod
+    def _explain_connection(engine: Engine):
+        """A DBAPI connection outside the engine's hooks and, for a SQLite file, outside its pool
+
+        The tuned SQLite write engine has a single connection; borrowing it
+        would hold up writers behind every EXPLAIN, so SQLite files get their
+        own short-lived read-only connection. In-memory databases are only
+        reachable through the pool; other databases' pools roll the raw
+        connection back on return.
+        """
+        database = engine.url.database
+        if engine.dialect.name == "sqlite" and database and database != ":memory:" and "mode=memory" not in database:
+            path = database[len("file:"):].split("?")[0] if database.startswith("file:") else database
+            return sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=EXPLAIN_TIMEOUT)
+        return engine.raw_connection()
+
+    @classmethod
+    def explain(cls, engine: Engine, statement: str, parameters) -> List[str]:
+        """The database's plan for a statement, without running it"""
+        dialect = engine.dialect.name
+        prefix = "EXPLAIN QUERY PLAN" if dialect == "sqlite" else "EXPLAIN"
+        connection = cls._explain_connection(engine)
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f"{prefix} {statement}", parameters)
+                return _format_plan(dialect, cursor.fetchall())
+            finally:
+                cursor.close()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _log(entry: dict) -> None:
+        plan = entry["plan"] or [entry.get("plan_error", "(no plan steps)")]
+        logger.warning(
+            "Slow query %.1f ms [%s] %s %s\n  %s\n  from: %s\n  plan:\n    %s",
+            entry["ms"], entry["fingerprint"], entry["method"] or "-", entry["route"] or "(no request)",
+            entry["statement"], " <- ".join(entry["callers"]) or "?", "\n    ".join(plan),
+        )
+
+    def report(self, sort: str = "total", limit: int = 20, fingerprint_id: Optional[str] = None) -> dict:
+        with self._lock:
+            fingerprints = list(self.fingerprints.items())
+            slow = list(self.slow)
+            untracked = self.untracked
+        tracked = len(fingerprints)
+        if fingerprint_id is not None:
+            fingerprints = [(key, stats) for key, stats in fingerprints if key == fingerprint_id]
+            slow = [entry for entry in slow if entry["fingerprint"] == fingerprint_id]
+        key = self.SORT_KEYS[sort]
+        fingerprints.sort(key=lambda item: key(item[1]), reverse=True)
+        return {
+            "threshold_ms": settings.slow_query_threshold_ms,
+            "fingerprints_tracked": tracked,
+            "untracked_calls": untracked,
+            "fingerprints": [stats.as_dict(key) for key, stats in fingerprints[:limit]],
+            "slow": list(reversed(slow))[:limit],
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.fingerprints.clear()
+            self.slow.clear()
+            self.untracked = 0
+
+
+query_stats = QueryStats()
+
+
+# The start time lives on the execution context, which is discarded with it
+# when the statement fails and after_cursor_execute never comes
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_stats_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_stats_start", None)
+    if started is not None:
+        query_stats.record(conn.engine, statement, parameters, executemany, time.perf_counter() - started)
+
+
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+
+def install_query_stats() -> None:
+    """Listen to statement execution on every engine when QUERY_STATS_ENABLED (run at startup)"""
+    global _hooks_installed
+    if not settings.query_stats_enabled:
+        return
+    with _hooks_lock:
+        if not _hooks_installed:
+            query_stats.threshold = settings.slow_query_threshold_ms / 1000
+            query_stats.max_fingerprints = settings.query_stats_max_fingerprints
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            _hooks_installed = True
@@ -0,0 +1,101 @@
+"""
+Local read-replica harness for SQLite
+
+Copies the primary database file into the replica file with the SQLite online
+backup API, either once or on an interval that simulates replication lag.
+
+Usage: python -m app.db.replica [--interval 1.0] [--once]
+(reads DATABASE_URL and READ_DATABASE_URL from the environment / .env)
+"""
+
+import argparse
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy.engine import make_url
+
+
+def sqlite_path(database_url: str) -> str:
+    """Return the file path of a file-backed SQLite URL"""
+    url = make_url(database_url)
+    if not url.drivername.startswith("sqlite") or not url.database or url.database == ":memory:":
+        raise ValueError(f"Not a file-backed SQLite URL: {database_url}")
+    return url.database
+
+
+def sync_sqlite_replica(primary_url: str, replica_url: str) -> None:
+    """Copy the current committed state of the primary into the replica"""
+    source = sqlite3.connect(sqlite_path(primary_url))
+    target = sqlite3.connect(sqlite_path(replica_url))
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+
+class SQLiteReplicaSync:
+    """Background thread that keeps a replica file in sync with its primary"""
+
+    def __init__(self, primary_url: str, replica_url: str, interval: float = 1.0):
+        self.primary_url = primary_url
+        self.replica_url = replica_url
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sync(self) -> None:
+        sync_sqlite_replica(self.primary_url, self.replica_url)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sync()
+
+    def start(self) -> "SQLiteReplicaSync":
+        self.sync()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sqlite-replica-sync", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "SQLiteReplicaSync":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main():
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Keep a SQLite read replica in sync with the primary")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between syncs (simulated lag)")
+    parser.add_argument("--once", action="store_true", help="sync a single time and exit")
+    args = parser.parse_args()
+
+    if not settings.read_database_url:
+        parser.error("READ_DATABASE_URL is not set")
+
+    if args.once:
+        sync_sqlite_replica(settings.database_url, settings.read_database_url)
+        return
+
+    print(f"Syncing {settings.database_url} -> {settings.read_database_url} every {args.interval}s")
+    with SQLiteReplicaSync(settings.database_url, settings.read_database_url, args.interval):
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
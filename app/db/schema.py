@@ -0,0 +1,78 @@
+# Startup schema check
+#
+# create_all inspects every table before creating the missing ones, which is
+# a round trip per table on every worker start. Instead, a hash of the model
+# metadata (tables, column types, keys and indexes, as compiled for the
+# database's dialect) is stored after create_all runs; later starts compare
+# it in a single query and only run create_all when the models changed.
+import hashlib
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import MetaData, delete, exc, insert, select
+from sqlalchemy.engine import Dialect, Engine
+
+from app.core.config import settings
+from app.db import session
+from app.db.session import Base
+from app.models.schema_fingerprint import SchemaFingerprint
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_NAME = "models"
+
+
+def schema_fingerprint(metadata: MetaData, dialect: Dialect) -> str:
+    """sha256 of everything create_all would create for these tables"""
+    digest = hashlib.sha256()
+    for table in metadata.sorted_tables:
+        digest.update(f"table {table.name}\n".encode())
+        for column in table.columns:
+            digest.update(
+                f"  column {column.name} {column.type.compile(dialect=dialect)} "
+                f"nullable={column.nullable} pk={column.primary_key}\n".encode()
+            )
+        for constraint in sorted(table.constraints, key=lambda c: (type(c).__name__, str(c.name))):
+            columns = ",".join(column.name for column in constraint.columns)
+            targets = ",".join(sorted(key.target_fullname for key in getattr(constraint, "elements", ())))
+            digest.update(f"  {type(constraint).__name__} {constraint.name} ({columns}) {targets}\n".encode())
+        for index in sorted(table.indexes, key=lambda i: str(i.name)):
+            columns = ",".join(str(expression) for expression in index.expressions)
+            digest.update(f"  index {index.name} ({columns}) unique={index.unique}\n".encode())
+    return digest.hexdigest()
+
+
+def _stored_fingerprint(engine: Engine) -> Optional[str]:
+    table = SchemaFingerprint.__table__
+    try:
+        with engine.connect() as connection:
+            return connection.execute(
+                select(table.c.fingerprint).where(table.c.name == FINGERPRINT_NAME)
+            ).scalar()
+    except exc.DBAPIError:
+        return None  # first start: the table itself does not exist yet
+
+
+def ensure_schema(engine: Optional[Engine] = None, mode: Optional[str] = None) -> str:
+    """Create missing tables as SCHEMA_CHECK says; returns "current", "created" or "skipped" """
+    mode = mode or settings.schema_check
+    if mode == "none":
+        return "skipped"
+    engine = engine or session.write_engine
+    fingerprint = schema_fingerprint(Base.metadata, engine.dialect)
+    if mode == "fingerprint" and _stored_fingerprint(engine) == fingerprint:
+        return "current"
+
+    Base.metadata.create_all(bind=engine)
+    table = SchemaFingerprint.__table__
+    try:
+        with engine.begin() as connection:
+            connection.execute(delete(table).where(table.c.name == FINGERPRINT_NAME))
+            connection.execute(
+                insert(table).values(name=FINGERPRINT_NAME, fingerprint=fingerprint, updated_at=datetime.utcnow())
+            )
+    except exc.IntegrityError:
+        pass  # another worker stored it at the same time
+    logger.info("Schema created or updated (fingerprint %s)", fingerprint[:12])
+    return "created"
@@ -0,0 +1,340 @@
+"""
+Bulk, deterministic dataset seeding
+
+Loads the curated sample content (app.db.fixtures) and, for a scale factor
+above zero, synthetic multilingual rows: per unit of scale 1000 blog posts,
+1000 leads, 100 combobox items and 10 services. Synthetic rows come from a
+seeded random generator, so the same (scale, seed) always yields the same
+data, and are written in batches of 5000 rows inside one transaction
+(executemany on SQLite, multi-row VALUES on PostgreSQL).
+
+A checksum of the fixtures, scale, seed and generator version is stored in
+dataset_seeds. A repeat run with the same inputs stops after one primary key
+lookup; a different checksum replaces the synthetic rows ("seed-" slugs and
+"seed" leads) and adds missing fixtures, leaving edited content alone.
+
+Usage: python -m app.db.seed [--scale 10] [--seed 42] [--force] [--skip-index]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from app.core.security import get_password_hash
+from app.db import fixtures
+from app.db import session
+from app.db.session import Base
+from app.models.blog import BlogPost
+from app.models.dataset_seed import DatasetSeed
+from app.models.header import ComboboxItem, HeaderColumn
+from app.models.lead import Lead
+from app.models.service import Service
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+GENERATOR_VERSION = 1  # bump when the generated rows change
+DATASET_NAME = "sample"
+ROWS_PER_SCALE = {"blog_posts": 1000, "leads": 1000, "combobox_items": 100, "services": 10}
+BATCH_SIZE = 5000
+SYNTHETIC_PREFIX = "seed-"
+SYNTHETIC_LEAD_SOURCE = "seed"
+# Synthetic posts are published backwards from here, one hour apart
+PUBLISHED_EPOCH = datetime(2025, 1, 1)
+
+VOCABULARY = {
+    "en": (
+        "hair transplant clinic istanbul dental implant veneers rhinoplasty recovery consultation treatment "
+        "graft follicle surgeon result price guide aftercare patient doctor natural density hairline smile "
+        "procedure anaesthesia technique experience quality affordable modern safe painless healing"
+    ).split(),
+    "tr": (
+        "saç ekimi klinik istanbul diş implant kaplama burun estetiği iyileşme muayene tedavi greft kök "
+        "cerrah sonuç fiyat rehber bakım hasta doktor doğal yoğunluk saç çizgisi gülüş işlem anestezi "
+        "teknik deneyim kalite uygun modern güvenli ağrısız"
+    ).split(),
+    "fr": (
+        "greffe cheveux clinique istanbul implant dentaire facettes rhinoplastie convalescence consultation "
+        "traitement greffon follicule chirurgien résultat prix guide soins patient médecin naturel densité "
+        "sourire intervention anesthésie technique expérience qualité abordable moderne"
+    ).split(),
+}
+PARAGRAPH_POOL = 64
+CONTENT_PARAGRAPHS = 4
+FIRST_NAMES = ("Ahmet", "Ayşe", "John", "Emma", "Lucas", "Chloé", "Mehmet", "Zeynep", "Oliver", "Léa")
+LAST_NAMES = ("Yılmaz", "Kaya", "Smith", "Brown", "Martin", "Dubois", "Demir", "Şahin", "Taylor", "Bernard")
+
+
+@dataclass(frozen=True)
+class SeedPlan:
+    scale: float = 0.0
+    seed: int = 42
+
+    def rows(self, table: str) -> int:
+        return int(ROWS_PER_SCALE[table] * self.scale)
+
+    def checksum(self) -> str:
+        """Hash of everything that determines the seeded rows"""
+        payload = {
+            "generator": GENERATOR_VERSION,
+            "scale": self.scale,
+            "seed": self.seed,
+            "admin": fixtures.ADMIN_EMAIL,
+            "header_columns": fixtures.HEADER_COLUMNS,
+            "combobox_items": fixtures.COMBOBOX_ITEMS,
+            "blog_posts": fixtures.BLOG_POSTS,
+            "services": fixtures.SERVICES,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+@dataclass
+class SeedResult:
+    skipped: bool
+    checksum: str
+    rows: Dict[str, int]
+    seconds: float
+
+
+class _TextGenerator:
+    """Multilingual text assembled from seeded per-language paragraph pools"""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.paragraphs = {
+            lang: [self._paragraph(words) for _ in range(PARAGRAPH_POOL)] for lang, words in VOCABULARY.items()
+        }
+
+    def _paragraph(self, words: List[str]) -> str:
+        sentences = []
+        for _ in range(self.rng.randint(4, 7)):
+            sentence = " ".join(self.rng.choices(words, k=self.rng.randint(8, 16)))
+            sentences.append(sentence[0].upper() + sentence[1:] + ".")
+        return " ".join(sentences)
+
+    def words(self, lang: str, count: int) -> str:
+        return " ".join(self.rng.choices(VOCABULARY[lang], k=count))
+
+    def title(self, lang: str) -> str:
+        return self.words(lang, self.rng.randint(3, 7)).title()
+
+    def content(self, lang: str) -> str:
+        return "\n\n".join(self.rng.choices(self.paragraphs[lang], k=CONTENT_PARAGRAPHS))
+
+
+def _rng(plan: SeedPlan, table: str) -> random.Random:
+    # One generator per table keeps each table's rows stable when another's count changes
+    return random.Random(f"{plan.seed}:{table}")
+
+
+def _insert(connection: Connection, table, rows: Iterable[dict], ignore_conflicts: bool = False) -> int:
+    """Insert rows in BATCH_SIZE executemany batches and return how many were sent"""
+    if ignore_conflicts:
+        dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+        statement = dialect_insert(table).on_conflict_do_nothing()
+    else:
+        statement = table.insert()
+    sent = 0
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            connection.execute(statement, batch)
+            sent += len(batch)
+            batch = []
+    if batch:
+        connection.execute(statement, batch)
+        sent += len(batch)
+    return sent
+
+
+def _synthetic_services(plan: SeedPlan) -> Iterator[dict]:
+    rng = _rng(plan, "services")
+    text = _TextGenerator(rng)
+    for n in range(plan.rows("services")):
+        yield {
+            "slug": f"{SYNTHETIC_PREFIX}service-{n}",
+            "is_active": rng.random() > 0.1,
+            "title_tr": text.title("tr"), "title_en": text.title("en"),
+            "description_tr": text.words("tr", 30), "description_en": text.words("en", 30),
+            "content_tr": text.content("tr"), "content_en": text.content("en"),
+            "price": float(rng.randrange(500, 6000, 50)),
+            "duration": f"{rng.randint(1, 8)}-{rng.randint(9, 12)} saat",
+            "featured_image_url": f"https://example.com/images/{SYNTHETIC_PREFIX}service-{n}.jpg",
+            "gallery_urls": [f"https://example.com/images/{SYNTHETIC_PREFIX}service-{n}-{i}.jpg" for i in range(3)],
+        }
+
+
+def _synthetic_posts(plan: SeedPlan, author_id: int) -> Iterator[dict]:
+    rng = _rng(plan, "blog_posts")
+    text = _TextGenerator(rng)
+    for n in range(plan.rows("blog_posts")):
+        has_french = rng.random() < 0.4
+        yield {
+            "slug": f"{SYNTHETIC_PREFIX}post-{n}",
+            "author_id": author_id,
+            # One in twenty stays a draft
+            "published_date": PUBLISHED_EPOCH - timedelta(hours=n) if rng.random() > 0.05 else None,
+            "title_tr": text.title("tr"), "title_en": text.title("en"),
+            "title_fr": text.title("fr") if has_french else None,
+            "description_tr": text.words("tr", 25), "description_en": text.words("en", 25),
+            "description_fr": text.words("fr", 25) if has_french else None,
+            "content_tr": text.content("tr"), "content_en": text.content("en"),
+            "content_fr": text.content("fr") if has_french else None,
+            "featured_image_url": f"https://example.com/images/{SYNTHETIC_PREFIX}post-{n}.jpg",
+            "gallery_urls": [
+                f"https://example.com/images/{SYNTHETIC_PREFIX}post-{n}-{i}.jpg" for i in range(rng.randint(0, 5))
+            ],
+        }
+
+
+def _synthetic_items(plan: SeedPlan, column_ids: List[int]) -> Iterator[dict]:
+    rng = _rng(plan, "combobox_items")
+    text = _TextGenerator(rng)
+    for n in range(plan.rows("combobox_items")):
+        yield {
+            "header_column_id": column_ids[n % len(column_ids)],
+            "name_tr": text.title("tr"), "name_en": text.title("en"),
+            "slug": f"{SYNTHETIC_PREFIX}item-{n}",
+            "url": f"/{SYNTHETIC_PREFIX}item-{n}",
+            "is_active": True,
+            "order": 100 + n,
+        }
+
+
+def _synthetic_leads(plan: SeedPlan) -> Iterator[dict]:
+    rng = _rng(plan, "leads")
+    for n in range(plan.rows("leads")):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {
+            "full_name": f"{first} {last}",
+            "phone_number": f"+90 5{rng.randint(30, 59)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+            "email": f"lead{n}@example.com" if rng.random() > 0.2 else None,
+            "source_form": SYNTHETIC_LEAD_SOURCE,
+            "created_at": PUBLISHED_EPOCH - timedelta(minutes=n * 7),
+        }
+
+
+def _remove_synthetic_rows(connection: Connection) -> None:
+    for model in (BlogPost, Service, ComboboxItem):
+        table = model.__table__
+        connection.execute(delete(table).where(table.c.slug.startswith(SYNTHETIC_PREFIX)))
+    connection.execute(delete(Lead.__table__).where(Lead.__table__.c.source_form == SYNTHETIC_LEAD_SOURCE))
+
+
+def _load(connection: Connection, plan: SeedPlan) -> Dict[str, int]:
+    rows: Dict[str, int] = {}
+    now = datetime.utcnow()
+
+    users = User.__table__
+    _insert(connection, users, [{
+        "email": fixtures.ADMIN_EMAIL, "password_hash": get_password_hash(fixtures.ADMIN_PASSWORD), "is_admin": True,
+    }], ignore_conflicts=True)
+    admin_id = connection.execute(select(users.c.id).where(users.c.email == fixtures.ADMIN_EMAIL)).scalar_one()
+
+    columns = HeaderColumn.__table__
+    rows["header_columns"] = _insert(connection, columns, fixtures.HEADER_COLUMNS, ignore_conflicts=True)
+    column_ids = dict(connection.execute(select(columns.c.slug, columns.c.id)).all())
+
+    # Combobox slugs are only unique per column, so existing fixtures are filtered here
+    items = ComboboxItem.__table__
+    existing_items = set(connection.execute(select(items.c.header_column_id, items.c.slug)).all())
+    fixture_items = []
+    for item in fixtures.COMBOBOX_ITEMS:
+        row = {key: value for key, value in item.items() if key != "column"}
+        row["header_column_id"] = column_ids[item["column"]]
+        if (row["header_column_id"], row["slug"]) not in existing_items:
+            fixture_items.append(row)
+    dropdown_ids = sorted(column_ids[item["column"]] for item in fixtures.COMBOBOX_ITEMS)
+    rows["combobox_items"] = _insert(connection, items, fixture_items) + _insert(
+        connection, items, _synthetic_items(plan, sorted(set(dropdown_ids)))
+    )
+
+    rows["services"] = _insert(connection, Service.__table__, fixtures.SERVICES, ignore_conflicts=True) + _insert(
+        connection, Service.__table__, _synthetic_services(plan)
+    )
+    fixture_posts = [{**post, "author_id": admin_id, "published_date": now} for post in fixtures.BLOG_POSTS]
+    rows["blog_posts"] = _insert(connection, BlogPost.__table__, fixture_posts, ignore_conflicts=True) + _insert(
+        connection, BlogPost.__table__, _synthetic_posts(plan, admin_id)
+    )
+    rows["leads"] = _insert(connection, Lead.__table__, _synthetic_leads(plan))
+    return rows
+
+
+def _rebuild_derived_data() -> None:
+    # Bulk inserts bypass the ORM change hooks, so derived tables are rebuilt once
+    from app.search.index import rebuild_search_index
+    from app.search.related import rebuild_related_posts
+
+    rebuild_search_index()
+    rebuild_related_posts()
+
+
+def _stored_checksum(connection: Connection) -> Optional[str]:
+    seeds = DatasetSeed.__table__
+    return connection.execute(select(seeds.c.checksum).where(seeds.c.name == DATASET_NAME)).scalar()
+
+
+def seed_database(
+    plan: SeedPlan, engine: Optional[Engine] = None, force: bool = False, rebuild_indexes: bool = True
+) -> SeedResult:
+    """Load the dataset described by plan unless it is already loaded"""
+    engine = engine or session.write_engine
+    started = time.perf_counter()
+    checksum = plan.checksum()
+    if not force:
+        # Checked before create_all, so a loaded dataset costs no schema reflection
+        try:
+            with engine.connect() as connection:
+                stored = _stored_checksum(connection)
+        except (OperationalError, ProgrammingError):
+            stored = None  # no dataset_seeds table yet
+        if stored == checksum:
+            return SeedResult(True, checksum, {}, time.perf_counter() - started)
+    Base.metadata.create_all(bind=engine)
+
+    seeds = DatasetSeed.__table__
+    with engine.begin() as connection:
+        if _stored_checksum(connection) == checksum and not force:
+            return SeedResult(True, checksum, {}, time.perf_counter() - started)  # loaded by a concurrent run
+        _remove_synthetic_rows(connection)
+        rows = _load(connection, plan)
+        connection.execute(delete(seeds).where(seeds.c.name == DATASET_NAME))
+        connection.execute(seeds.insert(), [{
+            "name": DATASET_NAME, "checksum": checksum, "rows": sum(rows.values()), "seeded_at": datetime.utcnow(),
+        }])
+    if rebuild_indexes:
+        _rebuild_derived_data()
+    seconds = time.perf_counter() - started
+    logger.info("Seeded %s rows in %.1fs (checksum %s)", sum(rows.values()), seconds, checksum[:12])
+    return SeedResult(False, checksum, rows, seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the sample dataset in bulk")
+    parser.add_argument("--scale", type=float, default=0.0, help="synthetic rows: 1000 posts and leads per unit")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--force", action="store_true", help="seed even if the checksum matches")
+    parser.add_argument("--skip-index", action="store_true", help="do not rebuild search and related posts")
+    args = parser.parse_args()
+    result = seed_database(SeedPlan(args.scale, args.seed), force=args.force, rebuild_indexes=not args.skip_index)
+    if result.skipped:
+        print(f"Dataset {result.checksum[:12]} already loaded, nothing to do")
+        return
+    counts = ", ".join(f"{count} {table}" for table, count in result.rows.items())
+    print(f"Seeded {counts} in {result.seconds:.1f}s (checksum {result.checksum[:12]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,263 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import threading
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 from app.core.config import settings
+from app.core.metrics import instrument_engine
 
 
 class Base(DeclarativeBase):
     pass
 
 
-is_sqlite = settings.database_url.startswith("sqlite")
-connect_args = {"check_same_thread": False} if is_sqlite else {}
-engine = create_engine(settings.database_url, pool_pre_ping=True, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+READ_YOUR_WRITES_COOKIE = "icare_primary_until"
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def _install_idle_pre_ping(engine: Engine, idle_seconds: int) -> None:
+    """Ping only connections that sat idle in the pool for too long"""
+
+    @event.listens_for(engine, "checkin")
+    def _stamp_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception:
+            # The pool discards this connection and retries with a fresh one
+            raise exc.DisconnectionError()
+        finally:
+            cursor.close()
+
+
+def _install_sqlite_tuning(engine: Engine, serialize_writes: bool) -> None:
+    """Apply the tuned SQLite PRAGMAs on every new DBAPI connection"""
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        if serialize_writes:
+            # Let SQLAlchemy emit BEGIN itself (see the "begin" hook below)
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kib)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    if serialize_writes:
+        @event.listens_for(engine, "begin")
+        def _begin_immediate(connection):
+            # Take the write lock up front instead of failing on lock upgrade
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_db_engine(
+    database_url: str,
+    sqlite_profile: Optional[str] = None,
+    pre_ping: Optional[str] = None,
+    serialize_writes: bool = False,
+) -> Engine:
+    """Create an engine using the pool and SQLite settings"""
+    sqlite_profile = sqlite_profile or settings.sqlite_profile
+    pre_ping = pre_ping or settings.db_pool_pre_ping
+    is_sqlite_url = database_url.startswith("sqlite")
+
+    kwargs = {"pool_pre_ping": pre_ping == "always"}
+    if is_sqlite_url:
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if not (is_sqlite_url and _is_memory_sqlite(database_url)):
+        kwargs.update(
+            pool_size=1 if serialize_writes else settings.db_pool_size,
+            max_overflow=0 if serialize_writes else settings.db_max_overflow,
+            pool_recycle=settings.db_pool_recycle,
+            pool_timeout=settings.db_pool_timeout,
+        )
+
+    db_engine = create_engine(database_url, **kwargs)
+    if pre_ping == "idle":
+        _install_idle_pre_ping(db_engine, settings.db_pre_ping_idle_seconds)
+    if is_sqlite_url and sqlite_profile == "tuned":
+        _install_sqlite_tuning(db_engine, serialize_writes)
+    return db_engine
+
+
+# Engines and session factories are created on first use rather than at
+# import, so importing models and routes neither reads the settings nor builds
+# connection pools. ``from app.db.session import engine`` (or any name in
+# _ENGINE_NAMES) goes through the module __getattr__ below and builds them.
+_ENGINE_NAMES = (
+    "is_sqlite", "engine", "SessionLocal", "write_engine", "WriteSessionLocal", "read_engine", "ReadSessionLocal",
+)
+is_sqlite: bool
+engine: Engine
+SessionLocal: sessionmaker
+write_engine: Engine
+WriteSessionLocal: sessionmaker
+read_engine: Engine
+ReadSessionLocal: sessionmaker
+_engine_lock = threading.Lock()
+
+
+def init_engines() -> None:
+    """Create the engines and session factories once"""
+    if "engine" in globals():
+        return
+    with _engine_lock:
+        if "engine" in globals():
+            return
+        is_sqlite = settings.database_url.startswith("sqlite")
+        engine = create_db_engine(settings.database_url)
+        instrument_engine(engine)
+
+        # The tuned SQLite profile funnels writes through a single connection so
+        # writers queue in the pool instead of racing for the database lock.
+        if is_sqlite and settings.sqlite_profile == "tuned" and not _is_memory_sqlite(settings.database_url):
+            write_engine = create_db_engine(settings.database_url, serialize_writes=True)
+            instrument_engine(write_engine, "write")
+        else:
+            write_engine = engine
+
+        # Public reads may be served by a replica; everything else uses the primary
+        if settings.read_database_url:
+            read_engine = create_db_engine(settings.read_database_url)
+            instrument_engine(read_engine, "read")
+        else:
+            read_engine = engine
+
+        globals().update(
+            is_sqlite=is_sqlite,
+            SessionLocal=sessionmaker(autocommit=False, autoflush=False, bind=engine),
+            write_engine=write_engine,
+            WriteSessionLocal=sessionmaker(autocommit=False, autoflush=False, bind=write_engine),
+            read_engine=read_engine,
+            ReadSessionLocal=sessionmaker(autocommit=False, autoflush=False, bind=read_engine),
+        )
+        globals()["engine"] = engine  # last: its presence marks the set as complete
+
+
+def __getattr__(name: str):
+    if name in _ENGINE_NAMES:
+        init_engines()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazySession:
+    """Session proxy that only opens a session (and connection) on first use
+
+    ``release()`` closes the underlying session early, returning its
+    connection to the pool. Objects it already loaded stay readable as
+    detached instances, so serialization can happen without holding a
+    connection.
+    """
+
+    def __init__(self, session_factory: sessionmaker):
+        self._session_factory = session_factory
+        self._session: Optional[Session] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._session is not None
+
+    def _get_session(self) -> Session:
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self._get_session(), name)
+
+    def release(self) -> None:
+        """Close the underlying session if one was opened"""
+        if self._session is not None:
+            session, self._session = self._session, None
+            session.close()
+
+    close = release
+
+
+# Sessions opened during the current request, registered so routes can release
+# them as soon as the endpoint returns (see app.api.routing.EarlyReleaseRoute)
+request_sessions: ContextVar[Optional[List[LazySession]]] = ContextVar("request_sessions", default=None)
+
+
+def _open_request_session(session_factory: sessionmaker) -> LazySession:
+    db = LazySession(session_factory)
+    tracked = request_sessions.get()
+    if tracked is not None:
+        tracked.append(db)
+    return db
+
+
+def release_request_sessions() -> None:
+    """Release every session opened by the current request"""
+    tracked = request_sessions.get()
+    if tracked:
+        for db in tracked:
+            db.release()
+
+
+def get_db(request: Request, response: Response):
+    init_engines()
+    if request.method in READ_METHODS:
+        session_factory = SessionLocal
+    else:
+        session_factory = WriteSessionLocal
+        if read_engine is not engine:
+            # Pin this client to the primary until the replica has caught up
+            window = settings.read_your_writes_seconds
+            response.set_cookie(
+                READ_YOUR_WRITES_COOKIE, str(time.time() + window), max_age=window, httponly=True, samesite="lax"
+            )
+    db = _open_request_session(session_factory)
+    try:
+        yield db
+    finally:
+        db.release()
+
+
+def _recently_wrote(request: Request) -> bool:
+    # Bearer-token clients (admin tools, API integrations) carry no cookie, so
+    # their reads always go to the primary
+    if "authorization" in request.headers:
+        return True
+    value = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if not value:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
 
+def get_read_db(request: Request):
+    """Session for read-only requests, served by the replica when configured
 
-def get_db():
-    db = SessionLocal()
+    Requests with an Authorization header, or the read-your-writes cookie of
+    a recent write, read from the primary instead.
+    """
+    init_engines()
+    session_factory = SessionLocal if _recently_wrote(request) else ReadSessionLocal
+    db = _open_request_session(session_factory)
     try:
         yield db
     finally:
-        db.close()
+        db.release()
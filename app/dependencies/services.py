@@ -1,8 +1,10 @@
 from sqlalchemy.orm import Session
 from fastapi import Depends
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.services.blog_service import BlogService
 from app.services.user_service import UserService, ServiceService, LeadService
+from app.services.search_service import SearchService
+from app.services.bootstrap_service import BootstrapService
 
 
 def get_blog_service(db: Session = Depends(get_db)) -> BlogService:
@@ -23,3 +25,27 @@ def get_service_service(db: Session = Depends(get_db)) -> ServiceService:
 def get_lead_service(db: Session = Depends(get_db)) -> LeadService:
     """Get LeadService instance"""
     return LeadService(db)
+
+
+def get_read_blog_service(db: Session = Depends(get_read_db)) -> BlogService:
+    """Get BlogService instance for read-only use"""
+    return BlogService(db)
+
+
+def get_read_service_service(db: Session = Depends(get_read_db)) -> ServiceService:
+    """Get ServiceService instance for read-only use"""
+    return ServiceService(db)
+
+
+def get_search_service(db: Session = Depends(get_read_db)) -> SearchService:
+    """Get SearchService instance"""
+    return SearchService(db)
+
+
+def get_bootstrap_service(db: Session = Depends(get_db)) -> BootstrapService:
+    """Get BootstrapService instance
+
+    Uses the primary: it only queries to fill the shared fragment cache, and a
+    lagging replica would store rows older than the write that invalidated them.
+    """
+    return BootstrapService(db)
@@ -0,0 +1 @@
+# Static exports of the public API
@@ -0,0 +1,495 @@
+"""
+Static snapshot exporter
+
+Renders the public read endpoints into a directory of JSON files with
+precompressed .gz (and .br when brotli is installed) siblings and a
+manifest.json that maps every request URL to the file that answers it. A CDN
+or reverse proxy serves these files and forwards only misses and writes to the
+API.
+
+Every file records the rows it was rendered from in an index, so after a
+write only the files that depend on the changed rows are looked up and
+rendered again, and a file is only rewritten when its bytes change.
+
+Usage: python -m app.export.snapshot [--out DIR] [--full]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from math import ceil
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+try:
+    import fcntl
+except ImportError:  # Windows: one process per snapshot directory
+    fcntl = None
+
+from app.core.compression import SUFFIXES, compress_static
+from app.core.config import settings
+from app.db.events import ContentChange, on_content_change
+from app.db import session
+from app.models.blog import BlogPost, RelatedPost
+from app.models.header import HeaderColumn
+from app.models.service import Service
+from app.repositories.header_repository import ComboboxItemRepository, HeaderColumnRepository
+from app.schemas.blog import BlogPostDetail, PaginatedBlogPosts, RelatedPostSummary
+from app.schemas.header import ComboboxItemRead, HeaderColumnListItem
+from app.schemas.service import ServiceListItem, ServiceRead
+from app.search.related import wait_for_related_posts
+from app.services.blog_service import BlogService
+from app.services.bootstrap_service import BootstrapService
+from app.services.user_service import ServiceService
+
+logger = logging.getLogger(__name__)
+
+LANGUAGES = ("tr", "en", "fr")
+PAGE_SIZE = 10  # default page size of /api/v1/blog/posts
+BOOTSTRAP_POSTS = 6  # default ?posts= of /api/v1/bootstrap
+MANIFEST = "manifest.json"
+INDEX = ".index.sqlite"
+LOCK = ".lock"
+API = "/api/v1"
+
+_service_list_json = TypeAdapter(List[ServiceListItem])
+_service_json = TypeAdapter(ServiceRead)
+_page_json = TypeAdapter(PaginatedBlogPosts)
+_post_json = TypeAdapter(BlogPostDetail)
+_columns_json = TypeAdapter(List[HeaderColumnListItem])
+_items_json = TypeAdapter(List[ComboboxItemRead])
+
+def _dump(adapter: TypeAdapter, value) -> bytes:
+    # Validate first, as FastAPI does with response_model, so ORM objects work
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+# A render function returns the body and the rows it read as "entity:id",
+# or "entity:*" when any insert or delete of that entity can change it
+Rendered = Tuple[bytes, Set[str]]
+
+
+@dataclass
+class SnapshotFile:
+    path: str  # relative to the snapshot directory
+    urls: List[str]  # request URLs answered by this file
+    render: Callable[[Session], Optional[Rendered]]  # None: no longer public
+
+
+def _render_services(db: Session) -> Rendered:
+    services = ServiceService(db).get_active_services()
+    return _dump(_service_list_json, services), {"service:*"}
+
+
+def _render_service(slug: str) -> Callable[[Session], Optional[Rendered]]:
+    def render(db: Session) -> Optional[Rendered]:
+        service = db.scalars(select(Service).where(Service.slug == slug)).first()
+        if service is None:
+            return None
+        return _dump(_service_json, service), {f"service:{service.id}"}
+    return render
+
+
+def _render_blog_page(page: int) -> Callable[[Session], Optional[Rendered]]:
+    def render(db: Session) -> Optional[Rendered]:
+        result = BlogService(db).get_published_posts(page=page, size=PAGE_SIZE)
+        if page > 1 and not result["items"]:
+            return None
+        return _dump(_page_json, result), {"blog_post:*"}
+    return render
+
+
+def _render_blog_post(slug: str, lang: str) -> Callable[[Session], Optional[Rendered]]:
+    def render(db: Session) -> Optional[Rendered]:
+        blog_service = BlogService(db)
+        post = blog_service.repository.get_by_slug(slug)
+        if post is None or post.published_date is None:
+            return None
+        related = blog_service.get_related_posts(post, lang)
+        detail = BlogPostDetail.model_validate(post)
+        detail.related_posts = [RelatedPostSummary(**item) for item in related]
+        dependencies = {f"blog_post:{post.id}"} | {f"blog_post:{item['id']}" for item in related}
+        return _dump(_post_json, detail), dependencies
+    return render
+
+
+def _render_header_columns(db: Session) -> Rendered:
+    columns = HeaderColumnRepository(db).get_active_columns()
+    return _dump(_columns_json, columns), {"header_column:*"}
+
+
+def _render_combobox_items(slug: str) -> Callable[[Session], Optional[Rendered]]:
+    def render(db: Session) -> Optional[Rendered]:
+        column = HeaderColumnRepository(db).get_active_by_slug(slug)
+        if column is None:
+            return None
+        items = ComboboxItemRepository(db).get_active_items(column.id)
+        return _dump(_items_json, items), {f"header_column:{column.id}", "combobox_item:*"}
+    return render
+
+
+def _render_bootstrap(lang: str) -> Callable[[Session], Optional[Rendered]]:
+    def render(db: Session) -> Optional[Rendered]:
+        body = BootstrapService(db).get_bootstrap_json(lang, BOOTSTRAP_POSTS)
+        return body, {"header_column:*", "combobox_item:*", "service:*", "blog_post:*"}
+    return render
+
+
+def _with_languages(path: str) -> List[str]:
+    return [path] + [f"{path}?lang={lang}" for lang in LANGUAGES]
+
+
+def _services_file() -> SnapshotFile:
+    return SnapshotFile("services.json", _with_languages(f"{API}/services"), _render_services)
+
+
+def _service_file(slug: str) -> SnapshotFile:
+    return SnapshotFile(f"services/{slug}.json", _with_languages(f"{API}/services/{slug}"), _render_service(slug))
+
+
+def _blog_page_file(page: int) -> SnapshotFile:
+    urls = [f"{API}/blog/posts?page={page}&size={PAGE_SIZE}"]
+    if page == 1:
+        urls.append(f"{API}/blog/posts")
+    return SnapshotFile(f"blog/posts/page-{page}.json", urls, _render_blog_page(page))
+
+
+def _blog_post_file(slug: str, lang: str) -> SnapshotFile:
+    urls = [f"{API}/blog/posts/{slug}?lang={lang}"] + ([f"{API}/blog/posts/{slug}"] if lang == "en" else [])
+    return SnapshotFile(f"{lang}/blog/posts/{slug}.json", urls, _render_blog_post(slug, lang))
+
+
+def _header_columns_file() -> SnapshotFile:
+    return SnapshotFile("header/columns.json", _with_languages(f"{API}/header/columns"), _render_header_columns)
+
+
+def _combobox_items_file(slug: str) -> SnapshotFile:
+    return SnapshotFile(
+        f"header/columns/{slug}/combobox-items.json",
+        _with_languages(f"{API}/header/columns/{slug}/combobox-items"),
+        _render_combobox_items(slug),
+    )
+
+
+def _bootstrap_file(lang: str) -> SnapshotFile:
+    urls = [f"{API}/bootstrap?lang={lang}"] + ([f"{API}/bootstrap"] if lang == "en" else [])
+    return SnapshotFile(f"{lang}/bootstrap.json", urls, _render_bootstrap(lang))
+
+
+_LANG = "(" + "|".join(LANGUAGES) + ")"
+_PATHS: List[Tuple[re.Pattern, Callable[..., SnapshotFile]]] = [
+    (re.compile(r"services\.json"), _services_file),
+    (re.compile(r"services/([^/]+)\.json"), _service_file),
+    (re.compile(r"blog/posts/page-(\d+)\.json"), lambda page: _blog_page_file(int(page))),
+    (re.compile(_LANG + r"/blog/posts/([^/]+)\.json"), lambda lang, slug: _blog_post_file(slug, lang)),
+    (re.compile(r"header/columns\.json"), _header_columns_file),
+    (re.compile(r"header/columns/([^/]+)/combobox-items\.json"), _combobox_items_file),
+    (re.compile(_LANG + r"/bootstrap\.json"), _bootstrap_file),
+]
+
+
+def file_for_path(path: str) -> Optional[SnapshotFile]:
+    """The snapshot file stored at a path, so it can be rendered again without planning"""
+    for pattern, build in _PATHS:
+        match = pattern.fullmatch(path)
+        if match:
+            return build(*match.groups())
+    return None
+
+
+def _blog_pages(db: Session, max_blog_pages: Optional[int] = None) -> range:
+    if max_blog_pages is None:
+        max_blog_pages = settings.snapshot_max_blog_pages
+    published = BlogService(db).repository.count_published()
+    return range(1, min(max(ceil(published / PAGE_SIZE), 1), max_blog_pages) + 1)
+
+
+def plan_files(db: Session, max_blog_pages: Optional[int] = None) -> List[SnapshotFile]:
+    """Every file of a complete snapshot (reads only ids and slugs)"""
+    files = [_services_file(), _header_columns_file()]
+    for (slug,) in db.execute(select(Service.slug).order_by(Service.id)):
+        files.append(_service_file(slug))
+
+    files.extend(_blog_page_file(page) for page in _blog_pages(db, max_blog_pages))
+    slugs = db.execute(select(BlogPost.slug).where(BlogPost.published_date.isnot(None)).order_by(BlogPost.id))
+    for (slug,) in slugs:
+        files.extend(_blog_post_file(slug, lang) for lang in LANGUAGES)
+
+    for (slug,) in db.execute(select(HeaderColumn.slug).where(HeaderColumn.is_active == True)):  # noqa: E712
+        files.append(_combobox_items_file(slug))
+    files.extend(_bootstrap_file(lang) for lang in LANGUAGES)
+    return files
+
+
+def _changed_files(db: Session, changes: List[ContentChange]) -> List[SnapshotFile]:
+    """Files the changed rows may now appear in under their current slugs"""
+    def ids(entity: str) -> Set[int]:
+        return {change.entity_id for change in changes if change.entity == entity}
+
+    files: List[SnapshotFile] = []
+    service_ids = ids("service")
+    if service_ids:
+        for (slug,) in db.execute(select(Service.slug).where(Service.id.in_(service_ids))):
+            files.append(_service_file(slug))
+    post_ids = ids("blog_post")
+    if post_ids:
+        files.extend(_blog_page_file(page) for page in _blog_pages(db))  # a new post can add a page
+        slugs = db.execute(
+            select(BlogPost.slug).where(BlogPost.id.in_(post_ids), BlogPost.published_date.isnot(None))
+        )
+        for (slug,) in slugs:
+            files.extend(_blog_post_file(slug, lang) for lang in LANGUAGES)
+    column_ids = ids("header_column")
+    if column_ids:
+        columns = db.execute(
+            select(HeaderColumn.slug).where(HeaderColumn.id.in_(column_ids), HeaderColumn.is_active == True)  # noqa: E712
+        )
+        for (slug,) in columns:
+            files.append(_combobox_items_file(slug))
+    return files
+
+
+class SnapshotWriter:
+    """Writes snapshot files and keeps their index and manifest.json in step with the directory
+
+    The index (.index.sqlite) holds one row per file with its digest and one
+    row per dependency, so an incremental export looks up and updates only
+    the files of the changed rows. manifest.json, the URL map read by the
+    proxy, is only rewritten when a file is added or removed.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.index = sqlite3.connect(os.path.join(directory, INDEX))
+        self.index.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, sha256 TEXT NOT NULL, size INTEGER NOT NULL,
+                encodings TEXT NOT NULL, urls TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS deps (
+                token TEXT NOT NULL, path TEXT NOT NULL, PRIMARY KEY (token, path)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS deps_path ON deps (path);
+        """)
+        self.urls_changed = not os.path.exists(os.path.join(directory, MANIFEST))
+
+    def close(self) -> None:
+        self.index.commit()
+        self.index.close()
+
+    def __len__(self) -> int:
+        return self.index.execute("SELECT count(*) FROM files").fetchone()[0]
+
+    def paths(self) -> Set[str]:
+        return {path for (path,) in self.index.execute("SELECT path FROM files")}
+
+    def dependents(self, tokens: Iterable[str]) -> Set[str]:
+        """Paths of the files that depend on any of the tokens"""
+        tokens = sorted(set(tokens))
+        paths: Set[str] = set()
+        for start in range(0, len(tokens), 500):  # stay under SQLite's parameter limit
+            chunk = tokens[start:start + 500]
+            rows = self.index.execute(
+                f"SELECT DISTINCT path FROM deps WHERE token IN ({','.join('?' * len(chunk))})", chunk
+            )
+            paths.update(path for (path,) in rows)
+        return paths
+
+    def _write(self, path: str, data: bytes) -> None:
+        full_path = os.path.join(self.directory, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        temp_path = f"{full_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, full_path)
+
+    def _remove(self, path: str) -> None:
+        for suffix in ("",) + tuple(SUFFIXES.values()):
+            try:
+                os.remove(os.path.join(self.directory, path + suffix))
+            except FileNotFoundError:
+                pass
+
+    def _forget(self, path: str) -> None:
+        self.index.execute("DELETE FROM files WHERE path = ?", (path,))
+        self.index.execute("DELETE FROM deps WHERE path = ?", (path,))
+        self.urls_changed = True
+
+    def store(self, file: SnapshotFile, rendered: Optional[Rendered]) -> bool:
+        """Write or remove one file; return True if anything on disk changed"""
+        row = self.index.execute("SELECT sha256 FROM files WHERE path = ?", (file.path,)).fetchone()
+        if rendered is None:
+            if row is None:
+                return False
+            self._forget(file.path)
+            self._remove(file.path)
+            return True
+        body, dependencies = rendered
+        self.index.execute("DELETE FROM deps WHERE path = ?", (file.path,))
+        self.index.executemany(
+            "INSERT INTO deps (token, path) VALUES (?, ?)", [(token, file.path) for token in dependencies]
+        )
+        digest = hashlib.sha256(body).hexdigest()
+        if row is not None and row[0] == digest:
+            return False
+        encoded = compress_static(body)
+        self._write(file.path, body)
+        for encoding, data in encoded.items():
+            self._write(file.path + SUFFIXES[encoding], data)
+        self.index.execute(
+            "INSERT OR REPLACE INTO files (path, sha256, size, encodings, urls) VALUES (?, ?, ?, ?, ?)",
+            (file.path, digest, len(body), json.dumps({e: len(d) for e, d in encoded.items()}), json.dumps(file.urls)),
+        )
+        self.urls_changed = self.urls_changed or row is None
+        return True
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Remove files that are no longer part of the snapshot"""
+        stale = self.paths() - set(keep)
+        for path in stale:
+            self._forget(path)
+            self._remove(path)
+        return len(stale)
+
+    def save_manifest(self) -> None:
+        """Write manifest.json if the set of files changed since it was last written"""
+        if not self.urls_changed:
+            return
+        urls = {}
+        for path, file_urls in self.index.execute("SELECT path, urls FROM files ORDER BY path"):
+            urls.update((url, path) for url in json.loads(file_urls))
+        manifest = {"generated_at": datetime.utcnow().isoformat(), "urls": urls}
+        self._write(MANIFEST, json.dumps(manifest, indent=1, sort_keys=True).encode())
+        self.urls_changed = False
+
+
+@contextmanager
+def _export_lock(directory: str):
+    """Hold the directory's lock file, so exports of other processes wait"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, LOCK), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def export_snapshot(directory: str, changes: Optional[List[ContentChange]] = None) -> Dict[str, int]:
+    """Render the snapshot; with changes, only the files that depend on them
+
+    Every worker exports its own writes into the same directory, so the
+    index and manifest are read, updated and saved under an exclusive lock.
+    """
+    with _export_lock(directory):
+        writer = SnapshotWriter(directory)
+        try:
+            stats = _export(writer, changes)
+            writer.save_manifest()
+        finally:
+            writer.close()
+        return stats
+
+
+def _export(writer: SnapshotWriter, changes: Optional[List[ContentChange]]) -> Dict[str, int]:
+    written = pruned = 0
+    with session.SessionLocal() as db:
+        if changes is None or not len(writer):
+            files = plan_files(db)
+        else:
+            tokens = {f"{c.entity}:{c.entity_id}" for c in changes} | {f"{c.entity}:*" for c in changes}
+            changed_posts = [c.entity_id for c in changes if c.entity == "blog_post"]
+            if changed_posts:
+                # Posts whose related list now includes a changed post
+                rows = db.execute(select(RelatedPost.post_id).where(RelatedPost.related_post_id.in_(changed_posts)))
+                tokens.update(f"blog_post:{post_id}" for (post_id,) in rows)
+            selected = {file.path: file for file in _changed_files(db, changes)}
+            for path in writer.dependents(tokens) - set(selected):
+                file = file_for_path(path)
+                if file is not None:
+                    selected[path] = file
+            files = list(selected.values())
+        for file in files:
+            written += writer.store(file, file.render(db))
+        if changes is None:
+            pruned = writer.prune(file.path for file in files)
+    return {"rendered": len(files), "written": written, "removed": pruned}
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _submit(job, *args) -> Future:
+    # One worker so exports never interleave their manifest writes
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot-export")
+    future = _executor.submit(job, *args)
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def _log_failure(future: Future) -> None:
+    if future.exception() is not None:
+        logger.error("Snapshot export failed", exc_info=future.exception())
+
+
+def _export_changes(directory: str, changes: List[ContentChange]) -> None:
+    if any(change.entity == "blog_post" for change in changes):
+        wait_for_related_posts()  # detail files embed the recomputed related posts
+    export_snapshot(directory, changes)
+
+
+def schedule_snapshot_export() -> Optional[Future]:
+    """Bring the snapshot directory up to date in the background (run at startup)"""
+    if not settings.snapshot_dir:
+        return None
+    return _submit(export_snapshot, settings.snapshot_dir)
+
+
+def wait_for_snapshot_export() -> None:
+    """Block until queued exports have finished"""
+    _submit(lambda: None).result()
+
+
+@on_content_change
+def queue_snapshot_update(changes: List[ContentChange]) -> None:
+    """Re-render the snapshot files that depend on the committed changes"""
+    if settings.snapshot_dir:
+        _submit(_export_changes, settings.snapshot_dir, changes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the public API as static JSON files")
+    parser.add_argument("--out", default=settings.snapshot_dir, help="snapshot directory (default: SNAPSHOT_DIR)")
+    parser.add_argument("--full", action="store_true", help="discard the index and render every file")
+    args = parser.parse_args()
+    if not args.out:
+        parser.error("--out is required when SNAPSHOT_DIR is not set")
+    if args.full:
+        with _export_lock(args.out):
+            for name in (INDEX, MANIFEST):
+                try:
+                    os.remove(os.path.join(args.out, name))
+                except FileNotFoundError:
+                    pass
+    stats = export_snapshot(args.out)
+    print(f"Rendered {stats['rendered']} files, wrote {stats['written']}, removed {stats['removed']} in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,137 @@
+from functools import partial
+
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-
-from app.core.config import settings
-from app.db.session import Base, engine
-from app.api.routes_public import router as public_router
-from app.api.routes_admin import router as admin_router
-from app.api.routes_auth import router as auth_router
-from app.exceptions.handlers import (
-    custom_exception_handler,
-    http_exception_handler,
-    general_exception_handler
-)
-from app.exceptions.custom_exceptions import BaseCustomException
-import app.models  # noqa: F401 ensure models are imported for table creation
-
-app = FastAPI(
-    title="Istanbul Care API - Public Endpoints",
-    description="Simple public API for blog posts and content management",
-    version="1.0.0",
-    openapi_url="/openapi.json",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# CORS (adjust origins as needed)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-# Exception handlers
-app.add_exception_handler(BaseCustomException, custom_exception_handler)
-app.add_exception_handler(Exception, general_exception_handler)
-
-
-@app.on_event("startup")
+
+from app.core.config import get_settings
+from app.core.startup import phase
+
+
+def create_app() -> FastAPI:
+    """Build the application; routers, settings and engines load here rather than at import"""
+    with phase("settings"):
+        settings = get_settings()  # fail fast if misconfigured
+
+    with phase("routers"):
+        from fastapi.middleware.cors import CORSMiddleware
+
+        from app.api.routes_public import router as public_router
+        from app.api.routes_admin import router as admin_router
+        from app.api.routes_auth import router as auth_router
+        from app.api.routes_metrics import router as metrics_router
+        from app.api.routes_feeds import router as feeds_router
+        from app.api.routes_health import router as health_router
+        from app.api.routes_diagnostics import router as diagnostics_router
+        from app.core.hot_paths import start_hot_path_sampler, stop_hot_path_sampler
+        from app.core.loop_monitor import start_loop_monitor, stop_loop_monitor
+        from app.core.memory import start_memory_tracing
+        from app.core.warmup import start_warmup, stop_warmup
+        from app.db.query_stats import install_query_stats
+        from app.middleware.compression import CompressionMiddleware
+        from app.middleware.metrics import MetricsMiddleware
+        from app.middleware.hot_paths import HotPathMiddleware
+        from app.middleware.memory import MemoryPeakMiddleware
+        from app.middleware.profiling import ProfilingMiddleware
+        from app.middleware.query_stats import QueryStatsMiddleware
+        from app.exceptions.handlers import (
+            custom_exception_handler,
+            http_exception_handler,
+            general_exception_handler
+        )
+        from app.exceptions.custom_exceptions import BaseCustomException
+        import app.models  # noqa: F401 ensure models are imported for table creation
+
+    with phase("app"):
+        application = FastAPI(
+            title="Istanbul Care API - Public Endpoints",
+            description="Simple public API for blog posts and content management",
+            version="1.0.0",
+            openapi_url="/openapi.json",
+            docs_url="/docs",
+            redoc_url="/redoc"
+        )
+
+        # Response compression, innermost so it sees the final response body
+        application.add_middleware(CompressionMiddleware)
+
+        # CORS (adjust origins as needed)
+        application.add_middleware(
+            CORSMiddleware,
+            allow_origins=["*"],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+        # Request metrics, outside CORS so CORS handling is included in the latency
+        application.add_middleware(MetricsMiddleware)
+
+        # Per-route peak allocation of sampled requests while memory tracing is on
+        application.add_middleware(MemoryPeakMiddleware)
+
+        # Route attribution for the continuous sampler
+        if settings.hot_paths_enabled:
+            application.add_middleware(HotPathMiddleware)
+
+        # Route attribution for the statement stats and slow query log
+        if settings.query_stats_enabled:
+            application.add_middleware(QueryStatsMiddleware)
+
+        # Per-request profiles for flagged admin requests, around everything else
+        application.add_middleware(ProfilingMiddleware)
+
+        # Exception handlers
+        application.add_exception_handler(BaseCustomException, custom_exception_handler)
+        application.add_exception_handler(Exception, general_exception_handler)
+
+        application.add_event_handler("startup", on_startup)
+        application.add_event_handler("startup", partial(start_warmup, application))
+        application.add_event_handler("startup", start_hot_path_sampler)
+        application.add_event_handler("startup", start_memory_tracing)
+        application.add_event_handler("startup", start_loop_monitor)
+        application.add_event_handler("startup", install_query_stats)
+        application.add_event_handler("shutdown", stop_warmup)
+        application.add_event_handler("shutdown", stop_hot_path_sampler)
+        application.add_event_handler("shutdown", stop_loop_monitor)
+
+        # Include routers
+        application.include_router(public_router)
+        application.include_router(admin_router)
+        application.include_router(auth_router)
+        application.include_router(metrics_router)
+        application.include_router(feeds_router)
+        application.include_router(health_router)
+        application.include_router(diagnostics_router)
+    return application
+
+
 def on_startup():
-    Base.metadata.create_all(bind=engine)
+    from app.core.cache_sync import cache_watcher
+    from app.db.schema import ensure_schema
+    from app.db.session import init_engines
+    from app.export.snapshot import schedule_snapshot_export
+    from app.search.autocomplete import build_autocomplete_index
+    from app.search.index import init_search_index
+    from app.search.related import schedule_related_posts_build
+
+    with phase("engines"):
+        init_engines()
+    with phase("schema check"):
+        ensure_schema()
+    with phase("cache versions"):
+        cache_watcher.poll()  # record the versions the caches below are built from
+    with phase("search index"):
+        init_search_index()
+    with phase("autocomplete index"):
+        build_autocomplete_index()
+    with phase("background jobs"):
+        schedule_related_posts_build()
+        schedule_snapshot_export()
 
 
-# Include routers
-app.include_router(public_router)
-app.include_router(admin_router)
-app.include_router(auth_router)
+def __getattr__(name: str):
+    # "uvicorn app.main:app" and "from app.main import app" build the app on
+    # first access; "uvicorn --factory app.main:create_app" builds it directly
+    if name == "app":
+        application = globals()["app"] = create_app()
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,128 @@
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.compression import ENCODERS, StreamCompressor, negotiate
+from app.core.config import settings
+from app.core.metrics import record_compression
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "application/rss+xml",
+    "application/atom+xml",
+    "image/svg+xml",
+}
+
+
+def _compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False  # events must reach the client unbuffered
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+class CompressionMiddleware:
+    """Compress responses with the best encoding the client accepts
+
+    Bodies under ``minimum_size`` are sent as-is, complete bodies of at least
+    ``thread_min_size`` bytes are compressed in a worker thread, and streamed
+    bodies are compressed chunk by chunk. Responses that already carry a
+    Content-Encoding (such as ``CompressedResponse``) pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None, thread_min_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.compression_min_size if minimum_size is None else minimum_size
+        self.thread_min_size = (
+            settings.compression_thread_min_size if thread_min_size is None else thread_min_size
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingSend(send, encoding, self.minimum_size, self.thread_min_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingSend:
+    def __init__(self, send, encoding: str, minimum_size: int, thread_min_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.thread_min_size = thread_min_size
+        self.start_message = None
+        self.passthrough = False
+        self.compressor = None
+        self.raw_size = 0
+        self.sent_size = 0
+
+    async def __call__(self, message):
+        if self.passthrough:
+            await self.send(message)
+            return
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self._pass_through(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if (
+                "content-encoding" in headers
+                or self.start_message["status"] in (204, 206, 304)
+                or not _compressible(headers.get("content-type", ""))
+                or (not more_body and len(body) < self.minimum_size)
+            ):
+                await self._pass_through(message)
+                return
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                await self._send_complete(headers, body)
+                return
+            del headers["Content-Length"]
+            self.compressor = StreamCompressor(self.encoding)
+            await self.send(self.start_message)
+
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.flush()
+        self.raw_size += len(body)
+        self.sent_size += len(data)
+        if not more_body:
+            record_compression(self.encoding, "live", self.raw_size, self.sent_size)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _pass_through(self, message):
+        self.passthrough = True
+        if self.start_message is not None:
+            await self.send(self.start_message)
+        await self.send(message)
+
+    async def _send_complete(self, headers: MutableHeaders, body: bytes):
+        encode = ENCODERS[self.encoding]
+        if len(body) >= self.thread_min_size:
+            data = await anyio.to_thread.run_sync(encode, body)
+        else:
+            data = encode(body)
+        headers["Content-Length"] = str(len(data))
+        record_compression(self.encoding, "live", len(body), len(data))
+        await self.send(self.start_message)
+        await self.send({"type": "http.response.body", "body": data})
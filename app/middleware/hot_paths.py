@@ -0,0 +1,29 @@
+import asyncio
+
+from app.core.hot_paths import hot_path_sampler, request_scope
+
+
+class HotPathMiddleware:
+    """Let the hot path sampler charge samples to the route being served
+
+    Maps the request's task to its scope for samples of the event loop thread
+    and puts the scope in the context threadpool workers inherit. Only added
+    when HOT_PATHS_ENABLED; does nothing while the sampler is stopped.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not hot_path_sampler.running:
+            await self.app(scope, receive, send)
+            return
+
+        task = asyncio.current_task()
+        hot_path_sampler.tasks[task] = scope
+        token = request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_scope.reset(token)
+            hot_path_sampler.tasks.pop(task, None)
@@ -0,0 +1,22 @@
+from app.core.memory import memory_diagnostics
+
+
+class MemoryPeakMiddleware:
+    """Record the peak allocation of sampled requests per route while memory tracing is on"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not memory_diagnostics.tracing:
+            await self.app(scope, receive, send)
+            return
+        baseline = memory_diagnostics.begin_sample()
+        if baseline is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            memory_diagnostics.end_sample(scope["method"], getattr(route, "path", None) or "unmatched", baseline)
@@ -0,0 +1,40 @@
+import time
+
+from app.core.metrics import http_request_duration_seconds, http_requests_total
+
+
+class MetricsMiddleware:
+    """Record per-route request counts and latencies
+
+    Implemented as a plain ASGI middleware rather than ``BaseHTTPMiddleware``
+    so it adds no extra task or body buffering to each request. The worker's
+    own warm-up requests (marked "warmup" in the scope) are not recorded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("warmup"):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope; use its template
+            # so path parameters don't explode the label cardinality
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_request_duration_seconds.observe(time.perf_counter() - started, (method, path))
+            http_requests_total.inc((method, path, str(status_code)))
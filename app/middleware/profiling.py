@@ -0,0 +1,85 @@
+import anyio
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+from app.core.profiling import RequestProfile, current_profile, install_sql_hooks, profile_store, sampler
+
+_ENABLED = {b"1", b"true", b"yes", b"on"}
+
+
+def _wants_profile(scope) -> bool:
+    if b"_profile" in scope["query_string"]:
+        for part in scope["query_string"].split(b"&"):
+            name, _, value = part.partition(b"=")
+            if name == b"_profile" and value.lower() in _ENABLED:
+                return True
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            return value.lower() in _ENABLED
+    return False
+
+
+async def _check_admin(scope) -> None:
+    """Authenticate the request like require_admin does; raises HTTPException"""
+    from app.core.security import require_admin, user_from_token
+    from app.db import session
+
+    authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=403, detail="Not authenticated")
+
+    def lookup():
+        with session.SessionLocal() as db:
+            require_admin(user_from_token(token, db))
+
+    # The user query blocks, so it runs in the threadpool like a sync route
+    await anyio.to_thread.run_sync(lookup)
+
+
+class ProfilingMiddleware:
+    """Run admin requests flagged with "X-Profile: 1" or "?_profile=1" under the profiler
+
+    The profile id comes back in the X-Profile-Id header; the profile is
+    served at /admin/profiles/{id}. Unflagged requests pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await _check_admin(scope)
+        except HTTPException as exc:
+            response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+            await response(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], scope["query_string"].decode("latin-1"))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-id", profile.id.encode()),
+                    (b"x-profile-url", f"/admin/profiles/{profile.id}".encode()),
+                ]
+            await send(message)
+
+        install_sql_hooks()
+        token = current_profile.set(profile)
+        sampler.add(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.remove(profile)
+            current_profile.reset(token)
+            profile.finish()
+            route = scope.get("route")
+            profile.route = getattr(route, "path", None)
+            await anyio.to_thread.run_sync(profile_store.save, profile.to_dict())
@@ -0,0 +1,24 @@
+from app.db.query_stats import current_request
+
+
+class QueryStatsMiddleware:
+    """Let the statement hooks attribute queries to the route being served
+
+    Puts the request's scope in the context, where the hooks (on the event
+    loop or in threadpool workers) read the route the router matched. Only
+    added when QUERY_STATS_ENABLED.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_request.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request.reset(token)
@@ -3,6 +3,13 @@ from app.db.session import Base
 # Import model modules here so Alembic or create_all can discover them
 from app.models.user import User  # noqa: F401
 from app.models.service import Service  # noqa: F401
-from app.models.blog import BlogPost  # noqa: F401
+from app.models.blog import BlogPost, RelatedPost  # noqa: F401
 from app.models.lead import Lead  # noqa: F401
 from app.models.header import HeaderColumn, ComboboxItem  # noqa: F401
+from app.models.change_log import ChangeLogEntry  # noqa: F401
+from app.models.cache_version import CacheVersion  # noqa: F401
+from app.models.dataset_seed import DatasetSeed  # noqa: F401
+from app.models.schema_fingerprint import SchemaFingerprint  # noqa: F401
+
+# Registers the session hooks that write the change log and cache versions on every flush
+import app.db.events  # noqa: E402,F401
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Integer, String, Text, DateTime, Float, ForeignKey, JSON, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.db.session import Base
@@ -6,6 +6,15 @@ from app.db.session import Base
 
 class BlogPost(Base):
     __tablename__ = "blog_posts"
+    __table_args__ = (
+        # Published listing: WHERE published_date IS NOT NULL ORDER BY published_date DESC
+        Index(
+            "ix_blog_posts_published_date",
+            "published_date",
+            sqlite_where=text("published_date IS NOT NULL"),
+            postgresql_where=text("published_date IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     slug: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
@@ -30,3 +39,18 @@ class BlogPost(Base):
     # Image fields for React admin panel
     featured_image_url: Mapped[str | None] = mapped_column(String(500), nullable=True)  # Ana resim URL'i
     gallery_urls: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)  # Galeri resimleri (array of URLs)
+
+
+class RelatedPost(Base):
+    """Precomputed TF-IDF neighbours of a blog post (see app.search.related)"""
+    __tablename__ = "related_posts"
+    __table_args__ = (
+        # Incremental updates find the lists that point at a changed post
+        Index("ix_related_posts_related_lang", "related_post_id", "lang"),
+    )
+
+    post_id: Mapped[int] = mapped_column(Integer, ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True)
+    lang: Mapped[str] = mapped_column(String(5), primary_key=True)
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    related_post_id: Mapped[int] = mapped_column(Integer, ForeignKey("blog_posts.id", ondelete="CASCADE"), nullable=False)
+    score: Mapped[float] = mapped_column(Float, nullable=False)
@@ -0,0 +1,13 @@
+from sqlalchemy import Integer, String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.db.session import Base
+
+
+class CacheVersion(Base):
+    """Per-entity version bumped by every write (read by app.core.cache_sync in other workers)"""
+    __tablename__ = "cache_versions"
+
+    entity: Mapped[str] = mapped_column(String(50), primary_key=True)  # "blog_post", "service", ...
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
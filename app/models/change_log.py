@@ -0,0 +1,18 @@
+from sqlalchemy import Integer, String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.db.session import Base
+
+
+class ChangeLogEntry(Base):
+    """One insert, update or delete of public content (written by app.db.events)"""
+    __tablename__ = "change_log"
+    # AUTOINCREMENT keeps SQLite from reusing the sequence numbers of deleted rows
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    entity: Mapped[str] = mapped_column(String(50), nullable=False)  # "blog_post", "service", ...
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    op: Mapped[str] = mapped_column(String(10), nullable=False)  # "insert", "update", "delete"
+    slug: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    changed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
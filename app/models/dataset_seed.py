@@ -0,0 +1,14 @@
+from sqlalchemy import Integer, String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.db.session import Base
+
+
+class DatasetSeed(Base):
+    """Checksum of the last dataset loaded by app.db.seed, so repeat runs are skipped"""
+    __tablename__ = "dataset_seeds"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)  # "sample"
+    checksum: Mapped[str] = mapped_column(String(64), nullable=False)
+    rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    seeded_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,10 +1,13 @@
-from sqlalchemy import Integer, String, Boolean, ForeignKey, Text
+from sqlalchemy import Integer, String, Boolean, ForeignKey, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.session import Base
 
 
 class HeaderColumn(Base):
     __tablename__ = "header_columns"
+    __table_args__ = (
+        Index("ix_header_columns_is_active_order", "is_active", "order"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name_tr: Mapped[str] = mapped_column(String(255), nullable=False)  # "Saç Ekimi", "Hizmetler" etc.
@@ -22,6 +25,9 @@ class HeaderColumn(Base):
 
 class ComboboxItem(Base):
     __tablename__ = "combobox_items"
+    __table_args__ = (
+        Index("ix_combobox_items_column_active_order", "header_column_id", "is_active", "order"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     header_column_id: Mapped[int] = mapped_column(Integer, ForeignKey("header_columns.id"), nullable=False, index=True)
@@ -0,0 +1,13 @@
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+from app.db.session import Base
+
+
+class SchemaFingerprint(Base):
+    """Hash of the model metadata create_all last ran for, checked at startup"""
+    __tablename__ = "schema_fingerprints"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)  # "models"
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,10 +1,13 @@
-from sqlalchemy import Boolean, Integer, String, Text, JSON, Float
+from sqlalchemy import Boolean, Integer, String, Text, JSON, Float, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.session import Base
 
 
 class Service(Base):
     __tablename__ = "services"
+    __table_args__ = (
+        Index("ix_services_is_active_id", "is_active", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     slug: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
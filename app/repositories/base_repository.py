@@ -25,6 +25,12 @@ class BaseRepository(Generic[ModelType]):
         """Get record by ID"""
         return self.db.query(self.model).filter(self.model.id == id).first()
     
+    def get_by_ids(self, ids: List[int]) -> List[ModelType]:
+        """Get records whose ID is in the given list"""
+        if not ids:
+            return []
+        return self.db.query(self.model).filter(self.model.id.in_(ids)).all()
+    
     def get_by_field(self, field_name: str, value: Any) -> Optional[ModelType]:
         """Get record by field value"""
         return self.db.query(self.model).filter(getattr(self.model, field_name) == value).first()
@@ -1,7 +1,23 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional, List, Tuple
+from sqlalchemy import func, or_, and_
+from sqlalchemy.orm import Session, load_only
 from app.repositories.base_repository import BaseRepository
-from app.models.blog import BlogPost
+from app.models.blog import BlogPost, RelatedPost
+
+
+# Columns needed for listings, feeds and sitemaps
+SUMMARY_COLUMNS = (
+    BlogPost.id, BlogPost.slug, BlogPost.published_date,
+    BlogPost.title_tr, BlogPost.title_en, BlogPost.title_fr,
+    BlogPost.description_tr, BlogPost.description_en, BlogPost.description_fr,
+)
+
+# Columns shown in a post's related post list
+RELATED_COLUMNS = (
+    BlogPost.id, BlogPost.slug, BlogPost.featured_image_url,
+    BlogPost.title_tr, BlogPost.title_en, BlogPost.title_fr,
+)
 
 
 class BlogRepository(BaseRepository[BlogPost]):
@@ -22,6 +38,61 @@ class BlogRepository(BaseRepository[BlogPost]):
             BlogPost.published_date.desc()
         ).offset(skip).limit(limit).all()
     
+    def count_published(self) -> int:
+        """Count published blog posts"""
+        return self.db.query(BlogPost).filter(
+            BlogPost.published_date.isnot(None)
+        ).count()
+    
+    def get_published_before(
+        self, before: Optional[Tuple[datetime, int]] = None, limit: int = 100
+    ) -> List[BlogPost]:
+        """Get published posts newest first, after a (published_date, id) keyset cursor (no content columns)"""
+        query = self.db.query(BlogPost).options(load_only(*SUMMARY_COLUMNS)).filter(
+            BlogPost.published_date.isnot(None)
+        )
+        if before is not None:
+            published_date, post_id = before
+            query = query.filter(or_(
+                BlogPost.published_date < published_date,
+                and_(BlogPost.published_date == published_date, BlogPost.id < post_id)
+            ))
+        return query.order_by(
+            BlogPost.published_date.desc(), BlogPost.id.desc()
+        ).limit(limit).all()
+    
+    def get_published_in_id_range(self, start_id: int, end_id: int, after_id: int = 0, limit: int = 1000) -> List[BlogPost]:
+        """Get published posts with start_id <= id < end_id in id order, after a keyset cursor (no content columns)"""
+        return self.db.query(BlogPost).options(load_only(*SUMMARY_COLUMNS)).filter(
+            BlogPost.id >= max(start_id, after_id + 1),
+            BlogPost.id < end_id,
+            BlogPost.published_date.isnot(None)
+        ).order_by(
+            BlogPost.id
+        ).limit(limit).all()
+    
+    def max_id(self) -> int:
+        """Get the highest blog post id, 0 if there are none"""
+        return self.db.query(func.max(BlogPost.id)).scalar() or 0
+    
+    def count_published_titles(self, langs: Tuple[str, ...]) -> int:
+        """Count the non-empty titles of published posts over the given languages"""
+        counts = self.db.query(
+            *(func.count(func.nullif(getattr(BlogPost, f"title_{lang}"), "")) for lang in langs)
+        ).filter(BlogPost.published_date.isnot(None)).one()
+        return sum(counts)
+    
+    def get_related_posts(self, post_id: int, lang: str) -> List[tuple]:
+        """Get precomputed related posts as (post, score) in rank order (summary columns only)"""
+        return self.db.query(BlogPost, RelatedPost.score).options(load_only(*RELATED_COLUMNS)).join(
+            RelatedPost, RelatedPost.related_post_id == BlogPost.id
+        ).filter(
+            RelatedPost.post_id == post_id,
+            RelatedPost.lang == lang
+        ).order_by(
+            RelatedPost.rank
+        ).all()
+    
     def get_posts_by_author(self, author_id: int) -> List[BlogPost]:
         """Get posts by author ID"""
         return self.get_many_by_field("author_id", author_id)
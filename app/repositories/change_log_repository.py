@@ -0,0 +1,24 @@
+from typing import List
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.repositories.base_repository import BaseRepository
+from app.models.change_log import ChangeLogEntry
+
+
+class ChangeLogRepository(BaseRepository[ChangeLogEntry]):
+    """Repository for ChangeLogEntry operations"""
+    
+    def __init__(self, db: Session):
+        super().__init__(ChangeLogEntry, db)
+    
+    def get_since(self, since: int, limit: int = 100) -> List[ChangeLogEntry]:
+        """Get changes after a sequence number, oldest first"""
+        return self.db.query(ChangeLogEntry).filter(
+            ChangeLogEntry.seq > since
+        ).order_by(
+            ChangeLogEntry.seq
+        ).limit(limit).all()
+    
+    def latest_seq(self) -> int:
+        """Get the newest sequence number, 0 if the log is empty"""
+        return self.db.query(func.max(ChangeLogEntry.seq)).scalar() or 0
@@ -0,0 +1,53 @@
+from typing import Optional, List
+from sqlalchemy.orm import Session
+from app.repositories.base_repository import BaseRepository
+from app.models.header import HeaderColumn, ComboboxItem
+
+
+class HeaderColumnRepository(BaseRepository[HeaderColumn]):
+    """Repository for HeaderColumn operations"""
+    
+    def __init__(self, db: Session):
+        super().__init__(HeaderColumn, db)
+    
+    def get_active_columns(self) -> List[HeaderColumn]:
+        """Get active header columns in navigation order"""
+        return self.db.query(HeaderColumn).filter(
+            HeaderColumn.is_active == True  # noqa: E712
+        ).order_by(
+            HeaderColumn.order, HeaderColumn.id
+        ).all()
+    
+    def get_active_by_slug(self, slug: str) -> Optional[HeaderColumn]:
+        """Get an active header column by slug"""
+        return self.db.query(HeaderColumn).filter(
+            HeaderColumn.slug == slug,
+            HeaderColumn.is_active == True  # noqa: E712
+        ).first()
+
+
+class ComboboxItemRepository(BaseRepository[ComboboxItem]):
+    """Repository for ComboboxItem operations"""
+    
+    def __init__(self, db: Session):
+        super().__init__(ComboboxItem, db)
+    
+    def get_active_items(self, header_column_id: int) -> List[ComboboxItem]:
+        """Get active combobox items of a header column in display order"""
+        return self.db.query(ComboboxItem).filter(
+            ComboboxItem.header_column_id == header_column_id,
+            ComboboxItem.is_active == True  # noqa: E712
+        ).order_by(
+            ComboboxItem.order, ComboboxItem.id
+        ).all()
+    
+    def get_active_items_for_columns(self, header_column_ids: List[int]) -> List[ComboboxItem]:
+        """Get active combobox items of several header columns, grouped by column in display order"""
+        if not header_column_ids:
+            return []
+        return self.db.query(ComboboxItem).filter(
+            ComboboxItem.header_column_id.in_(header_column_ids),
+            ComboboxItem.is_active == True  # noqa: E712
+        ).order_by(
+            ComboboxItem.header_column_id, ComboboxItem.order, ComboboxItem.id
+        ).all()
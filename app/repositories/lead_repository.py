@@ -16,7 +16,7 @@ class LeadRepository(BaseRepository[Lead]):
     
     def get_by_phone(self, phone: str) -> Optional[Lead]:
         """Get lead by phone"""
-        return self.get_by_field("phone", phone)
+        return self.get_by_field("phone_number", phone)
     
     def get_recent_leads(self, limit: int = 50) -> List[Lead]:
         """Get recent leads ordered by creation date"""
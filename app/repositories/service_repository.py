@@ -1,4 +1,5 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.repositories.base_repository import BaseRepository
 from app.models.service import Service
@@ -24,3 +25,24 @@ class ServiceRepository(BaseRepository[Service]):
         if exclude_id:
             query = query.filter(Service.id != exclude_id)
         return query.first() is not None
+    
+    def get_active_in_id_range(self, start_id: int, end_id: int, after_id: int = 0, limit: int = 1000) -> List[Service]:
+        """Get active services with start_id <= id < end_id in id order, after a keyset cursor"""
+        return self.db.query(Service).filter(
+            Service.id >= max(start_id, after_id + 1),
+            Service.id < end_id,
+            Service.is_active == True  # noqa: E712
+        ).order_by(
+            Service.id
+        ).limit(limit).all()
+    
+    def max_id(self) -> int:
+        """Get the highest service id, 0 if there are none"""
+        return self.db.query(func.max(Service.id)).scalar() or 0
+    
+    def count_active_titles(self, langs: Tuple[str, ...]) -> int:
+        """Count the non-empty titles of active services over the given languages"""
+        counts = self.db.query(
+            *(func.count(func.nullif(getattr(Service, f"title_{lang}"), "")) for lang in langs)
+        ).filter(Service.is_active == True).one()  # noqa: E712
+        return sum(counts)
@@ -65,6 +65,17 @@ class BlogPostRead(BlogPostBase):
     }
 
 
+class RelatedPostSummary(BaseModel):
+    slug: str
+    title: Optional[str] = None
+    featured_image_url: Optional[str] = None
+    score: float
+
+
+class BlogPostDetail(BlogPostRead):
+    related_posts: List[RelatedPostSummary] = []
+
+
 class PaginatedBlogPosts(BaseModel):
     items: List[BlogPostRead]
     total: int
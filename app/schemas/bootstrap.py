@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class NavigationItem(BaseModel):
+    slug: str
+    name: str
+    url: Optional[str] = None
+
+
+class NavigationColumn(BaseModel):
+    slug: str
+    name: str
+    type: str
+    url: Optional[str] = None
+    items: List[NavigationItem] = []
+
+
+class ServiceSummary(BaseModel):
+    slug: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+    duration: Optional[str] = None
+    featured_image_url: Optional[str] = None
+
+
+class BlogPostSummary(BaseModel):
+    slug: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    published_date: Optional[datetime] = None
+    featured_image_url: Optional[str] = None
+
+
+class BootstrapResponse(BaseModel):
+    lang: str
+    navigation: List[NavigationColumn]
+    services: List[ServiceSummary]
+    posts: List[BlogPostSummary]
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class ChangeRead(BaseModel):
+    seq: int
+    entity: str  # "blog_post", "service", "header_column" or "combobox_item"
+    entity_id: int
+    op: str  # "insert", "update" or "delete"
+    slug: Optional[str] = None
+    changed_at: datetime
+    deleted: bool = False  # tombstone: drop the local copy
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class ChangeFeed(BaseModel):
+    changes: List[ChangeRead]
+    next_since: int  # pass as ?since= to continue
+    has_more: bool
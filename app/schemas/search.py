@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+class SearchResult(BaseModel):
+    type: str  # "blog_post" or "service"
+    slug: str
+    title: Optional[str] = None
+    snippet: Optional[str] = None  # matches wrapped in <mark></mark>
+    score: float
+
+
+class SearchResponse(BaseModel):
+    query: str
+    lang: str
+    results: List[SearchResult]
+
+
+class AutocompleteSuggestion(BaseModel):
+    type: str  # "service", "blog_post", "header_column" or "combobox_item"
+    label: str
+    slug: str
+    url: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+
+class AutocompleteResponse(BaseModel):
+    query: str
+    lang: str
+    suggestions: List[AutocompleteSuggestion]
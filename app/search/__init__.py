@@ -0,0 +1 @@
+# Full-text search over blog posts and services
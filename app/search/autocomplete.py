@@ -0,0 +1,247 @@
+# In-memory prefix index for type-ahead suggestions
+#
+# Each language keeps one sorted array of (folded key, entry key) pairs, with
+# one key per word start of every title, so "trans" finds "Hair Transplant".
+# A prefix query is two bisections plus a top-k selection; the top-k of the
+# short prefixes a user types first is memoized until the next write.
+import heapq
+import math
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.events import ContentChange, on_content_change, on_remote_content_change
+from app.db import session
+from app.models.blog import BlogPost
+from app.models.header import ComboboxItem, HeaderColumn
+from app.models.service import Service
+from app.search.text import fold, tokenize
+
+TYPE_WEIGHTS = {
+    "service": 3.0,
+    "header_column": 2.5,
+    "combobox_item": 2.0,
+    "blog_post": 1.0,
+}
+RECENCY_HALF_LIFE_DAYS = 180.0
+MEMOIZED_PREFIX_LENGTH = 2
+MAX_LIMIT = 20
+
+EntryKey = Tuple[str, int]  # (entity, id)
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    type: str
+    label: str
+    slug: str
+    url: Optional[str]
+    weight: float
+
+
+def _recency_factor(published: Optional[datetime]) -> float:
+    if published is None:
+        return 1.0
+    age_days = max((datetime.utcnow() - published).total_seconds() / 86400, 0.0)
+    return 0.5 + 0.5 * math.exp(-age_days * math.log(2) / RECENCY_HALF_LIFE_DAYS)
+
+
+def _word_keys(label: str) -> List[str]:
+    """Keys starting at every word of the folded label"""
+    words = tokenize(label)
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class _LanguageIndex:
+    def __init__(self):
+        self.keys: List[Tuple[str, EntryKey]] = []
+        self.entries: Dict[EntryKey, Suggestion] = {}
+        self.entry_keys: Dict[EntryKey, List[str]] = {}
+        self.memo: Dict[str, List[Suggestion]] = {}
+
+    def add(self, entry_key: EntryKey, suggestion: Suggestion, bulk: bool = False) -> None:
+        keys = _word_keys(suggestion.label)
+        if not keys:
+            return
+        self.entries[entry_key] = suggestion
+        self.entry_keys[entry_key] = keys
+        for key in keys:
+            if bulk:
+                self.keys.append((key, entry_key))
+            else:
+                insort(self.keys, (key, entry_key))
+
+    def remove(self, entry_key: EntryKey) -> None:
+        self.entries.pop(entry_key, None)
+        for key in self.entry_keys.pop(entry_key, []):
+            position = bisect_left(self.keys, (key, entry_key))
+            if position < len(self.keys) and self.keys[position] == (key, entry_key):
+                del self.keys[position]
+
+    def lookup(self, prefix: str, limit: int) -> List[Suggestion]:
+        memoize = len(prefix) <= MEMOIZED_PREFIX_LENGTH
+        if memoize and prefix in self.memo:
+            return self.memo[prefix][:limit]
+
+        start = bisect_left(self.keys, (prefix,))
+        end = bisect_left(self.keys, (prefix + "\uffff",), start)
+        candidates = {entry_key for _, entry_key in self.keys[start:end]}
+        size = MAX_LIMIT if memoize else limit
+        top = heapq.nlargest(size, (self.entries[k] for k in candidates), key=lambda s: (s.weight, -len(s.label)))
+        if memoize:
+            self.memo[prefix] = top
+        return top[:limit]
+
+
+class AutocompleteIndex:
+    """Per-language prefix index over service, blog and navigation titles"""
+
+    def __init__(self):
+        self._languages: Dict[str, _LanguageIndex] = {}
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def _language(self, lang: str) -> _LanguageIndex:
+        index = self._languages.get(lang)
+        if index is None:
+            index = self._languages[lang] = _LanguageIndex()
+        return index
+
+    def rebuild(self, items: Iterable[Tuple[str, EntryKey, Suggestion]]) -> None:
+        languages: Dict[str, _LanguageIndex] = {}
+        for lang, entry_key, suggestion in items:
+            index = languages.get(lang)
+            if index is None:
+                index = languages[lang] = _LanguageIndex()
+            index.add(entry_key, suggestion, bulk=True)
+        for index in languages.values():
+            index.keys.sort()
+        with self._lock:
+            self._languages = languages
+            self.ready = True
+
+    def replace(self, entry_key: EntryKey, items: Iterable[Tuple[str, Suggestion]]) -> None:
+        with self._lock:
+            for index in self._languages.values():
+                index.remove(entry_key)
+                index.memo.clear()
+            for lang, suggestion in items:
+                index = self._language(lang)
+                index.add(entry_key, suggestion)
+                index.memo.clear()
+
+    def suggest(self, query: str, lang: str, limit: int = 10) -> List[Suggestion]:
+        prefix = " ".join(fold(query).split())
+        if not prefix:
+            return []
+        with self._lock:
+            index = self._languages.get(lang)
+            if index is None:
+                return []
+            return index.lookup(prefix, min(limit, MAX_LIMIT))
+
+
+def _service_items(service: Service):
+    if not service.is_active:
+        return
+    for lang in ("tr", "en"):
+        label = getattr(service, f"title_{lang}")
+        if label:
+            yield lang, Suggestion("service", label, service.slug, None, TYPE_WEIGHTS["service"])
+
+
+def _blog_post_items(post: BlogPost):
+    if post.published_date is None:
+        return
+    weight = TYPE_WEIGHTS["blog_post"] * _recency_factor(post.published_date)
+    for lang in ("tr", "en", "fr"):
+        label = getattr(post, f"title_{lang}")
+        if label:
+            yield lang, Suggestion("blog_post", label, post.slug, None, weight)
+
+
+def _header_column_items(column: HeaderColumn):
+    if not column.is_active:
+        return
+    for lang in ("tr", "en"):
+        yield lang, Suggestion(
+            "header_column", getattr(column, f"name_{lang}"), column.slug, column.url, TYPE_WEIGHTS["header_column"]
+        )
+
+
+def _combobox_item_items(item: ComboboxItem, column_active: bool = True):
+    if not (item.is_active and column_active):
+        return
+    for lang in ("tr", "en"):
+        yield lang, Suggestion(
+            "combobox_item", getattr(item, f"name_{lang}"), item.slug, item.url, TYPE_WEIGHTS["combobox_item"]
+        )
+
+
+_ITEM_BUILDERS = {
+    "service": (Service, _service_items),
+    "blog_post": (BlogPost, _blog_post_items),
+    "header_column": (HeaderColumn, _header_column_items),
+    "combobox_item": (ComboboxItem, _combobox_item_items),
+}
+
+
+def _iter_all(db: Session, batch_size: int = 1000):
+    inactive_columns = {
+        column_id for (column_id,) in db.query(HeaderColumn.id).filter(HeaderColumn.is_active == False)  # noqa: E712
+    }
+    for entity, (model, builder) in _ITEM_BUILDERS.items():
+        for obj in db.scalars(select(model).execution_options(yield_per=batch_size)):
+            if entity == "combobox_item":
+                items = builder(obj, obj.header_column_id not in inactive_columns)
+            else:
+                items = builder(obj)
+            for lang, suggestion in items:
+                yield lang, (entity, obj.id), suggestion
+
+
+autocomplete_index = AutocompleteIndex()
+
+
+def build_autocomplete_index() -> None:
+    """Load every title into the index (run at startup)"""
+    with session.SessionLocal() as db:
+        autocomplete_index.rebuild(_iter_all(db))
+
+
+def _reindex(db: Session, entity: str, entity_id: int) -> None:
+    model, builder = _ITEM_BUILDERS[entity]
+    obj = db.get(model, entity_id)
+    if obj is None:
+        autocomplete_index.replace((entity, entity_id), [])
+        return
+    if entity == "combobox_item":
+        column = db.get(HeaderColumn, obj.header_column_id)
+        items = builder(obj, bool(column and column.is_active))
+    else:
+        items = builder(obj)
+    autocomplete_index.replace((entity, entity_id), list(items))
+    if entity == "header_column":
+        # Activating or hiding a column shows or hides its dropdown items
+        for item in obj.combobox_items:
+            _reindex(db, "combobox_item", item.id)
+
+
+@on_remote_content_change
+@on_content_change
+def patch_autocomplete_index(changes: List[ContentChange]) -> None:
+    """Patch the entries of the rows touched by a committed write"""
+    if not autocomplete_index.ready:
+        return
+    latest = {(change.entity, change.entity_id): change for change in changes}
+    with session.SessionLocal() as db:
+        for (entity, entity_id), change in latest.items():
+            if change.op == "delete":
+                autocomplete_index.replace((entity, entity_id), [])
+            else:
+                _reindex(db, entity, entity_id)
@@ -0,0 +1,332 @@
+# Search index backends
+#
+# Every backend stores pre-folded text (see app.search.text), so diacritic and
+# Turkish dotless-i folding behave the same on SQLite, PostgreSQL and in memory.
+import math
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+TITLE_WEIGHT = 5.0
+INSERT_BATCH = 1000  # rows per executemany while (re)building an index
+PATCH_SORTED_TERMS_MAX = 256  # vocabulary changes patched in with bisect; more re-sort it
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    entity: str
+    entity_id: int
+    lang: str
+    title: str  # folded
+    body: str  # folded
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    entity: str
+    entity_id: int
+    score: float
+
+
+def _row_batches(documents: Iterable[SearchDocument]) -> Iterator[List[dict]]:
+    """Consume documents into parameter lists of at most INSERT_BATCH rows"""
+    documents = iter(documents)
+    while True:
+        rows = [
+            {"entity": d.entity, "entity_id": d.entity_id, "lang": d.lang, "title": d.title, "body": d.body}
+            for d in islice(documents, INSERT_BATCH)
+        ]
+        if not rows:
+            return
+        yield rows
+
+
+def _transaction(engine: Engine, connection: Optional[Connection]):
+    # A caller's connection is already in its transaction; it commits it
+    return nullcontext(connection) if connection is not None else engine.begin()
+
+
+class SearchBackend:
+    """Interface shared by the search index implementations"""
+
+    name = "base"
+
+    def ensure_schema(self) -> None:
+        pass
+
+    def document_count(self) -> int:
+        raise NotImplementedError
+
+    def rebuild(self, documents: Iterable[SearchDocument], connection: Optional[Connection] = None) -> None:
+        """Replace the whole index; SQL backends write over connection when given"""
+        raise NotImplementedError
+
+    def replace(self, entity: str, entity_id: int, documents: List[SearchDocument]) -> None:
+        """Replace every indexed language of one entity"""
+        raise NotImplementedError
+
+    def remove(self, entity: str, entity_id: int) -> None:
+        self.replace(entity, entity_id, [])
+
+    def search(self, terms: List[str], lang: str, limit: int) -> List[SearchHit]:
+        """Rank entities matching all terms; the last term matches as a prefix"""
+        raise NotImplementedError
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """SQLite FTS5 virtual table ranked with bm25()"""
+
+    name = "sqlite_fts5"
+
+    def __init__(self, engine: Engine, write_engine: Optional[Engine] = None):
+        self.engine = engine
+        self.write_engine = write_engine or engine
+
+    def ensure_schema(self) -> None:
+        with self.write_engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+                "entity UNINDEXED, entity_id UNINDEXED, lang UNINDEXED, title, body, "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+
+    def document_count(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.exec_driver_sql("SELECT count(*) FROM search_index").scalar_one()
+
+    def _insert(self, conn, documents: Iterable[SearchDocument]) -> None:
+        for rows in _row_batches(documents):
+            conn.execute(
+                text(
+                    "INSERT INTO search_index (entity, entity_id, lang, title, body) "
+                    "VALUES (:entity, :entity_id, :lang, :title, :body)"
+                ),
+                rows,
+            )
+
+    def rebuild(self, documents: Iterable[SearchDocument], connection: Optional[Connection] = None) -> None:
+        with _transaction(self.write_engine, connection) as conn:
+            conn.exec_driver_sql("DELETE FROM search_index")
+            self._insert(conn, documents)
+
+    def replace(self, entity: str, entity_id: int, documents: List[SearchDocument]) -> None:
+        with self.write_engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM search_index WHERE entity = :entity AND entity_id = :entity_id"),
+                {"entity": entity, "entity_id": entity_id},
+            )
+            self._insert(conn, documents)
+
+    @staticmethod
+    def _match_expression(terms: List[str]) -> str:
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += "*"
+        return " ".join(quoted)
+
+    def search(self, terms: List[str], lang: str, limit: int) -> List[SearchHit]:
+        if not terms:
+            return []
+        # bm25() weights follow column order: entity, entity_id, lang, title, body
+        sql = text(
+            "SELECT entity, entity_id, bm25(search_index, 0, 0, 0, :title_weight, 1.0) AS score "
+            "FROM search_index WHERE search_index MATCH :match AND lang = :lang "
+            "ORDER BY score LIMIT :limit"
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                sql,
+                {"title_weight": TITLE_WEIGHT, "match": self._match_expression(terms), "lang": lang, "limit": limit},
+            ).all()
+        # bm25() is negative, lower is better
+        return [SearchHit(entity, int(entity_id), -score) for entity, entity_id, score in rows]
+
+
+class PostgresFTSBackend(SearchBackend):
+    """tsvector column with a GIN index, ranked with ts_rank_cd()"""
+
+    name = "postgres_tsvector"
+
+    def __init__(self, engine: Engine, write_engine: Optional[Engine] = None):
+        self.engine = engine
+        self.write_engine = write_engine or engine
+
+    def ensure_schema(self) -> None:
+        with self.write_engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE TABLE IF NOT EXISTS search_documents ("
+                "entity VARCHAR(50) NOT NULL, entity_id INTEGER NOT NULL, lang VARCHAR(5) NOT NULL, "
+                "title TEXT NOT NULL, body TEXT NOT NULL, "
+                "tsv TSVECTOR GENERATED ALWAYS AS ("
+                "setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')"
+                ") STORED, PRIMARY KEY (entity, entity_id, lang))"
+            )
+            conn.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS ix_search_documents_tsv ON search_documents USING GIN (tsv)"
+            )
+
+    def document_count(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.exec_driver_sql("SELECT count(*) FROM search_documents").scalar_one()
+
+    def _insert(self, conn, documents: Iterable[SearchDocument]) -> None:
+        for rows in _row_batches(documents):
+            conn.execute(
+                text(
+                    "INSERT INTO search_documents (entity, entity_id, lang, title, body) "
+                    "VALUES (:entity, :entity_id, :lang, :title, :body)"
+                ),
+                rows,
+            )
+
+    def rebuild(self, documents: Iterable[SearchDocument], connection: Optional[Connection] = None) -> None:
+        with _transaction(self.write_engine, connection) as conn:
+            conn.exec_driver_sql("TRUNCATE search_documents")
+            self._insert(conn, documents)
+
+    def replace(self, entity: str, entity_id: int, documents: List[SearchDocument]) -> None:
+        with self.write_engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM search_documents WHERE entity = :entity AND entity_id = :entity_id"),
+                {"entity": entity, "entity_id": entity_id},
+            )
+            self._insert(conn, documents)
+
+    def search(self, terms: List[str], lang: str, limit: int) -> List[SearchHit]:
+        if not terms:
+            return []
+        query = " & ".join(terms[:-1] + [terms[-1] + ":*"])
+        sql = text(
+            "SELECT entity, entity_id, ts_rank_cd(tsv, to_tsquery('simple', :query)) AS rank "
+            "FROM search_documents WHERE lang = :lang AND tsv @@ to_tsquery('simple', :query) "
+            "ORDER BY rank DESC LIMIT :limit"
+        )
+        with self.engine.connect() as conn:
+            rows = conn.execute(sql, {"query": query, "lang": lang, "limit": limit}).all()
+        return [SearchHit(entity, int(entity_id), float(rank)) for entity, entity_id, rank in rows]
+
+
+class InMemoryBackend(SearchBackend):
+    """Per-process inverted index with BM25 ranking"""
+
+    name = "memory"
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self) -> None:
+        # term -> {doc key -> weighted term frequency}
+        self._postings: Dict[str, Dict[Tuple[str, int, str], float]] = defaultdict(dict)
+        self._doc_terms: Dict[Tuple[str, int, str], List[str]] = {}
+        self._doc_lengths: Dict[Tuple[str, int, str], float] = {}
+        self._entity_docs: Dict[Tuple[str, int], List[Tuple[str, int, str]]] = defaultdict(list)
+        self._total_length = 0.0  # sum of _doc_lengths, for the average in search()
+        # Vocabulary for prefix lookups, sorted on first use; later writes only
+        # record their new and vanished terms, merged in by the next lookup
+        self._sorted_terms: Optional[List[str]] = None
+        self._added_terms: Set[str] = set()
+        self._removed_terms: Set[str] = set()
+
+    def document_count(self) -> int:
+        return len(self._doc_lengths)
+
+    def _add(self, document: SearchDocument) -> None:
+        key = (document.entity, document.entity_id, document.lang)
+        frequencies: Dict[str, float] = defaultdict(float)
+        for term in document.title.split():
+            frequencies[term] += TITLE_WEIGHT
+        for term in document.body.split():
+            frequencies[term] += 1.0
+        for term, frequency in frequencies.items():
+            if term not in self._postings and self._sorted_terms is not None:
+                if term in self._removed_terms:
+                    self._removed_terms.discard(term)
+                else:
+                    self._added_terms.add(term)
+            self._postings[term][key] = frequency
+        self._doc_terms[key] = list(frequencies)
+        self._doc_lengths[key] = sum(frequencies.values())
+        self._entity_docs[key[:2]].append(key)
+        self._total_length += self._doc_lengths[key]
+
+    def _remove_entity(self, entity: str, entity_id: int) -> None:
+        for key in self._entity_docs.pop((entity, entity_id), ()):
+            for term in self._doc_terms.pop(key):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(key, None)
+                    if not postings:
+                        del self._postings[term]
+                        if self._sorted_terms is not None:
+                            if term in self._added_terms:
+                                self._added_terms.discard(term)
+                            else:
+                                self._removed_terms.add(term)
+            self._total_length -= self._doc_lengths.pop(key, 0.0)
+
+    def rebuild(self, documents: Iterable[SearchDocument], connection: Optional[Connection] = None) -> None:
+        with self._lock:
+            self._clear()
+            for document in documents:
+                self._add(document)
+
+    def replace(self, entity: str, entity_id: int, documents: List[SearchDocument]) -> None:
+        with self._lock:
+            self._remove_entity(entity, entity_id)
+            for document in documents:
+                self._add(document)
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        elif len(self._added_terms) + len(self._removed_terms) > PATCH_SORTED_TERMS_MAX:
+            self._sorted_terms = sorted(self._postings)
+        else:
+            for term in self._removed_terms:
+                del self._sorted_terms[bisect_left(self._sorted_terms, term)]
+            for term in self._added_terms:
+                insort(self._sorted_terms, term)
+        self._added_terms.clear()
+        self._removed_terms.clear()
+        terms = self._sorted_terms
+        start = bisect_left(terms, prefix)
+        end = start
+        while end < len(terms) and terms[end].startswith(prefix):
+            end += 1
+        return terms[start:end]
+
+    def search(self, terms: List[str], lang: str, limit: int) -> List[SearchHit]:
+        if not terms:
+            return []
+        with self._lock:
+            total_docs = len(self._doc_lengths) or 1
+            avg_length = (self._total_length / total_docs) or 1.0
+            scores: Optional[Dict[Tuple[str, int, str], float]] = None
+            for position, term in enumerate(terms):
+                expanded = self._expand_prefix(term) if position == len(terms) - 1 else [term]
+                term_scores: Dict[Tuple[str, int, str], float] = defaultdict(float)
+                for expanded_term in expanded:
+                    postings = self._postings.get(expanded_term, {})
+                    idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for key, frequency in postings.items():
+                        if key[2] != lang:
+                            continue
+                        norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[key] / avg_length)
+                        term_scores[key] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+                if scores is None:
+                    scores = dict(term_scores)
+                else:
+                    scores = {key: score + term_scores[key] for key, score in scores.items() if key in term_scores}
+                if not scores:
+                    return []
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [SearchHit(key[0], key[1], score) for key, score in ranked]
@@ -0,0 +1,211 @@
+"""
+Search index maintenance
+
+Builds search documents from blog posts and services, picks the backend for
+the configured database and keeps the index current through content change
+notifications.
+
+Usage: python -m app.search.index --rebuild
+"""
+
+import argparse
+import logging
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.events import ContentChange, on_content_change, on_remote_content_change
+from app.db import session
+from app.models.blog import BlogPost
+from app.models.service import Service
+from app.search.backends import (
+    InMemoryBackend,
+    PostgresFTSBackend,
+    SearchBackend,
+    SearchDocument,
+    SQLiteFTSBackend,
+)
+from app.search.text import tokenize
+
+logger = logging.getLogger(__name__)
+
+BLOG_LANGUAGES = ("tr", "en", "fr")
+SERVICE_LANGUAGES = ("tr", "en")
+SEARCH_LANGUAGES = BLOG_LANGUAGES
+
+
+def _document(entity: str, entity_id: int, lang: str, title: Optional[str], *body_parts: Optional[str]):
+    body = " ".join(part for part in body_parts if part)
+    if not title and not body:
+        return None
+    return SearchDocument(
+        entity=entity,
+        entity_id=entity_id,
+        lang=lang,
+        title=" ".join(tokenize(title or "")),
+        body=" ".join(tokenize(body)),
+    )
+
+
+def blog_post_documents(post: BlogPost) -> List[SearchDocument]:
+    """Per-language documents of a published blog post"""
+    if post.published_date is None:
+        return []
+    documents = [
+        _document(
+            "blog_post",
+            post.id,
+            lang,
+            getattr(post, f"title_{lang}"),
+            getattr(post, f"description_{lang}"),
+            getattr(post, f"content_{lang}"),
+        )
+        for lang in BLOG_LANGUAGES
+    ]
+    return [document for document in documents if document is not None]
+
+
+def service_documents(service: Service) -> List[SearchDocument]:
+    """Per-language documents of an active service"""
+    if not service.is_active:
+        return []
+    documents = [
+        _document(
+            "service",
+            service.id,
+            lang,
+            getattr(service, f"title_{lang}"),
+            getattr(service, f"description_{lang}"),
+            getattr(service, f"content_{lang}"),
+        )
+        for lang in SERVICE_LANGUAGES
+    ]
+    return [document for document in documents if document is not None]
+
+
+def iter_all_documents(db: Session, batch_size: int = 500) -> Iterator[SearchDocument]:
+    """Stream documents for every searchable row"""
+    # select() rather than db.query(): legacy Query results are uniqued for
+    # models with JSON columns, which yield_per does not allow
+    posts = select(BlogPost).where(BlogPost.published_date.isnot(None)).execution_options(yield_per=batch_size)
+    for post in db.scalars(posts):
+        yield from blog_post_documents(post)
+    services = select(Service).where(Service.is_active == True).execution_options(yield_per=batch_size)  # noqa: E712
+    for service in db.scalars(services):
+        yield from service_documents(service)
+
+
+_backend: Optional[SearchBackend] = None
+_backend_lock = threading.Lock()
+
+
+def _create_backend() -> SearchBackend:
+    choice = settings.search_backend
+    if choice == "auto":
+        choice = {"sqlite": "sqlite", "postgresql": "postgres"}.get(session.engine.dialect.name, "memory")
+    if choice == "sqlite":
+        backend = SQLiteFTSBackend(session.engine, session.write_engine)
+    elif choice == "postgres":
+        backend = PostgresFTSBackend(session.engine, session.write_engine)
+    else:
+        backend = InMemoryBackend()
+    try:
+        backend.ensure_schema()
+    except Exception:
+        if settings.search_backend != "auto":
+            raise
+        # e.g. SQLite built without FTS5
+        logger.warning("Search backend %s unavailable, using the in-memory index", backend.name, exc_info=True)
+        backend = InMemoryBackend()
+    return backend
+
+
+def get_search_backend() -> SearchBackend:
+    """Return the process-wide search backend"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _create_backend()
+    return _backend
+
+
+def rebuild_search_index() -> int:
+    """Re-index every searchable row and return the number of documents
+
+    Documents stream from the database into the backend in batches, so the
+    corpus is never held in memory at once.
+    """
+    backend = get_search_backend()
+    if isinstance(backend, InMemoryBackend):
+        with session.SessionLocal() as db:
+            backend.rebuild(iter_all_documents(db))
+    else:
+        # Read over the connection that writes the index: with a rollback
+        # journal, SQLite lets no other connection read once the write spills
+        with session.write_engine.begin() as connection, Session(bind=connection) as db:
+            backend.rebuild(iter_all_documents(db), connection)
+    return backend.document_count()
+
+
+def init_search_index() -> None:
+    """Build the index if it is empty (always the case for the in-memory backend)"""
+    backend = get_search_backend()
+    if backend.document_count() == 0:
+        count = rebuild_search_index()
+        logger.info("Search index (%s) built with %d documents", backend.name, count)
+
+
+def _latest_changes(changes: List[ContentChange]) -> Dict[Tuple[str, int], ContentChange]:
+    latest: Dict[Tuple[str, int], ContentChange] = {}
+    for change in changes:
+        if change.entity in ("blog_post", "service"):
+            latest[(change.entity, change.entity_id)] = change
+    return latest
+
+
+@on_content_change
+def update_search_index(changes: List[ContentChange]) -> None:
+    """Re-index only the posts and services touched by a committed write"""
+    latest = _latest_changes(changes)
+    if not latest or _backend is None:
+        return
+    backend = _backend
+    with session.SessionLocal() as db:
+        for (entity, entity_id), change in latest.items():
+            if change.op == "delete":
+                backend.remove(entity, entity_id)
+                continue
+            if entity == "blog_post":
+                post = db.get(BlogPost, entity_id)
+                documents = blog_post_documents(post) if post else []
+            else:
+                service = db.get(Service, entity_id)
+                documents = service_documents(service) if service else []
+            backend.replace(entity, entity_id, documents)
+
+
+@on_remote_content_change
+def replay_memory_search_index(changes: List[ContentChange]) -> None:
+    """Apply other workers' writes to a process-local in-memory index (database indexes are shared)"""
+    if _backend is not None and _backend.name == "memory":
+        update_search_index(changes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the search index")
+    parser.add_argument("--rebuild", action="store_true", help="re-index every blog post and service")
+    args = parser.parse_args()
+    backend = get_search_backend()
+    if args.rebuild:
+        count = rebuild_search_index()
+        print(f"Indexed {count} documents with {backend.name}")
+    else:
+        print(f"{backend.name}: {backend.document_count()} documents")
+
+
+if __name__ == "__main__":
+    main()
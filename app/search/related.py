@@ -0,0 +1,255 @@
+"""
+Related blog posts
+
+Builds per-language TF-IDF vectors of the published posts, finds the top-k
+cosine neighbours of every post with batched sparse matrix products and
+stores them in the related_posts table. The job runs offline or on a
+background thread; a changed post only recomputes its own list and the lists
+it enters or leaves.
+
+Usage: python -m app.search.related --rebuild
+"""
+
+import argparse
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, insert, select
+
+from app.db.events import ContentChange, on_content_change, on_remote_content_change
+from app.db import session
+from app.models.blog import BlogPost, RelatedPost
+from app.search.text import tokenize
+
+if TYPE_CHECKING:
+    from app.search.tfidf import LanguageModel
+
+logger = logging.getLogger(__name__)
+
+RELATED_LANGUAGES = ("tr", "en", "fr")
+RELATED_COUNT = 5
+TITLE_REPEAT = 3  # title terms count as much as three body occurrences
+IN_CHUNK = 500
+
+
+def post_tokens(post, lang: str) -> List[str]:
+    """Tokens of one language of a post, empty if it has no text in that language"""
+    title = getattr(post, f"title_{lang}") or ""
+    body = " ".join(
+        part for part in (getattr(post, f"description_{lang}"), getattr(post, f"content_{lang}")) if part
+    )
+    tokens = [token for token in tokenize(title) if len(token) > 1] * TITLE_REPEAT
+    tokens.extend(token for token in tokenize(body) if len(token) > 1)
+    return tokens
+
+
+def _documents(lang: str, post_ids: Optional[List[int]] = None) -> Iterator[Tuple[int, List[str]]]:
+    """(post id, tokens) of the published posts with text in the language"""
+    columns = [getattr(BlogPost, f"{field}_{lang}") for field in ("title", "description", "content")]
+    with session.SessionLocal() as db:
+        query = select(BlogPost.id, *columns).where(BlogPost.published_date.isnot(None))
+        if post_ids is not None:
+            query = query.where(BlogPost.id.in_(post_ids))
+        for post in db.execute(query.order_by(BlogPost.id).execution_options(yield_per=500)):
+            tokens = post_tokens(post, lang)
+            if tokens:
+                yield post.id, tokens
+
+
+def _store(lang: str, neighbours: Dict[int, List[tuple]]) -> None:
+    """Replace the stored lists of the given posts"""
+    if not neighbours:
+        return
+    table = RelatedPost.__table__
+    post_ids = list(neighbours)
+    rows = [
+        {"post_id": post_id, "lang": lang, "rank": rank, "related_post_id": related_id, "score": score}
+        for post_id, related in neighbours.items()
+        for rank, (related_id, score) in enumerate(related)
+    ]
+    with session.write_engine.begin() as conn:
+        for start in range(0, len(post_ids), IN_CHUNK):
+            conn.execute(
+                delete(table).where(table.c.lang == lang, table.c.post_id.in_(post_ids[start:start + IN_CHUNK]))
+            )
+        if rows:
+            conn.execute(insert(table), rows)
+
+
+_models: Dict[str, "LanguageModel"] = {}
+
+
+def rebuild_related_posts() -> int:
+    """Recompute every related post list and return the number of lists stored"""
+    from app.search.tfidf import LanguageModel
+
+    stored = 0
+    for lang in RELATED_LANGUAGES:
+        with session.write_engine.begin() as conn:
+            conn.execute(delete(RelatedPost.__table__).where(RelatedPost.__table__.c.lang == lang))
+        model = LanguageModel.fit(_documents(lang))
+        if not model.size:
+            _models.pop(lang, None)
+            continue
+        _models[lang] = model
+        neighbours = model.top_k(model.post_ids, RELATED_COUNT)
+        _store(lang, neighbours)
+        stored += len(neighbours)
+    return stored
+
+
+def _model(lang: str) -> Optional["LanguageModel"]:
+    # Worker processes that did not run the full build fit the model once;
+    # stored neighbours are left as they are.
+    from app.search.tfidf import LanguageModel
+
+    model = _models.get(lang)
+    if model is None:
+        model = LanguageModel.fit(_documents(lang))
+        if not model.size:
+            return None
+        _models[lang] = model
+    return model
+
+
+def _affected_posts(lang: str, post_id: int, similar: Optional[Dict[int, float]]) -> Set[int]:
+    """Posts whose stored list contains post_id or would now include it"""
+    table = RelatedPost.__table__
+    with session.SessionLocal() as db:
+        affected = {
+            row_post_id
+            for (row_post_id,) in db.execute(
+                select(table.c.post_id).where(table.c.related_post_id == post_id, table.c.lang == lang)
+            )
+        }
+        if similar is None:
+            return affected
+        candidates = list(similar)
+        for start in range(0, len(candidates), IN_CHUNK):
+            chunk = candidates[start:start + IN_CHUNK]
+            lowest = dict(
+                (row_post_id, (weakest, count))
+                for row_post_id, weakest, count in db.execute(
+                    select(table.c.post_id, func.min(table.c.score), func.count())
+                    .where(table.c.lang == lang, table.c.post_id.in_(chunk))
+                    .group_by(table.c.post_id)
+                )
+            )
+            for candidate in chunk:
+                weakest, count = lowest.get(candidate, (0.0, 0))
+                if count < RELATED_COUNT or similar[candidate] > weakest:
+                    affected.add(candidate)
+    return affected
+
+
+def _apply_changes(model: "LanguageModel", post_ids: List[int], documents: Dict[int, List[str]]) -> None:
+    for post_id in post_ids:
+        tokens = documents.get(post_id)
+        if tokens:
+            model.upsert(post_id, tokens)
+        else:
+            # Deleted, unpublished or no longer written in this language
+            model.remove(post_id)
+
+
+def update_related_posts(post_ids: List[int]) -> None:
+    """Recompute the lists affected by changes to the given posts"""
+    from app.search.tfidf import LanguageModel
+
+    for lang in RELATED_LANGUAGES:
+        model = _model(lang)
+        documents = dict(_documents(lang, post_ids))
+        if model is None:
+            if not documents:
+                continue
+            model = _models[lang] = LanguageModel.fit(documents.items())
+        _apply_changes(model, post_ids, documents)
+        affected: Set[int] = set()
+        for post_id in post_ids:
+            if post_id in model:
+                affected |= _affected_posts(lang, post_id, model.similarities(post_id)) | {post_id}
+            else:
+                affected |= _affected_posts(lang, post_id, None)
+        _store(lang, {post_id: [] for post_id in post_ids if post_id not in model})
+        # One top_k for the whole batch merges the changed vectors into the matrix once
+        _store(lang, model.top_k(affected, RELATED_COUNT))
+
+
+def refresh_related_models(post_ids: List[int]) -> None:
+    """Apply posts changed by another process to this process's models
+
+    The writing process stored the lists; this only keeps the local models
+    from writing lists computed without those changes on the next local edit.
+    """
+    for lang in RELATED_LANGUAGES:
+        model = _models.get(lang)
+        if model is not None:  # otherwise fitted from the database when first needed
+            _apply_changes(model, post_ids, dict(_documents(lang, post_ids)))
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _submit(job, *args) -> Future:
+    # One worker keeps the models single-threaded and writes in order
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="related-posts")
+    future = _executor.submit(job, *args)
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def _log_failure(future: Future) -> None:
+    if future.exception() is not None:
+        logger.error("Related posts job failed", exc_info=future.exception())
+
+
+def _build_if_empty() -> None:
+    with session.SessionLocal() as db:
+        if db.query(RelatedPost).first() is not None:
+            return
+    count = rebuild_related_posts()
+    logger.info("Related posts built for %d post languages", count)
+
+
+def schedule_related_posts_build() -> Future:
+    """Build the related post lists in the background if none are stored (run at startup)"""
+    return _submit(_build_if_empty)
+
+
+def wait_for_related_posts() -> None:
+    """Block until queued related post jobs have finished"""
+    _submit(lambda: None).result()
+
+
+@on_content_change
+def queue_related_posts_update(changes: List[ContentChange]) -> None:
+    """Recompute the lists touched by committed blog post writes in the background"""
+    post_ids = sorted({change.entity_id for change in changes if change.entity == "blog_post"})
+    if post_ids:
+        _submit(update_related_posts, post_ids)
+
+
+@on_remote_content_change
+def queue_related_models_refresh(changes: List[ContentChange]) -> None:
+    """Bring the local models up to date with blog post writes of other processes"""
+    post_ids = sorted({change.entity_id for change in changes if change.entity == "blog_post"})
+    if post_ids:
+        _submit(refresh_related_models, post_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the related blog posts table")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every related post list")
+    args = parser.parse_args()
+    if args.rebuild:
+        print(f"Stored related posts for {rebuild_related_posts()} post languages")
+    else:
+        with session.SessionLocal() as db:
+            print(f"{db.query(RelatedPost).count()} related post rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Text normalization shared by every search backend
+import re
+import unicodedata
+from typing import List, Tuple
+
+# Turkish letters that Unicode decomposition does not fold to ASCII
+_TURKISH_FOLD = str.maketrans({"ı": "i", "İ": "i", "I": "i"})
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fold_char(char: str) -> str:
+    char = char.translate(_TURKISH_FOLD).casefold()
+    decomposed = unicodedata.normalize("NFKD", char)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+class _FoldTable(dict):
+    """str.translate table filled with each code point's folding on first use"""
+
+    def __missing__(self, codepoint: int) -> str:
+        folded = self[codepoint] = _fold_char(chr(codepoint))
+        return folded
+
+
+_FOLD_TABLE = _FoldTable()
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip diacritics, so "Saç Ekimi" matches "sac ekimi" """
+    if text.isascii():
+        return text.lower()
+    return text.translate(_FOLD_TABLE)
+
+
+def fold_with_offsets(text: str) -> Tuple[str, List[int]]:
+    """Fold text and map every folded character back to its original index"""
+    folded: List[str] = []
+    offsets: List[int] = []
+    for index, char in enumerate(text):
+        piece = _FOLD_TABLE[ord(char)]
+        folded.append(piece)
+        offsets.extend([index] * len(piece))
+    return "".join(folded), offsets
+
+
+def tokenize(text: str) -> List[str]:
+    """Split folded text into search terms"""
+    return _TOKEN_RE.findall(fold(text))
+
+
+def make_snippet(text: str, terms: List[str], width: int = 160) -> str:
+    """Cut a window of text around the first matching term and mark the matches"""
+    if not text:
+        return ""
+    folded, offsets = fold_with_offsets(text)
+    first = None
+    for term in terms:
+        match = re.search(r"\b" + re.escape(term), folded)
+        if match and (first is None or match.start() < first):
+            first = match.start()
+    if first is None:
+        return text[:width] + ("…" if len(text) > width else "")
+
+    start = max(0, offsets[first] - width // 3)
+    end = min(len(text), start + width)
+    window = text[start:end]
+
+    folded_window, window_offsets = fold_with_offsets(window)
+    spans = []
+    for term in terms:
+        for match in re.finditer(r"\b" + re.escape(term) + r"\w*", folded_window):
+            spans.append((window_offsets[match.start()], window_offsets[match.end() - 1] + 1))
+    marked, cursor = [], 0
+    for span_start, span_end in sorted(spans):
+        if span_start < cursor:
+            continue
+        marked.append(window[cursor:span_start])
+        marked.append(f"<mark>{window[span_start:span_end]}</mark>")
+        cursor = span_end
+    marked.append(window[cursor:])
+
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(text) else ""
+    return prefix + "".join(marked) + suffix
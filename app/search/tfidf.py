@@ -0,0 +1,177 @@
+# TF-IDF vectors for the related posts job
+#
+# Kept apart from app.search.related so numpy and scipy are only imported
+# when the job first runs, not when the app starts.
+import math
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+# Upper bound on the memory of one similarity block: the dense query vectors
+# of the batch, their scores against every post and the partition indices
+BLOCK_BYTES = 64 * 1024 * 1024
+
+
+def _term_counts(tokens: List[str]) -> Dict[str, int]:
+    return Counter(tokens)
+
+
+def _normalize_rows(matrix: sp.csr_matrix) -> sp.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sp.csr_matrix(sp.diags(1.0 / norms) @ matrix, dtype=np.float32)
+
+
+@dataclass
+class LanguageModel:
+    """TF-IDF matrix of one language; rows follow post_ids
+
+    Changed posts are vectorized with the document frequencies at the time of
+    the change, so older rows keep slightly stale IDF weights until the next
+    full rebuild. Their vectors wait in ``changed`` and are merged into the
+    matrix by the next top_k, so a batch of edits rebuilds the matrix once.
+    """
+
+    vocabulary: Dict[str, int]
+    df: np.ndarray  # documents containing each term
+    matrix: sp.csr_matrix
+    post_ids: List[int]
+
+    def __post_init__(self):
+        self.rows = {post_id: row for row, post_id in enumerate(self.post_ids)}
+        # post id -> new vector, or None once removed; not merged into the matrix yet
+        self.changed: Dict[int, Optional[sp.csr_matrix]] = {}
+        self.size = len(self.post_ids)  # posts in the model, changes included
+
+    @classmethod
+    def fit(cls, documents: Iterable[Tuple[int, List[str]]]) -> "LanguageModel":
+        """Fit the vocabulary and IDF weights and vectorize every (post id, tokens) document
+
+        Documents are consumed one at a time into compact arrays, so only the
+        current document's tokens are held as Python objects.
+        """
+        post_ids: List[int] = []
+        vocabulary: Dict[str, int] = {}
+        indptr, cols, values = array("i", [0]), array("i"), array("f")
+        for post_id, tokens in documents:
+            for term, count in _term_counts(tokens).items():
+                cols.append(vocabulary.setdefault(term, len(vocabulary)))
+                values.append(1.0 + math.log(count))
+            post_ids.append(post_id)
+            indptr.append(len(cols))
+        cols_array = np.frombuffer(cols, dtype=np.int32)
+        tf = sp.csr_matrix(
+            (np.frombuffer(values, dtype=np.float32), cols_array, np.frombuffer(indptr, dtype=np.int32)),
+            shape=(len(post_ids), len(vocabulary)),
+        )
+        df = np.bincount(cols_array, minlength=len(vocabulary))
+        idf = (np.log((1 + len(post_ids)) / (1 + df)) + 1.0).astype(np.float32)
+        return cls(vocabulary, df, _normalize_rows(tf @ sp.diags(idf)), post_ids)
+
+    def _grow(self, terms: Iterable[str]) -> None:
+        new_terms = [term for term in terms if term not in self.vocabulary]
+        if not new_terms:
+            return
+        for term in new_terms:
+            self.vocabulary[term] = len(self.vocabulary)
+        self.df = np.concatenate([self.df, np.zeros(len(new_terms), dtype=self.df.dtype)])
+        shape = (self.matrix.shape[0], len(self.vocabulary))
+        self.matrix.resize(shape)  # only widens the shape of a CSR matrix
+        for vector in self.changed.values():
+            if vector is not None:
+                vector.resize((1, shape[1]))
+
+    def _vector(self, post_id: int) -> Optional[sp.csr_matrix]:
+        if post_id in self.changed:
+            return self.changed[post_id]
+        row = self.rows.get(post_id)
+        return None if row is None else self.matrix[row]
+
+    def __contains__(self, post_id: int) -> bool:
+        return self._vector(post_id) is not None
+
+    def upsert(self, post_id: int, tokens: List[str]) -> None:
+        """Add or replace the vector of one post"""
+        counts = _term_counts(tokens)
+        self._grow(counts)
+        previous = self._vector(post_id)
+        if previous is not None:
+            self.df[previous.indices] -= 1
+        else:
+            self.size += 1
+        cols = np.array([self.vocabulary[term] for term in counts], dtype=np.int64)
+        self.df[cols] += 1
+        idf = np.log((1 + self.size) / (1 + self.df[cols])) + 1.0
+        values = (1.0 + np.log(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))) * idf
+        self.changed[post_id] = _normalize_rows(
+            sp.csr_matrix((values, (np.zeros(len(cols), dtype=np.int64), cols)), shape=(1, len(self.vocabulary)))
+        )
+
+    def remove(self, post_id: int) -> None:
+        previous = self._vector(post_id)
+        if previous is None:
+            return
+        self.df[previous.indices] -= 1
+        self.size -= 1
+        if post_id in self.rows:
+            self.changed[post_id] = None
+        else:
+            del self.changed[post_id]  # added and removed again before a merge
+
+    def _merge(self) -> None:
+        """Rebuild the matrix with the pending changes, in one pass"""
+        if not self.changed:
+            return
+        keep = np.array([row for row, post_id in enumerate(self.post_ids) if post_id not in self.changed], dtype=np.int64)
+        added = [(post_id, vector) for post_id, vector in self.changed.items() if vector is not None]
+        self.matrix = sp.vstack([self.matrix[keep]] + [vector for _, vector in added], format="csr")
+        self.post_ids = [self.post_ids[row] for row in keep] + [post_id for post_id, _ in added]
+        self.rows = {post_id: row for row, post_id in enumerate(self.post_ids)}
+        self.changed = {}
+
+    def similarities(self, post_id: int) -> Dict[int, float]:
+        """Posts with a positive cosine similarity to one post, the post itself left out"""
+        vector = self._vector(post_id)
+        scores = (self.matrix @ vector.T.toarray()).ravel()
+        similar = {self.post_ids[row]: float(scores[row]) for row in np.flatnonzero(scores > 0)}
+        for other, other_vector in self.changed.items():
+            similar.pop(other, None)
+            if other_vector is not None:
+                score = float(other_vector.multiply(vector).sum())
+                if score > 0:
+                    similar[other] = score
+        similar.pop(post_id, None)
+        return similar
+
+    def top_k(self, post_ids: Iterable[int], k: int) -> Dict[int, List[tuple]]:
+        """Top-k (post id, score) neighbours of each post, one block product per batch"""
+        self._merge()
+        targets = [post_id for post_id in post_ids if post_id in self.rows]
+        total = len(self.post_ids)
+        neighbours: Dict[int, List[tuple]] = {post_id: [] for post_id in targets}
+        if total < 2 or not targets:
+            return neighbours
+        k = min(k, total - 1)
+        # Per batch member: its dense vector, and per post two float32 scores
+        # (product and contiguous transpose) and an int64 partition index
+        batch_size = max(1, BLOCK_BYTES // (4 * self.matrix.shape[1] + 16 * total))
+        for start in range(0, len(targets), batch_size):
+            batch = targets[start:start + batch_size]
+            batch_rows = np.array([self.rows[post_id] for post_id in batch])
+            columns = np.arange(len(batch))
+            # Sparse x dense: the scores are mostly non-zero, and a sparse
+            # product would spend its time indexing every one of them
+            scores = np.ascontiguousarray((self.matrix @ self.matrix[batch_rows].T.toarray()).T)  # batch x posts
+            scores[columns, batch_rows] = -1.0  # a post is not related to itself
+            candidates = np.argpartition(scores, -k, axis=1)[:, -k:]
+            for index, post_id in enumerate(batch):
+                best = scores[index, candidates[index]]
+                for position in np.argsort(-best):
+                    score = float(best[position])
+                    if score > 0:
+                        neighbours[post_id].append((self.post_ids[candidates[index][position]], score))
+        return neighbours
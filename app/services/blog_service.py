@@ -1,9 +1,10 @@
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
+from app.core.singleflight import blog_flights, coalesced
 from app.services.base_service import BaseService
 from app.repositories.blog_repository import BlogRepository
 from app.models.blog import BlogPost
-from app.schemas.blog import BlogPostCreate, BlogPostUpdate
+from app.schemas.blog import BlogPostCreate, BlogPostDetail, BlogPostUpdate, RelatedPostSummary
 from app.exceptions.custom_exceptions import (
     BlogPostNotFoundError, 
     BlogPostSlugExistsError,
@@ -41,11 +42,33 @@ class BlogService(BaseService[BlogPost, BlogRepository]):
             raise BlogPostNotFoundError(slug)
         return post
     
+    @coalesced(blog_flights, lambda self, slug, lang: (self.repository.db.get_bind(), slug, lang))
+    def get_post_detail(self, slug: str, lang: str) -> BlogPostDetail:
+        """Get a blog post with its related posts, shared by concurrent identical requests"""
+        post = self.get_post_by_slug(slug)
+        detail = BlogPostDetail.model_validate(post)
+        detail.related_posts = [RelatedPostSummary(**related) for related in self.get_related_posts(post, lang)]
+        return detail
+    
+    def get_related_posts(self, post: BlogPost, lang: str) -> List[Dict[str, Any]]:
+        """Get the precomputed related posts of a post in one language"""
+        return [
+            {
+                "id": related.id,
+                "slug": related.slug,
+                "title": getattr(related, f"title_{lang}", None) or related.title_en,
+                "featured_image_url": related.featured_image_url,
+                "score": score,
+            }
+            for related, score in self.repository.get_related_posts(post.id, lang)
+        ]
+    
+    @coalesced(blog_flights, lambda self, page=1, size=10: (self.repository.db.get_bind(), page, size))
     def get_published_posts(self, page: int = 1, size: int = 10) -> Dict[str, Any]:
         """Get published posts with pagination"""
         skip = (page - 1) * size
         posts = self.repository.get_published_posts(skip=skip, limit=size)
-        total = self.repository.count()
+        total = self.repository.count_published()
         
         return {
             "items": posts,
@@ -0,0 +1,102 @@
+from typing import Any, List, Optional
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from app.core.cache import TaggedCache
+from app.core.compression import CompressedBody
+from app.repositories.blog_repository import BlogRepository
+from app.repositories.header_repository import HeaderColumnRepository, ComboboxItemRepository
+from app.repositories.service_repository import ServiceRepository
+from app.schemas.bootstrap import BlogPostSummary, NavigationColumn, NavigationItem, ServiceSummary
+
+# Serialized JSON fragments keyed by (fragment, lang, ...)
+fragment_cache: TaggedCache[bytes] = TaggedCache("bootstrap_fragments")
+# Assembled documents with their compressed variants, keyed by (lang, post_count)
+document_cache: TaggedCache[CompressedBody] = TaggedCache("bootstrap")
+
+_navigation_json = TypeAdapter(List[NavigationColumn])
+_services_json = TypeAdapter(List[ServiceSummary])
+_posts_json = TypeAdapter(List[BlogPostSummary])
+
+
+def _localized(obj: Any, field: str, lang: str) -> Optional[str]:
+    """Field in the requested language, falling back to English"""
+    return getattr(obj, f"{field}_{lang}", None) or getattr(obj, f"{field}_en", None)
+
+
+class BootstrapService:
+    """Assembles the first page load payload from cached per-language fragments"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_bootstrap_body(self, lang: str, post_count: int) -> CompressedBody:
+        """Get the bootstrap document as a cached, compressible response body"""
+        return document_cache.get_or_build(
+            (lang, post_count),
+            ("header_column", "combobox_item", "service", "blog_post"),
+            lambda: CompressedBody(self.get_bootstrap_json(lang, post_count)),
+        )
+
+    def get_bootstrap_json(self, lang: str, post_count: int) -> bytes:
+        """Get navigation, active services and latest posts as one JSON document"""
+        navigation = fragment_cache.get_or_build(
+            ("navigation", lang), ("header_column", "combobox_item"), lambda: self._navigation_fragment(lang)
+        )
+        services = fragment_cache.get_or_build(
+            ("services", lang), ("service",), lambda: self._services_fragment(lang)
+        )
+        posts = fragment_cache.get_or_build(
+            ("posts", lang, post_count), ("blog_post",), lambda: self._posts_fragment(lang, post_count)
+        )
+        return b"".join((
+            b'{"lang":"', lang.encode(), b'","navigation":', navigation,
+            b',"services":', services, b',"posts":', posts, b"}",
+        ))
+
+    def _navigation_fragment(self, lang: str) -> bytes:
+        columns = HeaderColumnRepository(self.db).get_active_columns()
+        items = ComboboxItemRepository(self.db).get_active_items_for_columns(
+            [column.id for column in columns if column.has_combobox]
+        )
+        items_by_column = {}
+        for item in items:
+            items_by_column.setdefault(item.header_column_id, []).append(
+                NavigationItem(slug=item.slug, name=_localized(item, "name", lang), url=item.url)
+            )
+        return _navigation_json.dump_json([
+            NavigationColumn(
+                slug=column.slug,
+                name=_localized(column, "name", lang),
+                type=column.type,
+                url=column.url,
+                items=items_by_column.get(column.id, []),
+            )
+            for column in columns
+        ])
+
+    def _services_fragment(self, lang: str) -> bytes:
+        services = ServiceRepository(self.db).get_active_services()
+        return _services_json.dump_json([
+            ServiceSummary(
+                slug=service.slug,
+                title=_localized(service, "title", lang),
+                description=_localized(service, "description", lang),
+                price=service.price,
+                duration=service.duration,
+                featured_image_url=service.featured_image_url,
+            )
+            for service in services
+        ])
+
+    def _posts_fragment(self, lang: str, post_count: int) -> bytes:
+        posts = BlogRepository(self.db).get_published_posts(skip=0, limit=post_count)
+        return _posts_json.dump_json([
+            BlogPostSummary(
+                slug=post.slug,
+                title=_localized(post, "title", lang),
+                description=_localized(post, "description", lang),
+                published_date=post.published_date,
+                featured_image_url=post.featured_image_url,
+            )
+            for post in posts
+        ])
@@ -0,0 +1,232 @@
+from datetime import datetime
+from email.utils import format_datetime
+from typing import Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+from sqlalchemy.orm import Session
+from app.core.cache import TaggedCache
+from app.core.compression import CompressedBody
+from app.core.config import settings
+from app.db.events import ContentChange, on_content_change, on_remote_content_change
+from app.models.blog import BlogPost
+from app.repositories.blog_repository import BlogRepository
+from app.repositories.service_repository import ServiceRepository
+
+SITEMAP_MAX_URLS = 50_000
+# Shards cover fixed id ranges so a write touches exactly one shard; the
+# ranges leave room for every language of every row under SITEMAP_MAX_URLS.
+BLOG_SHARD_IDS = 16_000  # up to 3 languages per post
+SERVICE_SHARD_IDS = 25_000  # up to 2 languages per service
+BATCH_SIZE = 1000
+FEED_SIZE = 50
+
+BLOG_LANGUAGES = ("tr", "en", "fr")
+SERVICE_LANGUAGES = ("tr", "en")
+
+# Rendered documents are cached with their compressed variants
+sitemap_cache: TaggedCache[CompressedBody] = TaggedCache("sitemap")
+# Shard counts and the layout, so cache hits never touch the database
+sitemap_layout_cache: TaggedCache[object] = TaggedCache("sitemap_layout")
+feed_cache: TaggedCache[CompressedBody] = TaggedCache("feeds")
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def blog_shard(post_id: int) -> int:
+    return (post_id - 1) // BLOG_SHARD_IDS
+
+
+def service_shard(service_id: int) -> int:
+    return (service_id - 1) // SERVICE_SHARD_IDS
+
+
+def _site_link(path_template: str, lang: str, slug: str) -> str:
+    return settings.site_url.rstrip("/") + path_template.format(lang=lang, slug=slug)
+
+
+def _localized(obj, field: str, lang: str) -> Optional[str]:
+    return getattr(obj, f"{field}_{lang}", None) or getattr(obj, f"{field}_en", None)
+
+
+def _url_entry(loc: str, lastmod: Optional[datetime] = None) -> str:
+    if lastmod is None:
+        return f"<url><loc>{escape(loc)}</loc></url>\n"
+    return f"<url><loc>{escape(loc)}</loc><lastmod>{lastmod.date().isoformat()}</lastmod></url>\n"
+
+
+class FeedService:
+    """Sitemaps and blog feeds rendered from keyset-paginated queries and cached per shard"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.blog_repository = BlogRepository(db)
+        self.service_repository = ServiceRepository(db)
+
+    # Sitemap
+
+    def _shard_counts(self) -> Tuple[int, int]:
+        return sitemap_layout_cache.get_or_build("shards", ("blog_post", "service"), self._count_shards)
+
+    def _count_shards(self) -> Tuple[int, int]:
+        blog_max = self.blog_repository.max_id()
+        service_max = self.service_repository.max_id()
+        return (
+            blog_shard(blog_max) + 1 if blog_max else 0,
+            service_shard(service_max) + 1 if service_max else 0,
+        )
+
+    def _blog_urls(self, shard: int) -> Iterator[str]:
+        start, end = shard * BLOG_SHARD_IDS + 1, (shard + 1) * BLOG_SHARD_IDS + 1
+        after_id = 0
+        while True:
+            posts = self.blog_repository.get_published_in_id_range(start, end, after_id, BATCH_SIZE)
+            for post in posts:
+                for lang in BLOG_LANGUAGES:
+                    if getattr(post, f"title_{lang}"):
+                        yield _url_entry(_site_link(settings.site_blog_path, lang, post.slug), post.published_date)
+            if len(posts) < BATCH_SIZE:
+                return
+            after_id = posts[-1].id
+
+    def _service_urls(self, shard: int) -> Iterator[str]:
+        start, end = shard * SERVICE_SHARD_IDS + 1, (shard + 1) * SERVICE_SHARD_IDS + 1
+        after_id = 0
+        while True:
+            services = self.service_repository.get_active_in_id_range(start, end, after_id, BATCH_SIZE)
+            for service in services:
+                for lang in SERVICE_LANGUAGES:
+                    if getattr(service, f"title_{lang}"):
+                        yield _url_entry(_site_link(settings.site_service_path, lang, service.slug))
+            if len(services) < BATCH_SIZE:
+                return
+            after_id = services[-1].id
+
+    def _shard_urls(self, name: str) -> Optional[Iterator[str]]:
+        """URLs of an existing shard; None for unknown kinds, non-canonical or out of range numbers"""
+        kind, _, number = name.rpartition("-")
+        if kind not in ("blog", "services") or not number.isdigit() or str(int(number)) != number:
+            return None
+        blog_shards, service_shards = self._shard_counts()
+        if kind == "blog":
+            return self._blog_urls(int(number)) if int(number) < blog_shards else None
+        return self._service_urls(int(number)) if int(number) < service_shards else None
+
+    @staticmethod
+    def _urlset(chunks: Iterator[str]) -> CompressedBody:
+        body = "".join(chunks)
+        return CompressedBody((
+            f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n{body}</urlset>\n'
+        ).encode())
+
+    def get_sitemap(self) -> CompressedBody:
+        """Get /sitemap.xml: one urlset while every URL fits in one file, else a sitemap index"""
+        layout = sitemap_layout_cache.get_or_build("layout", ("blog_post", "service"), self._layout)
+        if layout == "single":
+            return sitemap_cache.get_or_build(
+                "single", ("sitemap:blog-0", "sitemap:services-0"),
+                lambda: self._urlset(chunk for urls in (self._blog_urls(0), self._service_urls(0)) for chunk in urls),
+            )
+        return sitemap_cache.get_or_build("index", ("blog_post", "service"), self._index)
+
+    def _layout(self) -> str:
+        blog_shards, service_shards = self._shard_counts()
+        if blog_shards > 1 or service_shards > 1:
+            return "index"
+        # Shard 0 of each kind holds every row; together they may still exceed the limit
+        urls = (
+            self.blog_repository.count_published_titles(BLOG_LANGUAGES)
+            + self.service_repository.count_active_titles(SERVICE_LANGUAGES)
+        )
+        return "single" if urls <= SITEMAP_MAX_URLS else "index"
+
+    def _index(self) -> CompressedBody:
+        blog_shards, service_shards = self._shard_counts()
+        base = settings.site_url.rstrip("/")
+        names = [f"blog-{n}" for n in range(blog_shards)] + [f"services-{n}" for n in range(service_shards)]
+        entries = "".join(f"<sitemap><loc>{escape(base)}/sitemaps/{name}.xml</loc></sitemap>\n" for name in names)
+        return CompressedBody((
+            f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n{entries}</sitemapindex>\n'
+        ).encode())
+
+    def get_sitemap_shard(self, name: str) -> Optional[CompressedBody]:
+        """Get one sitemap shard ("blog-0", "services-0", ...), None if there is no such shard
+
+        Only shards listed by the index are built and cached, so arbitrary
+        names cannot grow the cache.
+        """
+        urls = self._shard_urls(name)
+        if urls is None:
+            return None
+        return sitemap_cache.get_or_build(("shard", name), (f"sitemap:{name}",), lambda: self._urlset(urls))
+
+    # Feeds
+
+    def _latest_posts(self) -> Iterator[BlogPost]:
+        cursor = None
+        remaining = FEED_SIZE
+        while remaining > 0:
+            posts = self.blog_repository.get_published_before(cursor, min(remaining, BATCH_SIZE))
+            yield from posts
+            if len(posts) < min(remaining, BATCH_SIZE):
+                return
+            remaining -= len(posts)
+            cursor = (posts[-1].published_date, posts[-1].id)
+
+    def get_feed(self, feed_format: str, lang: str) -> CompressedBody:
+        """Get the latest posts as an RSS 2.0 or Atom feed"""
+        build = self._rss if feed_format == "rss" else self._atom
+        return feed_cache.get_or_build((feed_format, lang), ("blog_post",), lambda: CompressedBody(build(lang)))
+
+    def _rss(self, lang: str) -> bytes:
+        site = settings.site_url.rstrip("/")
+        items: List[str] = []
+        for post in self._latest_posts():
+            link = escape(_site_link(settings.site_blog_path, lang, post.slug))
+            items.append(
+                f"<item><title>{escape(_localized(post, 'title', lang) or post.slug)}</title>"
+                f"<link>{link}</link><guid isPermaLink=\"true\">{link}</guid>"
+                f"<pubDate>{format_datetime(post.published_date)}</pubDate>"
+                f"<description>{escape(_localized(post, 'description', lang) or '')}</description></item>\n"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>\n'
+            f"<title>{escape(settings.app_name)} Blog</title><link>{escape(site)}</link>"
+            f"<description>{escape(settings.app_name)} blog ({lang})</description><language>{lang}</language>\n"
+            + "".join(items)
+            + "</channel></rss>\n"
+        ).encode()
+
+    def _atom(self, lang: str) -> bytes:
+        site = escape(settings.site_url.rstrip("/"))
+        entries: List[str] = []
+        updated = None
+        for post in self._latest_posts():
+            updated = updated or post.published_date
+            link = escape(_site_link(settings.site_blog_path, lang, post.slug))
+            published = post.published_date.isoformat() + "Z"
+            entries.append(
+                f"<entry><id>{link}</id><title>{escape(_localized(post, 'title', lang) or post.slug)}</title>"
+                f"<link href=\"{link}\"/><published>{published}</published><updated>{published}</updated>"
+                f"<summary>{escape(_localized(post, 'description', lang) or '')}</summary></entry>\n"
+            )
+        updated_at = (updated or datetime(1970, 1, 1)).isoformat() + "Z"
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom" '
+            f'xml:lang="{lang}">\n<id>{site}/{lang}/blog</id><title>{escape(settings.app_name)} Blog</title>'
+            f'<link href="{site}/{lang}/blog"/><updated>{updated_at}</updated>\n'
+            + "".join(entries)
+            + "</feed>\n"
+        ).encode()
+
+
+@on_remote_content_change
+@on_content_change
+def invalidate_sitemap_shards(changes: List[ContentChange]) -> None:
+    """Drop only the sitemap shards containing the changed rows"""
+    tags = set()
+    for change in changes:
+        if change.entity == "blog_post":
+            tags.add(f"sitemap:blog-{blog_shard(change.entity_id)}")
+        elif change.entity == "service":
+            tags.add(f"sitemap:services-{service_shard(change.entity_id)}")
+    if tags:
+        sitemap_cache.invalidate(*tags)
@@ -0,0 +1,43 @@
+from typing import List
+from sqlalchemy.orm import Session
+from app.repositories.blog_repository import BlogRepository
+from app.repositories.service_repository import ServiceRepository
+from app.schemas.search import SearchResult
+from app.search.index import get_search_backend
+from app.search.text import make_snippet, tokenize
+
+
+class SearchService:
+    """Full-text search over blog posts and services"""
+    
+    def __init__(self, db: Session):
+        self.blog_repository = BlogRepository(db)
+        self.service_repository = ServiceRepository(db)
+        self.backend = get_search_backend()
+    
+    def search(self, query: str, lang: str = "en", limit: int = 20) -> List[SearchResult]:
+        """Return ranked results with highlighted snippets"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        hits = self.backend.search(terms, lang, limit)
+        
+        # Load every hit with one query per entity type
+        posts = {p.id: p for p in self.blog_repository.get_by_ids([h.entity_id for h in hits if h.entity == "blog_post"])}
+        services = {s.id: s for s in self.service_repository.get_by_ids([h.entity_id for h in hits if h.entity == "service"])}
+        
+        results = []
+        for hit in hits:
+            obj = (posts if hit.entity == "blog_post" else services).get(hit.entity_id)
+            if obj is None:
+                continue
+            title = getattr(obj, f"title_{lang}", None)
+            text = getattr(obj, f"content_{lang}", None) or getattr(obj, f"description_{lang}", None) or title or ""
+            results.append(SearchResult(
+                type=hit.entity,
+                slug=obj.slug,
+                title=title,
+                snippet=make_snippet(text, terms),
+                score=round(hit.score, 4),
+            ))
+        return results
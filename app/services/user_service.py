@@ -1,5 +1,6 @@
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
+from app.core.singleflight import coalesced, service_flights
 from app.services.base_service import BaseService
 from app.repositories.user_repository import UserRepository
 from app.repositories.service_repository import ServiceRepository
@@ -105,6 +106,7 @@ class ServiceService(BaseService[Service, ServiceRepository]):
         service = self.repository.create(**prepared_data)
         return self.after_create(service)
     
+    @coalesced(service_flights, lambda self, slug: (self.repository.db.get_bind(), slug))
     def get_service_by_slug(self, slug: str) -> Service:
         """Get service by slug"""
         service = self.repository.get_by_slug(slug)
@@ -112,6 +114,7 @@ class ServiceService(BaseService[Service, ServiceRepository]):
             raise ServiceNotFoundError(slug)
         return service
     
+    @coalesced(service_flights, lambda self: self.repository.db.get_bind())
     def get_active_services(self) -> List[Service]:
         """Get all active services"""
         return self.repository.get_active_services()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Bootstrap endpoint benchmark
+Compares one /api/v1/bootstrap call with the first page load fan-out
+(/header/columns, /combobox-items per dropdown, /services, /blog/posts)
+
+Usage: python benchmarks/bench_bootstrap.py [--iterations 300] [--columns 6] [--services 30] [--posts 500]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_tmp = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp, 'bench.db')}")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.core.warmup import wait_for_warmup  # noqa: E402
+from app.db.session import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.blog import BlogPost  # noqa: E402
+from app.models.header import ComboboxItem, HeaderColumn  # noqa: E402
+from app.models.service import Service  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.bootstrap_service import document_cache, fragment_cache  # noqa: E402
+
+TEXT = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20
+
+
+def seed(columns: int, items_per_column: int, services: int, posts: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    now = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [{"email": "bench@example.com", "password_hash": "x", "is_admin": True}])
+        conn.execute(
+            HeaderColumn.__table__.insert(),
+            [
+                {
+                    "name_tr": f"Menü {i}", "name_en": f"Menu {i}", "slug": f"menu-{i}", "is_active": True,
+                    "order": i, "type": "dropdown", "has_combobox": True,
+                }
+                for i in range(columns)
+            ],
+        )
+        conn.execute(
+            ComboboxItem.__table__.insert(),
+            [
+                {
+                    "header_column_id": column + 1, "name_tr": f"Öğe {column}-{i}", "name_en": f"Item {column}-{i}",
+                    "slug": f"item-{column}-{i}", "url": f"/item-{column}-{i}", "is_active": True, "order": i,
+                }
+                for column in range(columns)
+                for i in range(items_per_column)
+            ],
+        )
+        conn.execute(
+            Service.__table__.insert(),
+            [
+                {
+                    "slug": f"service-{i}", "is_active": True, "title_en": f"Service {i}", "title_tr": f"Hizmet {i}",
+                    "description_en": TEXT[:300], "content_en": TEXT, "content_tr": TEXT,
+                }
+                for i in range(services)
+            ],
+        )
+        conn.execute(
+            BlogPost.__table__.insert(),
+            [
+                {
+                    "slug": f"post-{i}", "author_id": 1, "published_date": now - timedelta(hours=i),
+                    "title_en": f"Post {i}", "description_en": TEXT[:200], "content_en": TEXT * 3,
+                }
+                for i in range(posts)
+            ],
+        )
+
+
+def fan_out(client: TestClient, lang: str) -> None:
+    columns = client.get("/api/v1/header/columns", params={"lang": lang}).json()
+    for column in columns:
+        if column["has_combobox"]:
+            client.get(f"/api/v1/header/columns/{column['slug']}/combobox-items", params={"lang": lang})
+    client.get("/api/v1/services")
+    client.get("/api/v1/blog/posts", params={"lang": lang, "size": 6})
+
+
+def bootstrap(client: TestClient, lang: str) -> None:
+    client.get("/api/v1/bootstrap", params={"lang": lang, "posts": 6})
+
+
+def cold_bootstrap(client: TestClient, lang: str) -> None:
+    fragment_cache.clear()
+    document_cache.clear()
+    bootstrap(client, lang)
+
+
+def measure(fn, client: TestClient, iterations: int):
+    fn(client, "en")  # warm up
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(client, "en")
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--items", type=int, default=8, help="dropdown items per column")
+    parser.add_argument("--services", type=int, default=30)
+    parser.add_argument("--posts", type=int, default=500)
+    args = parser.parse_args()
+
+    seed(args.columns, args.items, args.services, args.posts)
+    with TestClient(app) as client:
+        wait_for_warmup()  # its requests would fill the caches the cold runs clear
+        print(f"{'scenario':<20} {'requests':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, fn, requests in (
+            ("fan-out", fan_out, args.columns + 3),
+            ("bootstrap (cold)", cold_bootstrap, 1),
+            ("bootstrap (warm)", bootstrap, 1),
+        ):
+            p50, p95 = measure(fn, client, args.iterations)
+            print(f"{name:<20} {requests:>8} {p50:>8.2f} {p95:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Cross-worker cache invalidation check
+Starts several worker processes sharing one SQLite file, each serving
+/api/v1/bootstrap from its in-process cache, then renames a service from this
+process and measures how long every worker takes to serve the new title.
+Exits non-zero when a worker stays stale longer than the sync interval allows.
+
+Usage: python benchmarks/bench_cache_sync.py [--workers 4] [--rounds 5] [--interval 0.5]
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Time for a worker to notice: one interval, a request round trip and scheduling noise
+SLACK_SECONDS = 0.25
+
+
+def configure(database_url: str, interval: float) -> None:
+    sys.path.insert(0, ROOT)
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ["CACHE_SYNC_INTERVAL_SECONDS"] = str(interval)
+
+
+def worker(database_url: str, interval: float, ready, results, stop) -> None:
+    configure(database_url, interval)
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        title = None
+        client.get("/api/v1/bootstrap")  # fill the cache
+        ready.put(os.getpid())
+        while not stop.is_set():
+            services = client.get("/api/v1/bootstrap").json()["services"]
+            current = services[0]["title"]
+            if current != title:
+                if title is not None:
+                    results.put((os.getpid(), current, time.time()))
+                title = current
+            time.sleep(0.005)
+
+
+def seed(database_url: str) -> None:
+    from app.db.session import Base, engine
+    from app.models.service import Service
+    from app.search.index import init_search_index
+    import app.models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(Service.__table__.insert(), [{"slug": "service-0", "is_active": True, "title_en": "Title 0"}])
+    init_search_index()
+
+
+def rename(title: str) -> float:
+    from app.db.session import WriteSessionLocal
+    from app.models.service import Service
+
+    with WriteSessionLocal() as db:
+        db.query(Service).filter(Service.slug == "service-0").one().title_en = title
+        db.commit()
+    return time.time()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=0.5, help="CACHE_SYNC_INTERVAL_SECONDS of the workers")
+    args = parser.parse_args()
+
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'sync.db')}"
+    configure(database_url, args.interval)
+    seed(database_url)
+
+    context = multiprocessing.get_context("spawn")
+    ready, results, stop = context.Queue(), context.Queue(), context.Event()
+    processes = [
+        context.Process(target=worker, args=(database_url, args.interval, ready, results, stop))
+        for _ in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        ready.get(timeout=120)
+
+    delays = []
+    failed = False
+    try:
+        for round_number in range(1, args.rounds + 1):
+            title = f"Title {round_number}"
+            written_at = rename(title)
+            seen = set()
+            deadline = time.time() + args.interval + 10
+            while len(seen) < len(processes) and time.time() < deadline:
+                pid, observed, at = results.get(timeout=deadline - time.time())
+                if observed == title and pid not in seen:
+                    seen.add(pid)
+                    delays.append(at - written_at)
+            if len(seen) < len(processes):
+                print(f"round {round_number}: {len(processes) - len(seen)} workers never saw the write")
+                failed = True
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(timeout=10)
+
+    if delays:
+        delays.sort()
+        print(f"{'workers':>8} {'rounds':>7} {'interval s':>10} {'p50 ms':>8} {'max ms':>8}")
+        print(
+            f"{args.workers:>8} {args.rounds:>7} {args.interval:>10.2f} "
+            f"{statistics.median(delays) * 1000:>8.1f} {delays[-1] * 1000:>8.1f}"
+        )
+        if delays[-1] > args.interval + SLACK_SECONDS:
+            print(f"stale for longer than {args.interval + SLACK_SECONDS:.2f}s")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Endpoint benchmark suite with a regression gate
+Drives the ASGI app in-process against a synthetic SQLite dataset and reports,
+per endpoint, p50/p95/p99 latency, sequential throughput, SQL statements and
+allocated memory per request. Results can be stored as a JSON baseline; later
+runs against the same dataset size fail when they regress past --threshold.
+Every run first checks the repository query plans (app.db.query_plans) and
+exits non-zero on a full table scan or unindexed sort.
+
+Usage: python benchmarks/bench_endpoints.py [--size 1k|100k|1m] [--iterations 200]
+           [--only blog_list,blog_detail] [--save-baseline | --allow-missing-baseline]
+           [--threshold 0.25] [--skip-plan-check]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Rows per table for each dataset size: blog posts, leads and combobox items
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+SERVICES = 50
+COLUMNS = 20
+INSERT_BATCH = 5_000
+DATASET_VERSION = 1  # bump when the generated rows change
+ADMIN_EMAIL = "bench@example.com"
+ADMIN_PASSWORD = "benchmark"
+
+# Statement counts are deterministic, so any increase is a regression
+STATEMENT_TOLERANCE = 0.5
+ALLOCATION_SAMPLES = 10
+
+WORDS = (
+    "hair transplant clinic istanbul dental implant veneer rhinoplasty recovery consultation "
+    "treatment graft follicle surgeon result price guide aftercare patient doctor"
+).split()
+
+
+@dataclass
+class Endpoint:
+    name: str
+    path: Callable[[int], str]  # rows per table -> path
+    params: Callable[[int], dict] = lambda rows: {}
+    admin: bool = False
+    max_iterations: Optional[int] = None  # for endpoints whose cost grows with the dataset
+
+
+ENDPOINTS = [
+    Endpoint("services", lambda rows: "/api/v1/services"),
+    Endpoint("blog_list", lambda rows: "/api/v1/blog/posts", lambda rows: {"page": 1, "size": 10}),
+    Endpoint(
+        "blog_list_deep", lambda rows: "/api/v1/blog/posts",
+        lambda rows: {"page": max(1, int(rows * 0.9) // 10), "size": 10},
+    ),
+    Endpoint("blog_detail", lambda rows: f"/api/v1/blog/posts/post-{rows // 2}", lambda rows: {"lang": "en"}),
+    Endpoint("header_columns", lambda rows: "/api/v1/header/columns"),
+    Endpoint("combobox_items", lambda rows: "/api/v1/header/columns/menu-1/combobox-items", max_iterations=50),
+    Endpoint("bootstrap", lambda rows: "/api/v1/bootstrap", lambda rows: {"lang": "en"}),
+    Endpoint("search", lambda rows: "/api/v1/search", lambda rows: {"q": "hair transplant", "lang": "en"}),
+    Endpoint("autocomplete", lambda rows: "/api/v1/autocomplete", lambda rows: {"q": "ha", "lang": "en"}),
+    Endpoint("changes", lambda rows: "/api/v1/changes", lambda rows: {"since": 0, "limit": 100}),
+    Endpoint("sitemap", lambda rows: "/sitemap.xml"),
+    Endpoint("admin_leads", lambda rows: "/admin/leads", admin=True, max_iterations=20),
+]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed_dataset(rows: int) -> None:
+    """Bulk insert the synthetic dataset into the configured database"""
+    from app.core.security import get_password_hash
+    from app.db.session import Base, engine
+    from app.models.blog import BlogPost
+    from app.models.header import ComboboxItem, HeaderColumn
+    from app.models.lead import Lead
+    from app.models.service import Service
+    from app.models.user import User
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(DATASET_VERSION)
+    now = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"email": ADMIN_EMAIL, "password_hash": get_password_hash(ADMIN_PASSWORD), "is_admin": True}
+        ])
+        conn.execute(HeaderColumn.__table__.insert(), [
+            {
+                "name_tr": f"Menü {i}", "name_en": f"Menu {i}", "slug": f"menu-{i}", "is_active": True,
+                "order": i, "type": "dropdown", "has_combobox": True,
+            }
+            for i in range(COLUMNS)
+        ])
+        conn.execute(Service.__table__.insert(), [
+            {
+                "slug": f"service-{i}", "is_active": True, "title_en": f"{_text(rng, 3).title()} {i}",
+                "title_tr": f"Hizmet {i}", "description_en": _text(rng, 40), "content_en": _text(rng, 400),
+                "price": float(rng.randint(500, 5000)), "duration": f"{rng.randint(1, 8)} hours",
+            }
+            for i in range(SERVICES)
+        ])
+    for start in range(0, rows, INSERT_BATCH):
+        batch = range(start, min(start + INSERT_BATCH, rows))
+        with engine.begin() as conn:
+            conn.execute(BlogPost.__table__.insert(), [
+                {
+                    "slug": f"post-{i}", "author_id": 1,
+                    "published_date": now - timedelta(minutes=i) if i % 10 else None,
+                    "title_en": f"{_text(rng, 5).capitalize()} {i}", "title_tr": f"Yazı {i}",
+                    "description_en": _text(rng, 30), "content_en": _text(rng, 300), "content_tr": _text(rng, 300),
+                    "featured_image_url": f"/api/v1/images/post-{i}.jpg",
+                    "gallery_urls": [f"/api/v1/images/post-{i}-{n}.jpg" for n in range(3)],
+                }
+                for i in batch
+            ])
+            conn.execute(Lead.__table__.insert(), [
+                {
+                    "full_name": f"Lead {i}", "phone_number": f"+90555{i:07d}", "email": f"lead{i}@example.com",
+                    "source_form": rng.choice(("contact", "consultation", "pricing")),
+                    "created_at": now - timedelta(minutes=i),
+                }
+                for i in batch
+            ])
+            conn.execute(ComboboxItem.__table__.insert(), [
+                {
+                    "header_column_id": i % COLUMNS + 1, "name_tr": f"Öğe {i}", "name_en": f"Item {i}",
+                    "slug": f"item-{i}", "url": f"/item-{i}", "is_active": True, "order": i,
+                }
+                for i in batch
+            ])
+
+
+class StatementCounter:
+    """Counts SQL statements executed by every engine"""
+
+    def __init__(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        self.count = 0
+        event.listen(Engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def _percentile(quantiles: List[float], p: int) -> float:
+    return quantiles[p - 1]
+
+
+def measure(client, endpoint: Endpoint, rows: int, iterations: int, headers: dict, counter: StatementCounter) -> dict:
+    path, params = endpoint.path(rows), endpoint.params(rows)
+    if endpoint.max_iterations is not None:
+        iterations = min(iterations, endpoint.max_iterations)
+    response = client.get(path, params=params, headers=headers)  # warm up
+    if response.status_code != 200:
+        raise RuntimeError(f"{endpoint.name}: GET {path} returned {response.status_code}")
+
+    timings = []
+    statements_before = counter.count
+    started = time.perf_counter()
+    for _ in range(iterations):
+        request_started = time.perf_counter()
+        client.get(path, params=params, headers=headers)
+        timings.append((time.perf_counter() - request_started) * 1000)
+    elapsed = time.perf_counter() - started
+    statements = (counter.count - statements_before) / iterations
+
+    allocations = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(iterations, ALLOCATION_SAMPLES)):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            client.get(path, params=params, headers=headers)
+            allocations.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    quantiles = statistics.quantiles(timings, n=100, method="inclusive") if len(timings) > 1 else timings * 99
+    return {
+        "iterations": iterations,
+        "p50_ms": round(_percentile(quantiles, 50), 3),
+        "p95_ms": round(_percentile(quantiles, 95), 3),
+        "p99_ms": round(_percentile(quantiles, 99), 3),
+        "throughput_rps": round(iterations / elapsed, 1),
+        "sql_statements": round(statements, 2),
+        "peak_alloc_kib": round(statistics.median(allocations) / 1024, 1),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: dict, threshold: float) -> List[str]:
+    """Regressions of results against a baseline, as readable lines"""
+    failures = []
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "peak_alloc_kib"):
+            if result[metric] > base[metric] * (1 + threshold):
+                failures.append(f"{name}: {metric} {base[metric]} -> {result[metric]}")
+        if result["sql_statements"] > base["sql_statements"] + STATEMENT_TOLERANCE:
+            failures.append(f"{name}: sql_statements {base['sql_statements']} -> {result['sql_statements']}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES, key=SIZES.get), default="1k")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--only", help="comma separated endpoint names")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, "benchmarks", ".datasets"))
+    parser.add_argument("--baseline", help="baseline JSON (default benchmarks/baselines/endpoints-<size>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument(
+        "--allow-missing-baseline", action="store_true", help="only report when there is no baseline to compare with"
+    )
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--output", help="also write the results JSON here")
+    parser.add_argument("--skip-plan-check", action="store_true", help="do not check the repository query plans")
+    args = parser.parse_args()
+
+    rows = SIZES[args.size]
+    os.makedirs(args.data_dir, exist_ok=True)
+    database = os.path.join(args.data_dir, f"endpoints-{args.size}-v{DATASET_VERSION}.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    # Single process: cross-worker cache polling would only add noise to the statement counts
+    os.environ.setdefault("CACHE_SYNC_INTERVAL_SECONDS", "-1")
+    baseline_path = args.baseline or os.path.join(ROOT, "benchmarks", "baselines", f"endpoints-{args.size}.json")
+    baseline_missing = not args.save_baseline and not os.path.exists(baseline_path)
+    if baseline_missing and not args.allow_missing_baseline:
+        sys.exit(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+
+    import app.models  # noqa: F401 register every table before create_all
+
+    if not args.skip_plan_check:
+        from app.db.query_plans import QUERY_CASES, check_query_plans
+
+        plan_failures = check_query_plans()
+        if plan_failures:
+            print("Query plan regressions:")
+            for failure in plan_failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print(f"Query plans: {len(QUERY_CASES)} repository queries use indexes")
+
+    if not os.path.exists(database + ".seeded"):
+        started = time.perf_counter()
+        if os.path.exists(database):
+            os.remove(database)
+        seed_dataset(rows)
+        open(database + ".seeded", "w").close()
+        print(f"Seeded {args.size} dataset in {time.perf_counter() - started:.1f}s")
+
+    from fastapi.testclient import TestClient
+    from app.core.warmup import wait_for_warmup
+    from app.export.snapshot import wait_for_snapshot_export
+    from app.main import app as asgi_app
+    from app.search.related import wait_for_related_posts
+
+    endpoints = ENDPOINTS
+    if args.only:
+        names = set(args.only.split(","))
+        endpoints = [endpoint for endpoint in ENDPOINTS if endpoint.name in names]
+
+    counter = StatementCounter()
+    results: Dict[str, dict] = {}
+    with TestClient(asgi_app) as client:
+        # Background startup jobs would otherwise show up in the statement counts
+        wait_for_warmup()
+        wait_for_related_posts()
+        wait_for_snapshot_export()
+        token = client.post("/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}).json()["access_token"]
+        admin_headers = {"Authorization": f"Bearer {token}"}
+
+        print(f"{'endpoint':<16} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'SQL':>6} {'alloc KiB':>10}")
+        for endpoint in endpoints:
+            result = measure(
+                client, endpoint, rows, args.iterations, admin_headers if endpoint.admin else {}, counter
+            )
+            results[endpoint.name] = result
+            print(
+                f"{endpoint.name:<16} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                f"{result['throughput_rps']:>8.1f} {result['sql_statements']:>6.1f} {result['peak_alloc_kib']:>10.1f}"
+            )
+
+    report = {
+        "size": args.size,
+        "rows": rows,
+        "dataset_version": DATASET_VERSION,
+        "python": platform.python_version(),
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        if os.path.exists(baseline_path):
+            # Keep the endpoints this run skipped
+            with open(baseline_path) as f:
+                previous = json.load(f)
+            report["results"] = {**previous.get("results", {}), **results}
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+        return
+
+    if baseline_missing:
+        print(f"No baseline at {baseline_path}; nothing to compare with")
+        return
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if baseline.get("dataset_version") != DATASET_VERSION or baseline.get("rows") != rows:
+        sys.exit(f"Baseline {baseline_path} was recorded on a different dataset")
+    failures = compare(results, baseline, args.threshold)
+    if failures:
+        print(f"Regressions past {args.threshold:.0%}:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"No regressions past {args.threshold:.0%} against {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Hot path sampler overhead check
+Drives the public endpoints of the endpoint benchmark in-process with the
+continuous sampler (app.core.hot_paths) stopped and running, in alternating
+rounds, and compares the time each round takes with the round of the other
+mode next to it. Exits non-zero when the median of those ratios says running
+the sampler slows the endpoints down by more than --budget.
+
+Usage: python benchmarks/bench_hot_paths.py [--size 1k] [--rounds 15] [--iterations 10] [--budget 0.02]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from bench_endpoints import DATASET_VERSION, ENDPOINTS, ROOT, SIZES, seed_dataset
+
+
+def run_round(client, endpoints, rows: int, iterations: int) -> float:
+    started = time.perf_counter()
+    for endpoint in endpoints:
+        path, params = endpoint.path(rows), endpoint.params(rows)
+        for _ in range(iterations if endpoint.max_iterations is None else min(iterations, endpoint.max_iterations)):
+            client.get(path, params=params)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES, key=SIZES.get), default="1k")
+    parser.add_argument("--rounds", type=int, default=15, help="paired rounds; the median ratio is compared")
+    parser.add_argument("--iterations", type=int, default=10, help="requests per endpoint and round")
+    parser.add_argument("--interval-ms", type=float, help="sampling period (default HOT_PATHS_INTERVAL_MS)")
+    parser.add_argument("--budget", type=float, default=0.02, help="allowed relative slowdown")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, "benchmarks", ".datasets"))
+    args = parser.parse_args()
+
+    rows = SIZES[args.size]
+    os.makedirs(args.data_dir, exist_ok=True)
+    database = os.path.join(args.data_dir, f"endpoints-{args.size}-v{DATASET_VERSION}.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("CACHE_SYNC_INTERVAL_SECONDS", "-1")
+    os.environ["HOT_PATHS_ENABLED"] = "true"
+    if args.interval_ms is not None:
+        os.environ["HOT_PATHS_INTERVAL_MS"] = str(args.interval_ms)
+
+    import app.models  # noqa: F401 register every table before create_all
+
+    if not os.path.exists(database + ".seeded"):
+        if os.path.exists(database):
+            os.remove(database)
+        seed_dataset(rows)
+        open(database + ".seeded", "w").close()
+
+    from fastapi.testclient import TestClient
+    from app.core.hot_paths import hot_path_sampler
+    from app.core.warmup import wait_for_warmup
+    from app.export.snapshot import wait_for_snapshot_export
+    from app.main import app as asgi_app
+    from app.search.related import wait_for_related_posts
+
+    endpoints = [endpoint for endpoint in ENDPOINTS if not endpoint.admin]
+    timings = {"off": [], "on": []}
+    with TestClient(asgi_app) as client:
+        wait_for_warmup()
+        wait_for_related_posts()
+        wait_for_snapshot_export()
+        loop, loop_thread = hot_path_sampler.loop, hot_path_sampler.loop_thread
+        run_round(client, endpoints, rows, args.iterations)  # fill the response caches
+        for round_number in range(args.rounds):
+            # Alternate which mode goes first so drift hits both alike
+            for mode in (("off", "on") if round_number % 2 == 0 else ("on", "off")):
+                if mode == "on":
+                    hot_path_sampler.start(loop, loop_thread)
+                else:
+                    hot_path_sampler.stop()
+                timings[mode].append(run_round(client, endpoints, rows, args.iterations))
+        hot_path_sampler.start(loop, loop_thread)
+        report = hot_path_sampler.report(windows=len(hot_path_sampler.windows))
+
+    off, on = statistics.median(timings["off"]), statistics.median(timings["on"])
+    # Paired ratios cancel the drift (caches, CPU frequency, neighbours) between rounds
+    overhead = statistics.median(b / a for a, b in zip(timings["off"], timings["on"])) - 1
+    requests = sum(
+        args.iterations if endpoint.max_iterations is None else min(args.iterations, endpoint.max_iterations)
+        for endpoint in endpoints
+    )
+    print(f"{len(endpoints)} public endpoints, {requests} requests per round, {args.rounds} rounds per mode")
+    print(f"sampler off  {off * 1000:8.1f} ms per round (median)")
+    print(f"sampler on   {on * 1000:8.1f} ms per round (median)")
+    print(f"slowdown     {overhead:8.2%}  median of paired rounds (budget {args.budget:.0%})")
+    print(f"sampler's own accounting: {report['overhead']:.2%} of a core at a {report['interval_ms']} ms period")
+    if overhead > args.budget:
+        sys.exit(f"Sampler overhead {overhead:.2%} exceeds the {args.budget:.0%} budget")
+
+
+if __name__ == "__main__":
+    main()
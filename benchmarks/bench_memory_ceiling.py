@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Memory ceiling check for the listing endpoints
+Seeds the endpoint benchmark's synthetic dataset at two or more table sizes
+(and as many uploaded images), each in a fresh worker process, and measures
+the peak traced allocation (tracemalloc) of one request to every listing
+endpoint. Requests are sent
+straight to the ASGI app and the response body is dropped as it is sent, so
+only the server side is measured. Exits non-zero when an endpoint's peak
+grows with the table: above --max-growth times its peak at the smallest size.
+
+Usage: python benchmarks/bench_memory_ceiling.py [--rows 500,4000] [--max-growth 1.5] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from typing import Dict, List, Tuple
+from urllib.parse import urlencode
+
+from bench_endpoints import ADMIN_EMAIL, ROOT, Endpoint, seed_dataset
+
+# Endpoints that list a table; navigation menus (public combobox items) are
+# cached whole per column and not listings of a growing table
+LISTINGS = [
+    Endpoint("admin_blog_posts", lambda rows: "/admin/blog/posts", admin=True),
+    Endpoint("admin_leads", lambda rows: "/admin/leads", admin=True),
+    Endpoint("admin_combobox_items", lambda rows: "/admin/header/combobox-items", admin=True),
+    Endpoint("blog_list", lambda rows: "/api/v1/blog/posts", lambda rows: {"page": 1, "size": 10}),
+    Endpoint(
+        "blog_list_deep", lambda rows: "/api/v1/blog/posts",
+        lambda rows: {"page": max(1, int(rows * 0.9) // 10), "size": 10},
+    ),
+    Endpoint("changes", lambda rows: "/api/v1/changes", lambda rows: {"since": 0, "limit": 100}),
+    Endpoint("images", lambda rows: "/api/v1/images", lambda rows: {"limit": 100}),
+]
+
+
+async def peak_allocation(asgi_app, path: str, params: dict, headers: dict) -> Tuple[int, int]:
+    """(status, peak bytes allocated above the start) of one request"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": urlencode(params).encode(), "root_path": "",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+    requested = False
+    status = 0
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    await asgi_app(scope, receive, send)
+    return status, tracemalloc.get_traced_memory()[1] - baseline
+
+
+async def measure_all(asgi_app, rows: int, repeat: int) -> Dict[str, int]:
+    import anyio
+    from app.core.security import create_access_token
+    from app.core.warmup import wait_for_warmup
+    from app.export.snapshot import wait_for_snapshot_export
+    from app.search.related import wait_for_related_posts
+
+    admin_headers = {"Authorization": f"Bearer {create_access_token(ADMIN_EMAIL, True)}"}
+    peaks = {}
+    async with asgi_app.router.lifespan_context(asgi_app):
+        for wait in (wait_for_warmup, wait_for_related_posts, wait_for_snapshot_export):
+            await anyio.to_thread.run_sync(wait)
+        tracemalloc.start()
+        try:
+            for endpoint in LISTINGS:
+                path, params = endpoint.path(rows), endpoint.params(rows)
+                headers = admin_headers if endpoint.admin else {}
+                status, _ = await peak_allocation(asgi_app, path, params, headers)  # fill caches
+                if status != 200:
+                    raise RuntimeError(f"{endpoint.name}: GET {path} returned {status}")
+                samples = [(await peak_allocation(asgi_app, path, params, headers))[1] for _ in range(repeat)]
+                peaks[endpoint.name] = int(statistics.median(samples))
+        finally:
+            tracemalloc.stop()
+    return peaks
+
+
+def worker(rows: int, repeat: int, results) -> None:
+    sys.path.insert(0, ROOT)
+    directory = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'memory.db')}"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ["CACHE_SYNC_INTERVAL_SECONDS"] = "-1"
+    import app.models  # noqa: F401 register every table before create_all
+    from app.main import create_app
+
+    seed_dataset(rows)
+    # One upload per row, for the image listing (UPLOAD_DIR is relative)
+    os.chdir(directory)
+    os.mkdir("uploads")
+    for i in range(rows):
+        with open(os.path.join("uploads", f"image-{i}.png"), "wb") as f:
+            f.write(b"\x89PNG")
+    results.put((rows, asyncio.run(measure_all(create_app(), rows, repeat))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="500,4000", help="comma separated table sizes, smallest first")
+    parser.add_argument("--repeat", type=int, default=3, help="measured requests per endpoint; the median counts")
+    parser.add_argument("--max-growth", type=float, default=1.5, help="allowed peak ratio, largest to smallest size")
+    args = parser.parse_args()
+    sizes = sorted(int(rows) for rows in args.rows.split(","))
+    if len(sizes) < 2:
+        sys.exit("--rows needs at least two sizes")
+
+    # A fresh process per size: engines and caches are per process
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    peaks: Dict[int, Dict[str, int]] = {}
+    for rows in sizes:
+        process = context.Process(target=worker, args=(rows, args.repeat, results))
+        process.start()
+        measured_rows, peaks[rows] = results.get()
+        process.join()
+
+    smallest, largest = sizes[0], sizes[-1]
+    failures: List[str] = []
+    print(f"{'endpoint':<22}" + "".join(f"{f'{rows} rows KiB':>16}" for rows in sizes) + f"{'growth':>9}{'B/row':>8}")
+    for endpoint in LISTINGS:
+        small, large = peaks[smallest][endpoint.name], peaks[largest][endpoint.name]
+        growth = large / max(small, 1)
+        per_row = (large - small) / (largest - smallest)
+        print(
+            f"{endpoint.name:<22}" + "".join(f"{peaks[rows][endpoint.name] / 1024:>16.1f}" for rows in sizes)
+            + f"{growth:>8.2f}x{per_row:>8.0f}"
+        )
+        if growth > args.max_growth:
+            failures.append(f"{endpoint.name}: {small / 1024:.1f} KiB -> {large / 1024:.1f} KiB ({per_row:.0f} B per row)")
+    if failures:
+        print(f"Peak memory grows with the table ({largest / smallest:.0f}x rows, allowed {args.max_growth}x):")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"No listing's peak grew past {args.max_growth}x over {largest / smallest:.0f}x rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Metrics overhead check
+Drives the public endpoints of the endpoint benchmark in-process with the
+request metrics (MetricsMiddleware) and the connection pool hooks of
+app.core.metrics.instrument_engine detached and attached, in alternating
+pairs of requests, and compares the median latency of every endpoint in both
+modes. Exits non-zero when the summed medians say the metrics slow the
+endpoints down by more than --budget. Counters updated inline (cache
+lookups, coalesced reads) stay on in both modes.
+
+Usage: python benchmarks/bench_metrics.py [--size 1k] [--iterations 200] [--budget 0.02]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+from bench_endpoints import DATASET_VERSION, ENDPOINTS, ROOT, SIZES, seed_dataset
+from bench_hot_paths import run_round
+
+
+def find_parent(stack, middleware_class):
+    """The middleware (or app) whose .app is the first instance of middleware_class"""
+    node = stack
+    while getattr(node, "app", None) is not None:
+        if isinstance(node.app, middleware_class):
+            return node
+        node = node.app
+    raise RuntimeError(f"{middleware_class.__name__} is not in the middleware stack")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES, key=SIZES.get), default="1k")
+    parser.add_argument("--iterations", type=int, default=200, help="request pairs per endpoint")
+    parser.add_argument("--budget", type=float, default=0.02, help="allowed relative slowdown")
+    parser.add_argument("--data-dir", default=os.path.join(ROOT, "benchmarks", ".datasets"))
+    args = parser.parse_args()
+
+    rows = SIZES[args.size]
+    os.makedirs(args.data_dir, exist_ok=True)
+    database = os.path.join(args.data_dir, f"endpoints-{args.size}-v{DATASET_VERSION}.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("CACHE_SYNC_INTERVAL_SECONDS", "-1")
+
+    import app.models  # noqa: F401 register every table before create_all
+
+    if not os.path.exists(database + ".seeded"):
+        if os.path.exists(database):
+            os.remove(database)
+        seed_dataset(rows)
+        open(database + ".seeded", "w").close()
+
+    from fastapi.testclient import TestClient
+    from app.core.metrics import set_engine_instrumentation
+    from app.core.warmup import wait_for_warmup
+    from app.export.snapshot import wait_for_snapshot_export
+    from app.main import app as asgi_app
+    from app.middleware.metrics import MetricsMiddleware
+    from app.search.related import wait_for_related_posts
+
+    endpoints = [endpoint for endpoint in ENDPOINTS if not endpoint.admin]
+    # endpoint -> mode -> seconds per request
+    timings: Dict[str, Dict[str, List[float]]] = {endpoint.name: {"off": [], "on": []} for endpoint in endpoints}
+    with TestClient(asgi_app) as client:
+        wait_for_warmup()
+        wait_for_related_posts()
+        wait_for_snapshot_export()
+        run_round(client, endpoints, rows, 2)  # builds the stack and fills the response caches
+        parent = find_parent(asgi_app.middleware_stack, MetricsMiddleware)
+        metrics_middleware = parent.app
+
+        def set_mode(mode: str) -> None:
+            parent.app = metrics_middleware if mode == "on" else metrics_middleware.app
+            set_engine_instrumentation(mode == "on")
+
+        for iteration in range(args.iterations):
+            # Pairs of requests, alternating which mode goes first, so drift
+            # and noise bursts (a shared CPU, GC) hit both modes alike
+            for endpoint in endpoints:
+                if endpoint.max_iterations is not None and iteration >= endpoint.max_iterations:
+                    continue
+                path, params = endpoint.path(rows), endpoint.params(rows)
+                for mode in (("off", "on") if iteration % 2 == 0 else ("on", "off")):
+                    set_mode(mode)
+                    started = time.perf_counter()
+                    client.get(path, params=params)
+                    timings[endpoint.name][mode].append(time.perf_counter() - started)
+        set_mode("on")
+
+    # Medians per endpoint ignore the bursts; summing them weighs each
+    # endpoint by its cost, like a round of one request to each
+    off = sum(statistics.median(modes["off"]) for modes in timings.values())
+    on = sum(statistics.median(modes["on"]) for modes in timings.values())
+    overhead = on / off - 1
+    print(f"{'endpoint':<18}{'off ms':>9}{'on ms':>9}{'delta':>9}")
+    for name, modes in timings.items():
+        endpoint_off, endpoint_on = statistics.median(modes["off"]), statistics.median(modes["on"])
+        print(f"{name:<18}{endpoint_off * 1000:>9.3f}{endpoint_on * 1000:>9.3f}{endpoint_on / endpoint_off - 1:>9.2%}")
+    requests = sum(len(modes["on"]) for modes in timings.values())
+    print(f"{len(endpoints)} public endpoints, {requests} requests per mode")
+    print(f"slowdown {overhead:.2%} of the summed per-endpoint medians (budget {args.budget:.0%})")
+    if overhead > args.budget:
+        sys.exit(f"Metrics overhead {overhead:.2%} exceeds the {args.budget:.0%} budget")
+
+
+if __name__ == "__main__":
+    main()
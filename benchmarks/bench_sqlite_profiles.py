@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Database profile benchmark
+Measures read/write throughput for each SQLite profile and pre-ping strategy
+
+Usage: python benchmarks/bench_sqlite_profiles.py [--threads 8] [--seconds 5] [--rows 2000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from app.db.session import Base, create_db_engine  # noqa: E402
+from app.models.service import Service  # noqa: E402
+from app.models.lead import Lead  # noqa: E402
+from app.repositories.service_repository import ServiceRepository  # noqa: E402
+import app.models  # noqa: E402,F401
+
+PROFILES = [
+    ("default", "always"),
+    ("default", "never"),
+    ("tuned", "always"),
+    ("tuned", "idle"),
+    ("tuned", "never"),
+]
+
+
+def seed(url: str, rows: int) -> None:
+    engine = create_db_engine(url, sqlite_profile="default", pre_ping="never")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            Service.__table__.insert(),
+            [
+                {
+                    "slug": f"service-{i}",
+                    "is_active": i % 4 != 0,
+                    "title_en": f"Service {i}",
+                    "description_en": "Lorem ipsum dolor sit amet " * 8,
+                }
+                for i in range(rows)
+            ],
+        )
+    engine.dispose()
+
+
+def run_profile(url: str, profile: str, pre_ping: str, threads: int, seconds: float, write_ratio: float):
+    read_engine = create_db_engine(url, sqlite_profile=profile, pre_ping=pre_ping)
+    if profile == "tuned":
+        write_engine = create_db_engine(url, sqlite_profile=profile, pre_ping=pre_ping, serialize_writes=True)
+    else:
+        write_engine = read_engine
+    ReadSession = sessionmaker(bind=read_engine, autoflush=False)
+    WriteSession = sessionmaker(bind=write_engine, autoflush=False)
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    write_every = int(1 / write_ratio) if write_ratio else 0
+
+    def worker():
+        reads = writes = errors = 0
+        n = 0
+        while time.perf_counter() < deadline:
+            n += 1
+            try:
+                if write_every and n % write_every == 0:
+                    with WriteSession() as db:
+                        db.add(Lead(full_name="Bench", phone_number="5550000000", source_form="bench"))
+                        db.commit()
+                    writes += 1
+                else:
+                    with ReadSession() as db:
+                        ServiceRepository(db).get_active_services()
+                    reads += 1
+            except Exception:
+                errors += 1
+        with lock:
+            counts["reads"] += reads
+            counts["writes"] += writes
+            counts["errors"] += errors
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    read_engine.dispose()
+    if write_engine is not read_engine:
+        write_engine.dispose()
+    return {key: value / elapsed for key, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="fraction of operations that write")
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'pre-ping':<8} {'reads/s':>10} {'writes/s':>10} {'errors/s':>10}")
+    for profile, pre_ping in PROFILES:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            seed(url, args.rows)
+            result = run_profile(url, profile, pre_ping, args.threads, args.seconds, args.write_ratio)
+        print(
+            f"{profile:<10} {pre_ping:<8} {result['reads']:>10.1f} {result['writes']:>10.1f} {result['errors']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
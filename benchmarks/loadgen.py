@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+HTTP load generator
+Replays a weighted request mix against a running server (--url) or against the
+ASGI app in-process. The mix comes from a scenario file
+(benchmarks/scenarios/*.json) or from a recorded access log, whose GET and HEAD
+requests are replayed in their recorded proportions.
+
+With --rate the load is open-loop: requests arrive as a Poisson process no
+matter how fast the server answers, and latency is measured from each
+request's scheduled send time, so queueing in front of a slow server is not
+hidden (no coordinated omission). Without it, --concurrency users send
+requests back to back. Latencies go into per-route HDR-style histograms
+(3 significant digits); --hgrm-dir writes their percentile distributions in
+HdrHistogram's .hgrm format for plotting.
+
+Usage: python benchmarks/loadgen.py [--scenario benchmarks/scenarios/mixed.json | --access-log access.log]
+           [--url http://localhost:8000] [--rate 200 | --concurrency 16] [--duration 30]
+           [--output report.json] [--hgrm-dir hgrm/]
+"""
+
+import argparse
+import asyncio
+import bisect
+import itertools
+import json
+import math
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_SCENARIO = os.path.join(ROOT, "benchmarks", "scenarios", "mixed.json")
+REPORT_PERCENTILES = (50, 90, 99, 99.9)
+
+# Request line of common/combined (nginx, Apache) and uvicorn access logs
+ACCESS_LOG_LINE = re.compile(r'"(?P<method>[A-Z]+) (?P<target>\S+) HTTP/[\d.]+" (?P<status>\d{3})')
+REPLAYED_METHODS = ("GET", "HEAD")  # logs do not record request bodies
+
+
+class LatencyHistogram:
+    """Log-linear histogram of microsecond values with 3 significant digits
+
+    Same bucket layout as HdrHistogram: values sharing their top
+    SUB_BUCKET_BITS bits share a bucket, so the relative error stays under
+    0.1% from microseconds to minutes with a few thousand counters.
+    """
+
+    SUB_BUCKET_BITS = 11
+
+    def __init__(self):
+        self.counts: Dict[int, int] = defaultdict(int)
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self._sum = 0
+        self._sum_squares = 0
+
+    @classmethod
+    def _lowest_equivalent(cls, value: int) -> int:
+        shift = max(0, value.bit_length() - cls.SUB_BUCKET_BITS)
+        return (value >> shift) << shift
+
+    @classmethod
+    def _highest_equivalent(cls, bucket: int) -> int:
+        shift = max(0, bucket.bit_length() - cls.SUB_BUCKET_BITS)
+        return bucket + (1 << shift) - 1
+
+    def record(self, micros: float) -> None:
+        value = max(1, int(micros))
+        self.counts[self._lowest_equivalent(value)] += 1
+        self.min = value if not self.total else min(self.min, value)
+        self.max = max(self.max, value)
+        self.total += 1
+        self._sum += value
+        self._sum_squares += value * value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for bucket, count in other.counts.items():
+            self.counts[bucket] += count
+        if other.total:
+            self.min = other.min if not self.total else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.total += other.total
+        self._sum += other._sum
+        self._sum_squares += other._sum_squares
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.total if self.total else 0.0
+
+    @property
+    def stddev(self) -> float:
+        if not self.total:
+            return 0.0
+        return math.sqrt(max(0.0, self._sum_squares / self.total - self.mean ** 2))
+
+    def _cumulative(self) -> Iterator[Tuple[int, int]]:
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            yield bucket, seen
+
+    def value_at(self, percentile: float) -> int:
+        """Highest value of the bucket holding the given percentile"""
+        if not self.total:
+            return 0
+        rank = max(1, math.ceil(percentile / 100 * self.total))
+        for bucket, seen in self._cumulative():
+            if seen >= rank:
+                return min(self._highest_equivalent(bucket), self.max)
+        return self.max
+
+    def percentile_distribution(self, ticks_per_half_distance: int = 5, unit_ratio: float = 1000.0) -> str:
+        """Percentile table in HdrHistogram's .hgrm text format (values in ms by default)"""
+        lines = [f"{'Value':>12} {'Percentile':>14} {'TotalCount':>10} {'1/(1-Percentile)':>14}", ""]
+        cumulative = list(self._cumulative())
+        percentile = 0.0
+        while self.total:
+            value = self.value_at(percentile)
+            count = next(seen for bucket, seen in cumulative if min(self._highest_equivalent(bucket), self.max) >= value)
+            fraction = percentile / 100
+            if count >= self.total:
+                lines.append(f"{self.max / unit_ratio:12.3f} {1.0:14.12f} {self.total:10d}")
+                break
+            lines.append(f"{value / unit_ratio:12.3f} {fraction:14.12f} {count:10d} {1 / (1 - fraction):14.2f}")
+            half_distances = 2 ** (int(math.log2(100 / (100 - percentile))) + 1)
+            percentile += 100 / (ticks_per_half_distance * half_distances)
+        lines.append(
+            f"#[Mean    = {self.mean / unit_ratio:12.3f}, StdDeviation   = {self.stddev / unit_ratio:12.3f}]"
+        )
+        lines.append(f"#[Max     = {self.max / unit_ratio:12.3f}, Total count    = {self.total:12d}]")
+        lines.append(f"#[Buckets = {len(self.counts):12d}, SubBuckets     = {1 << self.SUB_BUCKET_BITS:12d}]")
+        return "\n".join(lines) + "\n"
+
+
+@dataclass
+class RequestSpec:
+    """One entry of the request mix
+
+    String values are formatted with the scenario variables ({seq} is a
+    counter, pool names pick a random pooled value); a list picks one of its
+    values and {"range": [low, high]} a random integer.
+    """
+
+    name: str
+    path: str
+    method: str = "GET"
+    weight: float = 1.0
+    params: Dict[str, Any] = field(default_factory=dict)
+    json: Any = None
+    files: Dict[str, dict] = field(default_factory=dict)  # field -> {"filename", "content_type", "size"}
+    auth: bool = False  # send the admin bearer token
+    burst: int = 1  # requests sent together per arrival
+    literal: bool = False  # path is sent as recorded, without formatting
+
+
+@dataclass
+class Scenario:
+    name: str
+    requests: List[RequestSpec]
+    pools: Dict[str, dict] = field(default_factory=dict)  # variable -> {"path", "params", "field", "per"}
+
+
+@dataclass
+class RouteStats:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+
+def load_scenario(path: str) -> Scenario:
+    with open(path) as f:
+        data = json.load(f)
+    return Scenario(
+        name=data.get("name", os.path.basename(path)),
+        requests=[RequestSpec(**entry) for entry in data["requests"]],
+        pools=data.get("pools", {}),
+    )
+
+
+def scenario_from_access_log(path: str, route_name: Callable[[str, str], str]) -> Scenario:
+    """Weighted mix of the logged GET/HEAD requests, named by the route they hit"""
+    counts: Counter = Counter()
+    skipped = 0
+    with open(path, errors="replace") as f:
+        for line in f:
+            match = ACCESS_LOG_LINE.search(line)
+            if not match:
+                continue
+            if match.group("method") in REPLAYED_METHODS:
+                counts[(match.group("method"), match.group("target"))] += 1
+            else:
+                skipped += 1
+    if not counts:
+        sys.exit(f"No GET or HEAD requests found in {path}")
+    if skipped:
+        print(f"Skipped {skipped} logged requests with bodies (not recorded in access logs)")
+    return Scenario(
+        name=os.path.basename(path),
+        requests=[
+            RequestSpec(name=route_name(method, target), path=target, method=method, weight=count, literal=True)
+            for (method, target), count in counts.items()
+        ],
+    )
+
+
+def route_namer(asgi_app) -> Callable[[str, str], str]:
+    """Map a request to "METHOD /route/{template}" using the app's routing table"""
+    from starlette.routing import Match
+
+    def name(method: str, target: str) -> str:
+        path = target.split("?", 1)[0]
+        scope = {"type": "http", "path": path, "method": method, "root_path": ""}
+        for route in asgi_app.routes:
+            if route.matches(scope)[0] == Match.FULL:
+                return f"{method} {route.path}"
+        return f"{method} {path}"
+
+    return name
+
+
+class _Variables(dict):
+    """Formatting namespace: {seq} counts up, pooled names pick a random value"""
+
+    def __init__(self, rng: random.Random, pools: Dict[str, Any], static: Dict[str, Any]):
+        super().__init__(static)
+        self.rng = rng
+        self.pools = pools
+        self.sequence = itertools.count(1)
+
+    def __missing__(self, key: str):
+        if key == "seq":
+            return next(self.sequence)
+        if key in self.pools:
+            values = self.pools[key]
+            return self.rng.choice(values) if isinstance(values, list) else values
+        raise KeyError(key)
+
+
+def render(value: Any, variables: _Variables) -> Any:
+    if isinstance(value, str):
+        return value.format_map(variables)
+    if isinstance(value, list):
+        return render(variables.rng.choice(value), variables)
+    if isinstance(value, dict):
+        if "range" in value:
+            low, high = (int(float(render(bound, variables))) for bound in value["range"])
+            return variables.rng.randint(low, max(low, high))
+        return {key: render(item, variables) for key, item in value.items()}
+    return value
+
+
+def _extract(document: Any, path: str) -> Any:
+    """Dotted field lookup that maps over lists: "items.slug" -> every item's slug"""
+    for part in path.split("."):
+        if isinstance(document, list):
+            document = [item[part] for item in document]
+        else:
+            document = document[part]
+    return document
+
+
+class LoadGenerator:
+    def __init__(self, client, scenario: Scenario, rng: random.Random, static_variables: Dict[str, Any]):
+        self.client = client
+        self.scenario = scenario
+        self.rng = rng
+        self.variables = _Variables(rng, {}, static_variables)
+        self.stats: Dict[str, RouteStats] = defaultdict(RouteStats)
+        self.admin_headers: Dict[str, str] = {}
+        self.dropped = 0
+        self._uploads: Dict[int, bytes] = {}
+        self._cumulative_weights = list(itertools.accumulate(spec.weight for spec in scenario.requests))
+
+    async def prepare(self) -> None:
+        """Fill the scenario pools and log in when any request needs the admin token"""
+        for name, pool in self.scenario.pools.items():
+            response = await self.client.get(pool["path"], params=pool.get("params"))
+            response.raise_for_status()
+            value = _extract(response.json(), pool["field"])
+            if isinstance(value, list) and not value:
+                sys.exit(f"Pool {name} is empty; seed the database first")
+            if "per" in pool:
+                value = max(1, math.ceil(value / pool["per"]))
+            self.variables.pools[name] = value
+        if any(spec.auth for spec in self.scenario.requests):
+            response = await self.client.post("/auth/login", json={
+                "email": self.variables["admin_email"], "password": self.variables["admin_password"],
+            })
+            response.raise_for_status()
+            self.admin_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def pick(self) -> RequestSpec:
+        point = self.rng.random() * self._cumulative_weights[-1]
+        return self.scenario.requests[bisect.bisect_right(self._cumulative_weights, point)]
+
+    def _upload(self, spec: dict) -> Tuple[str, bytes, str]:
+        size = int(spec.get("size", 64 * 1024))
+        if size not in self._uploads:
+            # A JPEG start-of-image marker in front of incompressible bytes
+            self._uploads[size] = b"\xff\xd8\xff\xe0" + os.urandom(max(0, size - 4))
+        return (
+            render(spec.get("filename", "load-{seq}.jpg"), self.variables),
+            self._uploads[size],
+            spec.get("content_type", "image/jpeg"),
+        )
+
+    async def send(self, spec: RequestSpec, scheduled: float) -> None:
+        """Send spec (burst times) and record each latency from the scheduled time"""
+        await asyncio.gather(*(self._send_one(spec, scheduled) for _ in range(spec.burst)))
+
+    async def _send_one(self, spec: RequestSpec, scheduled: float) -> None:
+        variables = self.variables
+        path = spec.path if spec.literal else render(spec.path, variables)
+        request: Dict[str, Any] = {"params": render(spec.params, variables) or None}
+        if spec.json is not None:
+            request["json"] = render(spec.json, variables)
+        if spec.files:
+            request["files"] = {name: self._upload(upload) for name, upload in spec.files.items()}
+        if spec.auth:
+            request["headers"] = self.admin_headers
+
+        stats = self.stats[spec.name]
+        try:
+            response = await self.client.request(spec.method, path, **request)
+            await response.aread()
+        except Exception as exc:
+            stats.errors += 1
+            stats.statuses[type(exc).__name__] += 1
+        else:
+            stats.statuses[str(response.status_code)] += 1
+            if response.status_code >= 400:
+                stats.errors += 1
+        stats.latency.record((asyncio.get_running_loop().time() - scheduled) * 1_000_000)
+
+    async def run_open_loop(self, rate: float, duration: float, max_in_flight: int) -> None:
+        """Poisson arrivals at rate per second; arrivals beyond max_in_flight are dropped"""
+        loop = asyncio.get_running_loop()
+        started = scheduled = loop.time()
+        in_flight: set = set()
+        while True:
+            scheduled += self.rng.expovariate(rate)
+            if scheduled - started >= duration:
+                break
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= max_in_flight:
+                self.dropped += 1
+                continue
+            task = asyncio.ensure_future(self.send(self.pick(), scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    async def run_closed_loop(self, concurrency: int, duration: float) -> None:
+        """concurrency users sending requests back to back"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration
+
+        async def user():
+            while loop.time() < deadline:
+                await self.send(self.pick(), loop.time())
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+
+
+def _ms(micros: int) -> float:
+    return round(micros / 1000, 3)
+
+
+def with_total(stats: Dict[str, RouteStats]) -> Dict[str, RouteStats]:
+    """Routes by name plus a "total" entry merging them all"""
+    total = RouteStats()
+    routes = {}
+    for name in sorted(stats):
+        route = stats[name]
+        total.latency.merge(route.latency)
+        total.statuses.update(route.statuses)
+        total.errors += route.errors
+        routes[name] = route
+    routes["total"] = total
+    return routes
+
+
+def report(routes: Dict[str, RouteStats], elapsed: float) -> dict:
+
+    print(
+        f"{'route':<32} {'count':>7} {'errors':>6} {'req/s':>8} "
+        + " ".join(f"{'p' + format(p, 'g'):>8}" for p in REPORT_PERCENTILES)
+        + f" {'max':>8}  (ms)"
+    )
+    result = {}
+    for name, route in routes.items():
+        latency = route.latency
+        percentiles = {f"p{p:g}_ms": _ms(latency.value_at(p)) for p in REPORT_PERCENTILES}
+        print(
+            f"{name[:32]:<32} {latency.total:>7} {route.errors:>6} {latency.total / elapsed:>8.1f} "
+            + " ".join(f"{value:>8.2f}" for value in percentiles.values())
+            + f" {_ms(latency.max):>8.2f}"
+        )
+        result[name] = {
+            "count": latency.total,
+            "errors": route.errors,
+            "throughput_rps": round(latency.total / elapsed, 1),
+            "mean_ms": _ms(latency.mean),
+            **percentiles,
+            "max_ms": _ms(latency.max),
+            "statuses": dict(route.statuses),
+        }
+    return result
+
+
+def write_hgrm(routes: Dict[str, RouteStats], directory: str) -> None:
+    os.makedirs(directory, exist_ok=True)
+    for name, route in routes.items():
+        filename = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "route"
+        with open(os.path.join(directory, f"{filename}.hgrm"), "w") as f:
+            f.write(route.latency.percentile_distribution())
+
+
+async def run(args, scenario: Scenario, asgi_app) -> Tuple[LoadGenerator, float]:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    if asgi_app is None:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits)
+    else:
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=asgi_app), base_url="http://loadgen", timeout=args.timeout
+        )
+    static_variables = {"admin_email": args.admin_email, "admin_password": args.admin_password}
+    async with client:
+        generator = LoadGenerator(client, scenario, random.Random(args.seed), static_variables)
+        await generator.prepare()
+        started = time.perf_counter()
+        if args.rate:
+            await generator.run_open_loop(args.rate, args.duration, args.max_in_flight)
+        else:
+            await generator.run_closed_loop(args.concurrency, args.duration)
+        return generator, time.perf_counter() - started
+
+
+async def run_in_process(args, scenario: Scenario, asgi_app) -> Tuple[LoadGenerator, float]:
+    import anyio
+    from app.core.warmup import wait_for_warmup
+
+    # httpx's ASGI transport does not send lifespan events; run startup here
+    async with asgi_app.router.lifespan_context(asgi_app):
+        await anyio.to_thread.run_sync(wait_for_warmup)  # load a ready worker, as a balancer would
+        return await run(args, scenario, asgi_app)
+
+
+def main():
+    from app.db.fixtures import ADMIN_EMAIL, ADMIN_PASSWORD
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--scenario", help=f"scenario JSON (default {os.path.relpath(DEFAULT_SCENARIO, ROOT)})")
+    source.add_argument("--access-log", help="replay the GET/HEAD mix of an nginx, Apache or uvicorn access log")
+    parser.add_argument("--url", help="base URL of a running server (default: the ASGI app in-process)")
+    parser.add_argument("--rate", type=float, help="open-loop arrivals per second")
+    parser.add_argument("--concurrency", type=int, default=8, help="closed-loop users when --rate is not given")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="open-loop arrivals beyond this are dropped")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the request mix and arrival times")
+    parser.add_argument("--admin-email", default=ADMIN_EMAIL)
+    parser.add_argument("--admin-password", default=ADMIN_PASSWORD)
+    parser.add_argument("--output", help="write the per-route report JSON here")
+    parser.add_argument("--hgrm-dir", help="write an HdrHistogram .hgrm percentile distribution per route here")
+    args = parser.parse_args()
+
+    asgi_app = None
+    if args.url is None:
+        os.environ.setdefault("SECRET_KEY", "loadgen")
+        from app.main import app as asgi_app
+
+    if args.access_log:
+        if asgi_app is not None:
+            namer = route_namer(asgi_app)
+        else:
+            from app.main import app as routing_app
+            namer = route_namer(routing_app)
+        scenario = scenario_from_access_log(args.access_log, namer)
+    else:
+        scenario = load_scenario(args.scenario or DEFAULT_SCENARIO)
+
+    mode = f"open loop at {args.rate:g} req/s" if args.rate else f"closed loop with {args.concurrency} users"
+    print(f"{scenario.name}: {mode} for {args.duration:g}s against {args.url or 'the in-process app'}")
+    if asgi_app is None:
+        generator, elapsed = asyncio.run(run(args, scenario, None))
+    else:
+        generator, elapsed = asyncio.run(run_in_process(args, scenario, asgi_app))
+
+    routes = with_total(generator.stats)
+    result = report(routes, elapsed)
+    if generator.dropped:
+        print(f"Dropped {generator.dropped} arrivals with {args.max_in_flight} requests in flight")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "scenario": scenario.name,
+                "target": args.url or "in-process",
+                "rate": args.rate,
+                "concurrency": None if args.rate else args.concurrency,
+                "duration_s": round(elapsed, 3),
+                "dropped": generator.dropped,
+                "routes": result,
+            }, f, indent=2)
+    if args.hgrm_dir:
+        write_hgrm(routes, args.hgrm_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 # This file serves as a simple entry point for deployment platforms like Render.
 # It imports the actual FastAPI application from app.main.
+#
+# python main.py --startup-profile reports where the cold start time goes.
 
 import sys
 import os
@@ -7,4 +9,8 @@ import os
 # Add current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.main import app
+if __name__ == "__main__" and "--startup-profile" in sys.argv:
+    from app.core.startup import main
+    main()
+else:
+    from app.main import app  # noqa: F401
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Render deployment setup script
-Creates database tables and sample data
+Creates database tables and sample data (skipped when already loaded)
 """
 
 import os
@@ -14,22 +14,13 @@ def setup_database():
     """Setup database and create sample data"""
     try:
         # Import after path setup
-        from app.db.session import Base, engine
+        import app.models  # noqa: F401 ensure models are imported for table creation
         
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
-        print("Database tables created successfully!")
-        
-        # Run create_sample_data.py directly
-        import subprocess
-        result = subprocess.run([sys.executable, "create_sample_data.py"], 
-                              capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            print("Sample data created successfully!")
-            print(result.stdout)
-        else:
-            print(f"Sample data creation failed: {result.stderr}")
+        # Create the tables and bulk load the sample data in-process; a no-op
+        # (before any create_all) when the dataset checksum matches what the
+        # previous deploy loaded
+        from create_sample_data import create_sample_data
+        create_sample_data()
         
     except Exception as e:
         print(f"Setup error: {e}")